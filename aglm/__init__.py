@@ -28,9 +28,23 @@ mindX (github.com/agenticplace) is one consumer of these patterns; this repo
 is the canonical agnostic home.
 """
 
-from .beliefs import Belief, BeliefSystem
+from .beliefs import Belief, BeliefSystem, RetentionPolicy
+from .changes import BeliefChange, ChangeStream
+from .compact import CompactBeliefSystem
+from .concurrent import ConcurrentBeliefSystem
 from .core import AGLMCore, Decision, PerceptionContext
 from .cycle import AutonomousLoop
+from .fleet import AGLMFleet
+from .fusion import FusedConfidence
+from .index import Conflict
+from .metrics import CycleMetrics, CycleSample
+from .persistence import PersistentBeliefSystem
+from .sharded import ShardedFleet
+from .shared import SharedBeliefSystem
+from .snapshot import MappedBeliefSystem, write_snapshot
+from .sqlite import SQLiteBeliefSystem
+from .tiered import TieredBeliefSystem
+from .views import BeliefView
 
 __version__ = "0.1.0"
 
@@ -38,8 +52,26 @@ __all__ = [
     "AGLMCore",
     "Decision",
     "PerceptionContext",
+    "CycleMetrics",
+    "CycleSample",
     "Belief",
     "BeliefSystem",
+    "RetentionPolicy",
+    "BeliefView",
+    "BeliefChange",
+    "ChangeStream",
+    "FusedConfidence",
+    "Conflict",
+    "CompactBeliefSystem",
+    "ConcurrentBeliefSystem",
+    "PersistentBeliefSystem",
+    "SQLiteBeliefSystem",
+    "MappedBeliefSystem",
+    "SharedBeliefSystem",
+    "TieredBeliefSystem",
+    "write_snapshot",
     "AutonomousLoop",
+    "AGLMFleet",
+    "ShardedFleet",
     "__version__",
 ]
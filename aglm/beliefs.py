@@ -5,21 +5,41 @@ Belief system — claim, confidence, source attribution.
 
 Belief revision is monotonic by default (higher confidence wins). For
 non-monotonic reasoning (revising in light of contradicting evidence),
-extend `BeliefSystem` with `revise()`-style overrides.
+`conflicts()` finds claims held together with their negation, and
+`BeliefSystem` can be extended with `revise()`-style overrides.
 
 Distilled from mindX `agents/core/belief_system.py`.
 """
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import time
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, Iterable, List, Optional
+from operator import itemgetter
+from typing import (
+    IO, TYPE_CHECKING, Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional,
+    Sequence, Tuple, Union,
+)
+
+from .changes import ADDED, EVICTED, KINDS, TOP, BeliefChange, ChangeStream
+from .fusion import ClaimFusion, FusedConfidence
+from .index import BeliefIndex, BeliefQuery, ClaimSearchIndex, Conflict, ContradictionIndex
+from .views import BeliefView, VersionedView
+
+if TYPE_CHECKING:
+    from .crdt import BeliefDelta, DeltaCursor, DeltaLog
+    from .replication import ReplicationLeader
 
 logger = logging.getLogger("aglm.beliefs")
 
+_first = itemgetter(0)
 
-@dataclass
+
+@dataclass(slots=True)
 class Belief:
     """A single belief: a claim, who said it, when, and how confident."""
 
@@ -34,6 +54,84 @@ class Belief:
             raise ValueError(f"confidence must be in [0, 1], got {self.confidence}")
 
 
+def _unchecked_belief(
+    claim: str,
+    confidence: float,
+    source: str,
+    timestamp: float,
+    metadata: Dict[str, Any],
+) -> Belief:
+    """Build a Belief whose confidence has already been validated in bulk."""
+    b = object.__new__(Belief)
+    b.claim = claim
+    b.confidence = confidence
+    b.source = source
+    b.timestamp = timestamp
+    b.metadata = metadata
+    return b
+
+
+def _confidence_column(values: Any, n: int) -> List[float]:
+    """
+    Normalize a scalar, sequence or NumPy array of confidences to a list of
+    floats and validate the whole column at once.
+    """
+    if isinstance(values, (int, float)):
+        column = [float(values)] * n
+    elif hasattr(values, "dtype"):  # NumPy array: validate without a Python loop
+        if values.ndim != 1 or len(values) != n:
+            raise ValueError(f"expected {n} confidences, got an array of shape {values.shape}")
+        ok = (values >= 0.0) & (values <= 1.0)
+        if not ok.all():
+            bad = int((~ok).argmax())
+            raise ValueError(f"confidence must be in [0, 1], got {values[bad]} at index {bad}")
+        return values.astype(float).tolist()
+    else:
+        column = values.tolist() if hasattr(values, "tolist") else list(values)
+    if len(column) != n:
+        raise ValueError(f"expected {n} confidences, got {len(column)}")
+    bad = [i for i, c in enumerate(column) if not 0.0 <= c <= 1.0]
+    if bad:
+        raise ValueError(f"confidence must be in [0, 1], got {column[bad[0]]} at index {bad[0]}")
+    return column
+
+
+def _check_as_of(cycle: Any, at: Any) -> None:
+    """`as_of()` takes exactly one point: an int cycle or a numeric time (never a bool)."""
+    if (cycle is None) == (at is None):
+        raise ValueError("as_of() takes exactly one of cycle= or at=")
+    if cycle is not None and (isinstance(cycle, bool) or not isinstance(cycle, int)):
+        raise TypeError(f"as_of(cycle=...) must be an int, got {cycle!r}")
+    if at is not None and (isinstance(at, bool) or not isinstance(at, (int, float))):
+        raise TypeError(f"as_of(at=...) must be a Unix time, got {at!r}")
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    How much belief history a `BeliefSystem` keeps. Every limit is optional
+    and they combine (a belief is evicted as soon as any limit drops it).
+
+      - `max_per_claim`   keep the newest N beliefs per claim
+      - `ttl_seconds`     drop beliefs whose timestamp is older than this
+      - `top_k_per_claim` keep the K most confident beliefs per claim
+                          (the oldest goes first on ties)
+      - `history_seconds` keep at least this much past state reachable by
+                          `as_of()` (`math.inf` for all of it)
+    """
+
+    max_per_claim: Optional[int] = None
+    ttl_seconds: Optional[float] = None
+    top_k_per_claim: Optional[int] = None
+    history_seconds: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_per_claim", "ttl_seconds", "top_k_per_claim", "history_seconds"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+
+
 class BeliefSystem:
     """
     In-memory belief store. Claims are keyed by a stable hash of their text;
@@ -43,10 +141,75 @@ class BeliefSystem:
     `top(claim)` returns the highest-confidence belief about a claim.
     `revise(claim, new)` adds a new belief and lets the caller decide
     whether to keep both or supersede.
+
+    The leading belief of each claim and the total belief count are
+    maintained as beliefs are added, so `top()` and `len()` are O(1)
+    regardless of how much history has accumulated.
+
+    By default nothing is ever forgotten. Pass a `RetentionPolicy` to bound
+    memory: per-claim limits are enforced as each belief is added, and TTL
+    expiry pops a timestamp-ordered heap, so eviction is amortized O(log n)
+    per belief rather than a scan. Idle stores can call `expire()` directly.
+
+    `query()` answers source / time-range / confidence-band questions from a
+    `BeliefIndex`, `search()` ranks claims by text from a `ClaimSearchIndex`
+    `fused()` combines every belief about a claim from `ClaimFusion`
+    aggregates, and `conflicts()` pairs claims with their negations from a
+    `ContradictionIndex`; all are built on first use and maintained
+    incrementally after.
+
+    Every mutation gets a version number, and `snapshot()` returns an O(1)
+    frozen `BeliefView` at the current version (see `aglm.views`). With
+    `RetentionPolicy(history_seconds=...)` the store also remembers which
+    version was current at each moment and at the end of each `AGLMCore`
+    cycle, and keeps the undo log for that window, so `as_of(cycle=n)` /
+    `as_of(at=timestamp)` open a view of the past without replaying anything.
+
+    `subscribe()` / `changes()` push additions, evictions and leader changes
+    to consumers as they happen (see `aglm.changes`).
     """
 
-    def __init__(self) -> None:
-        self._beliefs: Dict[str, List[Belief]] = {}
+    def __init__(self, retention: Optional[RetentionPolicy] = None) -> None:
+        self._beliefs: Dict[str, Deque[Belief]] = {}
+        self._top: Dict[str, Belief] = {}
+        self._count = 0
+
+        self.retention = retention
+        self.evictions = 0
+        # TTL expiry queue: (timestamp, tiebreak, key, belief). Entries for
+        # beliefs already evicted by another limit are skipped when popped.
+        self._expiry: List[Tuple[float, int, str, Belief]] = []
+        self._expiry_seq = itertools.count()
+        self._index: Optional[BeliefIndex] = None  # built lazily by query()
+        self._search: Optional[ClaimSearchIndex] = None  # built lazily by search()
+        self._fusion: Optional[ClaimFusion] = None  # built lazily by fused()
+        self._contradictions: Optional[ContradictionIndex] = None  # by conflicts()
+
+        # Versioning for snapshots: each add (and each eviction batch) bumps
+        # the version; _versions parallels _beliefs. While views are open,
+        # replaced leaders and evicted beliefs are logged for them.
+        self._version = 0
+        self._versions: Dict[str, Deque[int]] = {}
+        self._open_views: Dict[int, int] = {}  # view version -> open count
+        self._leader_log: Dict[str, List[Tuple[int, Optional[Belief]]]] = {}
+        self._evicted_log: Dict[str, List[Tuple[int, int, Belief]]] = {}
+
+        # Time travel (opt-in): (wall time, version, count) after each write,
+        # to the millisecond, and (cycle, version, count) per AGLMCore cycle.
+        # Marks before _marks_start have aged out of the history window.
+        self._history = retention.history_seconds if retention is not None else None
+        self._marks: List[Tuple[float, int, int]] = []
+        self._marks_start = 0
+        self._cycles: List[Tuple[int, int, int]] = []
+        self._last_cycle: Optional[int] = None  # outlives the marks aged out of _cycles
+        if self._history is not None:
+            self._marks.append((time.time(), 0, 0))
+
+        # Change feed: (callback, kinds) per subscriber, and the changes of
+        # the write in progress, delivered when it completes.
+        self._observers: List[Tuple[Callable[[BeliefChange], Any], FrozenSet[str]]] = []
+        self._pending_changes: List[BeliefChange] = []
+        self._delta_log: Optional[DeltaLog] = None  # CRDT sync, on first delta()/merge()
 
     @staticmethod
     def _key(claim: str) -> str:
@@ -54,8 +217,195 @@ class BeliefSystem:
 
     def add(self, belief: Belief) -> None:
         """Add a belief. Multiple beliefs about the same claim are allowed."""
-        k = self._key(belief.claim)
-        self._beliefs.setdefault(k, []).append(belief)
+        self.add_many((belief,))
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """
+        Add several beliefs in one call; equivalent to `add()` on each.
+
+        The base implementation inlines the bookkeeping for speed, so
+        subclasses that override `add()` must override `add_many()` as well.
+        """
+        key = self._key
+        store = self._beliefs
+        versions = self._versions
+        leaders = self._top
+        policy = self.retention
+        per_claim = policy is not None and (
+            policy.max_per_claim is not None or policy.top_k_per_claim is not None
+        )
+        ttl = policy.ttl_seconds if policy is not None else None
+        index = self._index
+        search = self._search
+        fusion = self._fusion
+        logging_views = bool(self._open_views) or self._history is not None
+        observed = bool(self._observers)
+        changes = self._pending_changes
+        added = 0
+        for belief in beliefs:
+            k = key(belief.claim)
+            self._version += 1
+            entries = store.get(k)
+            if entries is None:
+                entries = store[k] = deque((belief,))
+                versions[k] = deque((self._version,))
+                if search is not None:
+                    search.add_claim(k)
+                if self._contradictions is not None:
+                    self._contradictions.add_claim(k)
+            else:
+                entries.append(belief)
+                versions[k].append(self._version)
+            added += 1
+            if observed:
+                changes.append(BeliefChange(ADDED, k, belief, None, self._version))
+            # Strictly greater: on ties the oldest belief keeps the lead.
+            leader = leaders.get(k)
+            if leader is None or belief.confidence > leader.confidence:
+                if logging_views:
+                    self._leader_log.setdefault(k, []).append((self._version, leader))
+                if observed:
+                    changes.append(BeliefChange(TOP, k, belief, leader, self._version))
+                leaders[k] = belief
+            if index is not None:
+                index.add(belief)
+            if fusion is not None:
+                fusion.add(k, belief)
+            if ttl is not None:
+                heapq.heappush(
+                    self._expiry, (belief.timestamp, next(self._expiry_seq), k, belief)
+                )
+            if per_claim:
+                self._enforce_limits(k, entries)
+        self._count += added
+        if ttl is not None:
+            self.expire()
+        if self._history is not None:
+            self._mark()
+        if self._pending_changes:
+            self._publish()
+
+    # ─── retention ────────────────────────────────────────────────
+
+    def _enforce_limits(self, k: str, entries: Deque[Belief]) -> None:
+        policy = self.retention
+        if policy.max_per_claim is not None:
+            while len(entries) > policy.max_per_claim:
+                self._evict(k, entries, 0)
+        if policy.top_k_per_claim is not None:
+            while len(entries) > policy.top_k_per_claim:
+                weakest = 0
+                for i, b in enumerate(entries):
+                    if b.confidence < entries[weakest].confidence:
+                        weakest = i
+                self._evict(k, entries, weakest)
+
+    def _evict(self, k: str, entries: Deque[Belief], index: int) -> None:
+        """Remove `entries[index]` and repair the claim's bookkeeping."""
+        victim = entries[index]
+        versions = self._versions[k]
+        keep_log = bool(self._open_views) or self._history is not None
+        if keep_log:
+            self._evicted_log.setdefault(k, []).append((self._version, versions[index], victim))
+        del entries[index]
+        del versions[index]
+        self._count -= 1
+        self.evictions += 1
+        if self._index is not None:
+            self._index.remove(victim)
+        if self._fusion is not None:
+            self._fusion.remove(k, victim)
+        observed = bool(self._observers)
+        if observed:
+            self._pending_changes.append(BeliefChange(EVICTED, k, victim, None, self._version))
+        leader: Optional[Belief] = self._top[k]
+        if not entries:
+            del self._beliefs[k]
+            del self._versions[k]
+            del self._top[k]
+            leader = None
+            self._unindex_claim(k)
+        elif leader is victim:
+            leader = entries[0]
+            for b in entries:
+                if b.confidence > leader.confidence:
+                    leader = b
+            self._top[k] = leader
+        else:
+            return
+        if keep_log:
+            self._leader_log.setdefault(k, []).append((self._version, victim))
+        if observed:
+            self._pending_changes.append(BeliefChange(TOP, k, leader, victim, self._version))
+
+    def _unindex_claim(self, k: str) -> None:
+        """Drop a claim whose last belief was evicted from the claim-level indexes."""
+        if self._search is not None:
+            self._search.remove_claim(k)
+        if self._contradictions is not None:
+            self._contradictions.remove_claim(k)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Evict beliefs older than the policy's TTL. Called automatically on
+        every add; returns the number of beliefs evicted.
+        """
+        if self.retention is None or self.retention.ttl_seconds is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.retention.ttl_seconds
+        heap = self._expiry
+        before = self.evictions
+        if heap and heap[0][0] < cutoff:
+            self._version += 1  # the evictions below are one mutation
+        while heap and heap[0][0] < cutoff:
+            _ts, _seq, k, belief = heapq.heappop(heap)
+            entries = self._beliefs.get(k)
+            if not entries:
+                continue
+            if entries[0] is belief:  # common case: oldest first
+                self._evict(k, entries, 0)
+                continue
+            for i, b in enumerate(entries):
+                if b is belief:
+                    self._evict(k, entries, i)
+                    break
+        # Entries for beliefs evicted by per-claim limits linger until they
+        # expire; rebuild once they outnumber live beliefs (amortized O(1)).
+        if len(heap) > 2 * self._count + 1024:
+            self._expiry = [
+                (b.timestamp, next(self._expiry_seq), k, b)
+                for k, entries in self._beliefs.items()
+                for b in entries
+            ]
+            heapq.heapify(self._expiry)
+        evicted = self.evictions - before
+        if evicted and self._history is not None:
+            self._mark()
+        if self._pending_changes:
+            self._publish()
+        return evicted
+
+    def _discard(self, beliefs: Iterable[Belief]) -> int:
+        """
+        Evict the stored beliefs equal to `beliefs` as one mutation; returns
+        how many were found. Replicas replay their leader's evictions with it.
+        """
+        self._version += 1
+        before = self.evictions
+        for belief in beliefs:
+            k = self._key(belief.claim)
+            entries = self._beliefs.get(k)
+            if not entries:
+                continue
+            try:
+                self._evict(k, entries, entries.index(belief))
+            except ValueError:
+                continue
+        if self._history is not None:
+            self._mark()
+        if self._pending_changes:
+            self._publish()
+        return self.evictions - before
 
     def all(self, claim: str) -> List[Belief]:
         """All recorded beliefs about a claim, oldest first."""
@@ -63,10 +413,39 @@ class BeliefSystem:
 
     def top(self, claim: str) -> Optional[Belief]:
         """Highest-confidence belief about a claim, or None."""
-        entries = self._beliefs.get(self._key(claim), [])
-        if not entries:
-            return None
-        return max(entries, key=lambda b: b.confidence)
+        return self._top.get(self._key(claim))
+
+    def fused(self, claim: str) -> Optional[FusedConfidence]:
+        """
+        Combined confidence over every belief about a claim — count, mean,
+        per-source mean, log-odds sum and noisy-or — or None. O(1) once the
+        aggregates exist (see `aglm.fusion`):
+
+            f = bs.fused("door is open")
+            if f and f.noisy_or > 0.95: ...
+        """
+        if self._fusion is None:
+            self._fusion = ClaimFusion.build(
+                (k, b) for k in self.claims() for b in self.all(k)
+            )
+        return self._fusion.get(self._key(claim))
+
+    def conflicts(self, claim: Optional[str] = None) -> List[Conflict]:
+        """
+        Claims held together with their negation ("x" and "not x"), each
+        with both sides' leading beliefs: all of them (O(conflicts)), or
+        only those involving `claim` (O(1)). To check just what changed in
+        a cycle, call it per key from a change-feed subscriber:
+
+            bs.subscribe(lambda c: review(bs.conflicts(c.key)), kinds={"top"})
+        """
+        if self._contradictions is None:
+            self._contradictions = ContradictionIndex.build(self.claims())
+        key = None if claim is None else self._key(claim)
+        return [
+            Conflict(positive, negative, self.top(positive), self.top(negative))
+            for positive, negative in self._contradictions.pairs(key)
+        ]
 
     def revise(
         self,
@@ -89,14 +468,314 @@ class BeliefSystem:
         self.add(b)
         return b
 
+    def revise_many(
+        self,
+        claims: Sequence[str],
+        confidences: Union[float, Sequence[float], Any],
+        sources: Union[str, Sequence[str]],
+        metadata: Union[None, Dict[str, Any], Sequence[Dict[str, Any]]] = None,
+        timestamp: Optional[float] = None,
+    ) -> List[Belief]:
+        """
+        Columnar `revise()` for many claims at once.
+
+        `confidences` may be a scalar, a sequence or a NumPy array; `sources`
+        a single source or one per claim; `metadata` None, one dict (copied
+        per belief) or one dict per claim. The whole confidence column is
+        validated before anything is added, so a bad value adds nothing.
+        All beliefs share one timestamp (default: now).
+        """
+        n = len(claims)
+        column = _confidence_column(confidences, n)
+        if isinstance(sources, str):
+            source_column: Sequence[str] = [sources] * n
+        elif len(sources) != n:
+            raise ValueError(f"expected {n} sources, got {len(sources)}")
+        else:
+            source_column = sources
+        if metadata is None or isinstance(metadata, dict):
+            shared = metadata or {}
+            metadata_column: Iterable[Dict[str, Any]] = (dict(shared) for _ in range(n))
+        elif len(metadata) != n:
+            raise ValueError(f"expected {n} metadata dicts, got {len(metadata)}")
+        else:
+            metadata_column = (m or {} for m in metadata)
+
+        ts = time.time() if timestamp is None else timestamp
+        batch = [
+            _unchecked_belief(claim, confidence, source, ts, md)
+            for claim, confidence, source, md in zip(
+                claims, column, source_column, metadata_column
+            )
+        ]
+        self.add_many(batch)
+        return batch
+
     def claims(self) -> Iterable[str]:
         """All unique claims known to the system (lowercased keys)."""
         return list(self._beliefs.keys())
 
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """
+        Beliefs matching every given filter, oldest first. Ranges are
+        inclusive. Example: everything `sensor.7` asserted in the last five
+        minutes with confidence above 0.9:
+
+            bs.query(source="sensor.7", since=time.time() - 300, min_confidence=0.9)
+        """
+        if self._index is None:
+            self._index = BeliefIndex.build(
+                b for entries in self._beliefs.values() for b in entries
+            )
+        q = BeliefQuery(source, since, until, min_confidence, max_confidence)
+        return self._index.query(q, limit)
+
+    def snapshot(self) -> BeliefView:
+        """
+        Frozen view of the store as it is now, in O(1). Later writes are
+        invisible to it. Close it (or use `with`) when done so the store
+        can stop logging on its behalf.
+        """
+        return self._open_view(self._version, self._count)
+
+    def as_of(self, *, cycle: Optional[int] = None, at: Optional[float] = None) -> BeliefView:
+        """
+        Frozen view of the store as it was in the past: when `AGLMCore`
+        cycle `cycle` finished, or at Unix time `at` (resolved to the
+        millisecond). Pass exactly one. Needs
+        `RetentionPolicy(history_seconds=...)`; points older than the kept
+        history raise `ValueError`. Close the view when done.
+
+            with bs.as_of(cycle=41) as then:
+                then.top("disk_usage:/var")   # what cycle 41 decided on
+        """
+        _check_as_of(cycle, at)
+        if self._history is None:
+            raise ValueError("as_of() needs RetentionPolicy(history_seconds=...)")
+        if cycle is not None:
+            marks, lo, point, what = self._cycles, 0, cycle, f"cycle {cycle}"
+        else:
+            marks, lo, point, what = self._marks, self._marks_start, at, f"time {at}"
+        i = bisect_right(marks, point, lo=lo, key=_first) - 1
+        if i < lo or marks[i][1] < self._marks[self._marks_start][1]:
+            raise ValueError(f"{what} is older than the kept belief history")
+        _point, version, count = marks[i]
+        return self._open_view(version, count)
+
+    def mark_cycle(self, cycle: int) -> None:
+        """
+        Record the end of an `AGLMCore` cycle for `as_of(cycle=...)`. Cycle
+        numbers must increase: a mark that goes backwards (two cores on one
+        store, a core restarted from cycle 0) raises `ValueError` instead of
+        making `as_of()` resolve to the wrong state.
+        """
+        if self._history is not None:
+            last = self._last_cycle
+            if last is not None and cycle <= last:
+                raise ValueError(f"cycle marks must increase: got cycle {cycle} after {last}")
+            self._last_cycle = cycle
+            self._cycles.append((cycle, self._version, self._count))
+
+    def _mark(self) -> None:
+        """Record the current version for `as_of(at=...)`; age out old marks."""
+        now = time.time()
+        marks = self._marks
+        if len(marks) > self._marks_start + 1 and now - marks[-1][0] < 0.001:
+            marks[-1] = (marks[-1][0], self._version, self._count)
+        else:
+            marks.append((now, self._version, self._count))
+        # Keep the newest mark at or before the window start: it answers
+        # as_of() for that instant.
+        cutoff = now - self._history
+        start = self._marks_start
+        while start + 1 < len(marks) and marks[start + 1][0] <= cutoff:
+            start += 1
+        self._marks_start = start
+        if start > 64 and start > len(marks) // 2:  # amortized compaction
+            del marks[:start]
+            self._marks_start = 0
+            floor = marks[0][1]
+            self._cycles = [c for c in self._cycles if c[1] >= floor]
+            self._trim_logs(self._oldest_readable())
+
+    def _open_view(self, version: int, count: int) -> BeliefView:
+        self._open_views[version] = self._open_views.get(version, 0) + 1
+        return VersionedView(self, version, count)
+
+    def _oldest_readable(self) -> Optional[int]:
+        """Oldest version an open view or the history window can still read."""
+        floors = list(self._open_views)
+        if self._history is not None:
+            floors.append(self._marks[self._marks_start][1])
+        return min(floors) if floors else None
+
+    def _release_view(self, version: int) -> None:
+        remaining = self._open_views[version] - 1
+        if remaining:
+            self._open_views[version] = remaining
+            return
+        del self._open_views[version]
+        oldest = self._oldest_readable()
+        if oldest is None:
+            self._leader_log.clear()
+            self._evicted_log.clear()
+        elif version < oldest:
+            self._trim_logs(oldest)
+
+    def _trim_logs(self, oldest: int) -> None:
+        """Drop log entries no reader (all at versions >= oldest) can need."""
+        for log_dict in (self._leader_log, self._evicted_log):
+            for k in list(log_dict):
+                log = log_dict[k]
+                # Entries are in version order; the first field is when the
+                # change happened.
+                del log[:bisect_right(log, oldest, key=_first)]
+                if not log:
+                    del log_dict[k]
+
+    # ─── change feed ──────────────────────────────────────────────
+
+    def subscribe(
+        self,
+        callback: Callable[[BeliefChange], Any],
+        kinds: Optional[Iterable[str]] = None,
+    ) -> Callable[[], None]:
+        """
+        Call `callback(change)` after every write for each `BeliefChange`
+        of the given kinds (default: all of `ADDED`, `TOP`, `EVICTED`).
+        Returns a function that unsubscribes.
+
+            bs.subscribe(lambda c: print(c.key, c.belief), kinds={TOP})
+        """
+        wanted = KINDS if kinds is None else frozenset(kinds)
+        if not wanted <= KINDS:
+            raise ValueError(f"unknown change kinds: {sorted(wanted - KINDS)}")
+        entry = (callback, wanted)
+        self._observers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._observers:
+                self._observers.remove(entry)
+
+        return unsubscribe
+
+    def changes(self, kinds: Optional[Iterable[str]] = None, maxsize: int = 1024) -> ChangeStream:
+        """
+        Async iterator over changes (see `subscribe()`), buffering at most
+        `maxsize`; call from a running event loop and close when done.
+
+            async with bs.changes(kinds={TOP}) as feed:
+                async for change in feed:
+                    ...
+        """
+        stream = ChangeStream(maxsize)
+        stream._unsubscribe = self.subscribe(stream.push, kinds)
+        return stream
+
+    def _publish(self) -> None:
+        """Deliver the changes of the write that just completed."""
+        changes, self._pending_changes = self._pending_changes, []
+        self._deliver(changes)
+
+    def _deliver(self, changes: Iterable[BeliefChange]) -> None:
+        for change in changes:
+            for callback, kinds in list(self._observers):
+                if change.kind in kinds:
+                    try:
+                        callback(change)
+                    except Exception as e:
+                        logger.warning(f"belief change callback failed: {e}")
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """
+        Rank claim keys against free text (BM25 over claim tokens) and return
+        the best `k` as (claim key, score). Unknown query words are matched
+        to similar claim words by trigram similarity; `fuzzy=True` does that
+        for every word.
+
+            bs.search("disk usage", k=5)  # [("disk_usage:/var", 2.1), ...]
+        """
+        if self._search is None:
+            self._search = ClaimSearchIndex.build(self.claims())
+        return self._search.search(query, k, fuzzy)
+
     def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
         """Serialize the entire belief store (for persistence)."""
         return {k: [asdict(b) for b in v] for k, v in self._beliefs.items()}
 
+    def iter_export(
+        self,
+        format: str = "ndjson",
+        compression: Optional[str] = None,
+        chunk_size: int = 1 << 16,
+    ) -> Iterator[bytes]:
+        """
+        Stream the store as NDJSON or binary byte chunks, optionally
+        compressed, without building it in memory (see `aglm.export`).
+        """
+        from .export import iter_export  # export builds on this module
+
+        return iter_export(self, format, compression, chunk_size)
+
+    def import_stream(
+        self,
+        source: Union[IO[bytes], Iterable[bytes]],
+        batch_size: int = 10_000,
+    ) -> int:
+        """Add every belief from an `iter_export()` stream or file; returns the count."""
+        from .export import import_stream
+
+        return import_stream(self, source, batch_size)
+
+    # ─── CRDT sync ────────────────────────────────────────────────
+
+    def delta(self, since: Optional[DeltaCursor] = None) -> BeliefDelta:
+        """
+        Beliefs this store gained after `since` (everything when None), for
+        another node's `merge()`; pass `delta.cursor` next time. See
+        `aglm.crdt`.
+        """
+        return self._crdt_log().delta(since)
+
+    def merge(self, delta: Union[BeliefDelta, Iterable[Belief]]) -> int:
+        """
+        Add the beliefs of another node's delta that this store has not
+        seen, by (claim, source, timestamp, ordinal) ID; returns how many
+        were new. Idempotent and commutative.
+        """
+        beliefs = list(getattr(delta, "beliefs", delta))
+        return self._crdt_log().merge(self, beliefs, getattr(delta, "ordinals", None))
+
+    async def serve_replicas(
+        self,
+        address: Any,
+        backlog: int = 100_000,
+        heartbeat: float = 1.0,
+    ) -> ReplicationLeader:
+        """
+        Stream this store's mutations to read replicas on a TCP `(host, port)`
+        or Unix socket path; followers attach with `aglm.replication.Follower`.
+        Close the returned leader to stop.
+        """
+        from .replication import serve_replication  # replication builds on this module
+
+        return await serve_replication(self, address, backlog, heartbeat)
+
+    def _crdt_log(self) -> DeltaLog:
+        if self._delta_log is None:
+            from .crdt import DeltaLog  # crdt builds on this module
+
+            self._delta_log = DeltaLog.attach(self)
+        return self._delta_log
+
     @classmethod
     def from_dict(cls, data: Dict[str, List[Dict[str, Any]]]) -> "BeliefSystem":
         bs = cls()
@@ -105,8 +784,14 @@ class BeliefSystem:
                 bs.add(Belief(**entry))
         return bs
 
+    def flush(self) -> None:
+        """
+        Make recently added beliefs durable. A no-op for in-memory stores;
+        persistent backends override it. `AGLMCore` calls it once per cycle.
+        """
+
     def __len__(self) -> int:
-        return sum(len(v) for v in self._beliefs.values())
+        return self._count
 
     def __contains__(self, claim: str) -> bool:
         return self._key(claim) in self._beliefs
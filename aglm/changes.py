@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Belief change feed.
+
+Instead of re-reading a store every cycle to find out what moved, consumers
+subscribe to it:
+
+    unsubscribe = bs.subscribe(on_change, kinds={TOP})   # callback
+    async for change in bs.changes():                    # async iterator
+        ...
+
+Each `BeliefChange` is one of:
+
+  - `ADDED`   a belief was added (`belief`)
+  - `TOP`     a claim's leading belief changed (`belief` is the new leader,
+              or None when the claim's last belief was evicted; `previous`
+              is the old leader, or None for a new claim)
+  - `EVICTED` the retention policy dropped a belief (`belief`)
+
+Changes are delivered after the write that caused them completes — once
+per `add_many()` batch — so a callback always sees a consistent store.
+Callbacks run synchronously on the writer's thread; exceptions they raise
+are logged and swallowed. A store with no subscribers does no extra work
+beyond one truthiness check per belief.
+
+`ChangeStream` buffers for an async consumer. The buffer is bounded: when
+a slow consumer lets it fill, the oldest changes are dropped and counted
+in `dropped`, so the consumer can notice and resynchronize from a
+`snapshot()`. Writers may run on other threads (`ConcurrentBeliefSystem`).
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, Optional
+
+if TYPE_CHECKING:
+    from .beliefs import Belief
+
+ADDED = "add"
+TOP = "top"
+EVICTED = "evict"
+KINDS = frozenset((ADDED, TOP, EVICTED))
+
+
+@dataclass(frozen=True, slots=True)
+class BeliefChange:
+    """One change to a belief store; `version` matches the store's snapshots."""
+
+    kind: str
+    key: str
+    belief: Optional[Belief]
+    previous: Optional[Belief] = None
+    version: int = 0
+
+
+class ChangeStream:
+    """
+    Async iterator over a store's changes, with a bounded buffer. Create it
+    with `BeliefSystem.changes()` from inside a running event loop; close it
+    (or leave an `async with` block) to unsubscribe.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self._buffer: Deque[BeliefChange] = deque(maxlen=maxsize)
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.get_ident()
+        self._ready = asyncio.Event()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._closed = False
+        self.dropped = 0
+
+    def push(self, change: BeliefChange) -> None:
+        """Buffer a change; called by the store on the writer's thread."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(change)
+        if threading.get_ident() == self._thread:
+            self._ready.set()
+        else:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    def __aiter__(self) -> "ChangeStream":
+        return self
+
+    async def __anext__(self) -> BeliefChange:
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._buffer.popleft()
+
+    def close(self) -> None:
+        """Stop receiving changes; buffered ones can still be drained."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._closed = True
+        self._ready.set()
+
+    async def __aenter__(self) -> "ChangeStream":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+CompactBeliefSystem — array-backed belief storage for very large stores.
+
+`BeliefSystem` keeps one `Belief` object (plus its metadata dict) per
+recorded belief. For long-running agents holding millions of beliefs that
+object overhead dominates RSS. This store keeps the same public interface
+but lays beliefs out column-wise:
+
+  - claim text and sources are interned once in a shared string table
+  - confidence and timestamp live in typed `array('d')` columns
+  - metadata dicts are deduplicated by value (empty metadata is shared)
+  - each claim holds an `array('I')` of row numbers, not object references
+
+`Belief` objects are materialized lazily, only when `all()` / `top()` are
+called. Materialized beliefs are fresh copies; mutating them does not
+change the store.
+
+Rows are append-only, so `snapshot()` is just the current row count: a
+view sees every row below it.
+"""
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from .beliefs import Belief, BeliefSystem
+from .changes import ADDED, TOP, BeliefChange
+from .index import BeliefQuery
+from .views import BeliefView
+
+logger = logging.getLogger("aglm.compact")
+
+
+def _metadata_key(metadata: Dict[str, Any]) -> Optional[Hashable]:
+    """Hashable identity for a metadata dict, or None if it can't be shared."""
+    try:
+        # The value type is part of the key so {"v": 1} and {"v": True}
+        # (equal and equal-hashing in Python) are not merged.
+        key = tuple(sorted((k, type(v), v) for k, v in metadata.items()))
+        hash(key)
+    except TypeError:
+        return None  # unhashable values or unsortable keys
+    return key
+
+
+class CompactBeliefSystem(BeliefSystem):
+    """
+    Drop-in `BeliefSystem` with columnar, interned storage.
+
+    Use it where the belief count is large and reads are comparatively
+    rare; every `all()` / `top()` call builds new `Belief` objects.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = [{}]
+        self._metadata_ids: Dict[Hashable, int] = {(): 0}
+
+        # One row per belief.
+        self._claim_col = array("I")
+        self._source_col = array("I")
+        self._metadata_col = array("I")
+        self._confidence_col = array("d")
+        self._timestamp_col = array("d")
+
+        self._rows: Dict[str, array] = {}  # claim key -> row numbers, oldest first
+        self._leaders: Dict[str, int] = {}  # claim key -> row of the top belief
+
+    def _intern(self, text: str) -> int:
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = len(self._strings)
+            self._strings.append(text)
+            self._string_ids[text] = sid
+        return sid
+
+    def _intern_metadata(self, metadata: Dict[str, Any]) -> int:
+        key = _metadata_key(metadata)
+        if key is not None:
+            mid = self._metadata_ids.get(key)
+            if mid is not None:
+                return mid
+        mid = len(self._metadata)
+        self._metadata.append(dict(metadata))
+        if key is not None:
+            self._metadata_ids[key] = mid
+        return mid
+
+    def _belief(self, row: int) -> Belief:
+        return Belief(
+            claim=self._strings[self._claim_col[row]],
+            confidence=self._confidence_col[row],
+            source=self._strings[self._source_col[row]],
+            timestamp=self._timestamp_col[row],
+            metadata=dict(self._metadata[self._metadata_col[row]]),
+        )
+
+    def add(self, belief: Belief) -> None:
+        """Add a belief. Multiple beliefs about the same claim are allowed."""
+        self._append(belief)
+        if self._pending_changes:
+            self._publish()
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """Add several beliefs in one call; equivalent to `add()` on each."""
+        append = self._append
+        for belief in beliefs:
+            append(belief)
+        if self._pending_changes:
+            self._publish()
+
+    def _append(self, belief: Belief) -> None:
+        k = self._key(belief.claim)
+        row = len(self._confidence_col)
+        self._claim_col.append(self._intern(belief.claim))
+        self._source_col.append(self._intern(belief.source))
+        self._metadata_col.append(self._intern_metadata(belief.metadata))
+        self._confidence_col.append(belief.confidence)
+        self._timestamp_col.append(belief.timestamp)
+
+        rows = self._rows.get(k)
+        if rows is None:
+            rows = self._rows[k] = array("I")
+            if self._search is not None:
+                self._search.add_claim(k)
+            if self._contradictions is not None:
+                self._contradictions.add_claim(k)
+        rows.append(row)
+        if self._fusion is not None:
+            self._fusion.add(k, belief)
+
+        leader = self._leaders.get(k)
+        if self._observers:
+            # Versions count rows, as in snapshot().
+            self._pending_changes.append(BeliefChange(ADDED, k, belief, None, row + 1))
+            if leader is None or belief.confidence > self._confidence_col[leader]:
+                previous = None if leader is None else self._belief(leader)
+                self._pending_changes.append(BeliefChange(TOP, k, belief, previous, row + 1))
+        if leader is None or belief.confidence > self._confidence_col[leader]:
+            self._leaders[k] = row
+
+    def all(self, claim: str) -> List[Belief]:
+        """All recorded beliefs about a claim, oldest first."""
+        rows = self._rows.get(self._key(claim))
+        if rows is None:
+            return []
+        return [self._belief(row) for row in rows]
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim, or None."""
+        row = self._leaders.get(self._key(claim))
+        return None if row is None else self._belief(row)
+
+    def claims(self) -> Iterable[str]:
+        """All unique claims known to the system (lowercased keys)."""
+        return list(self._rows.keys())
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """
+        Beliefs matching every given filter, oldest first. The compact store
+        keeps no secondary indexes: this is a scan over the typed columns,
+        materializing only the matches.
+        """
+        if source is not None:
+            sid = self._string_ids.get(source)
+            if sid is None:
+                return []
+        q = BeliefQuery(None, since, until, min_confidence, max_confidence)
+        confidence, timestamp, sources = (
+            self._confidence_col, self._timestamp_col, self._source_col,
+        )
+        rows = [
+            row for row in range(len(confidence))
+            if (source is None or sources[row] == sid)
+            and q.matches(confidence[row], "", timestamp[row])
+        ]
+        rows.sort(key=timestamp.__getitem__)
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._belief(row) for row in rows]
+
+    def snapshot(self) -> BeliefView:
+        """Frozen view of the store as it is now, in O(1)."""
+        return _CompactView(self, len(self._confidence_col))
+
+    def as_of(self, *, cycle: Optional[int] = None, at: Optional[float] = None) -> BeliefView:
+        raise ValueError(
+            "CompactBeliefSystem does not support as_of(): it keeps no version history"
+        )
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the entire belief store (for persistence)."""
+        return {
+            k: [
+                {
+                    "claim": self._strings[self._claim_col[row]],
+                    "confidence": self._confidence_col[row],
+                    "source": self._strings[self._source_col[row]],
+                    "timestamp": self._timestamp_col[row],
+                    "metadata": dict(self._metadata[self._metadata_col[row]]),
+                }
+                for row in rows
+            ]
+            for k, rows in self._rows.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._confidence_col)
+
+    def __contains__(self, claim: str) -> bool:
+        return self._key(claim) in self._rows
+
+
+class _CompactView(BeliefView):
+    """Rows below `version` of an append-only `CompactBeliefSystem`."""
+
+    def __init__(self, store: CompactBeliefSystem, rows: int) -> None:
+        super().__init__()
+        self._store = store
+        self.version = rows
+
+    def _visible_rows(self, claim: str) -> array:
+        rows = self._store._rows.get(self._store._key(claim))
+        if rows is None:
+            return array("I")
+        return rows[:bisect_left(rows, self.version)]
+
+    def top(self, claim: str) -> Optional[Belief]:
+        rows = self._visible_rows(claim)
+        if not rows:
+            return None
+        confidence = self._store._confidence_col
+        leader = rows[0]
+        for row in rows:
+            if confidence[row] > confidence[leader]:
+                leader = row
+        return self._store._belief(leader)
+
+    def all(self, claim: str) -> List[Belief]:
+        return [self._store._belief(row) for row in self._visible_rows(claim)]
+
+    def claims(self) -> Iterable[str]:
+        return [k for k, rows in self._store._rows.items() if rows[0] < self.version]
+
+    def __len__(self) -> int:
+        return self.version
+
+    def __contains__(self, claim: str) -> bool:
+        return bool(self._visible_rows(claim))
@@ -0,0 +1,350 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+ConcurrentBeliefSystem — a thread-safe belief store with lock striping.
+
+`BeliefSystem` mutates plain dicts and deques without synchronization.
+Wrapping it in one global lock makes every thread (Flask handlers, several
+`AGLMCore`s on worker threads) queue behind every other one. This store
+instead partitions claims over `stripes` independent `BeliefSystem`
+shards by claim-key hash (ignoring a leading "not ", so a claim and its
+negation share a shard), each guarded by its own lock: operations on
+different claims rarely touch the same lock, and a thread holding one
+stripe never blocks the rest of the store.
+
+Per-claim operations (`add`, `top`, `all`, `in`) take one stripe lock.
+Store-wide reads (`claims`, `query`, `search`, `to_dict`) visit the stripes
+one at a time, so they never hold more than one lock but are not a single
+atomic snapshot across stripes. `claims()` is grouped by stripe rather than
+in global first-seen order, and `search()` scores with per-stripe BM25
+statistics (close to global ones when claims hash evenly).
+
+Change-feed callbacks (`subscribe()` / `changes()`) run on the writing
+thread after it releases the stripe lock.
+
+`snapshot()` / `as_of()` are the atomic store-wide reads: they take every
+stripe lock (in order) just long enough to open an O(1) view of each shard.
+
+Async callers get `a`-prefixed coroutines (`aadd`, `atop`, …). They run
+inline when the stripe lock is free and fall back to a worker thread when
+it is contended, so the event loop never blocks on another thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .beliefs import Belief, BeliefSystem, RetentionPolicy
+from .changes import BeliefChange
+from .fusion import FusedConfidence
+from .index import Conflict, split_negation
+from .views import BeliefView
+
+logger = logging.getLogger("aglm.concurrent")
+
+T = TypeVar("T")
+
+
+class ConcurrentBeliefSystem(BeliefSystem):
+    """
+    Drop-in `BeliefSystem` safe to share across threads and event loops.
+
+    Example:
+        beliefs = ConcurrentBeliefSystem(stripes=32)
+        cores = [AGLMCore(..., beliefs=beliefs) for _ in range(4)]
+        # Flask handlers can call beliefs.top(...) from their own threads.
+    """
+
+    def __init__(self, stripes: int = 16, retention: Optional[RetentionPolicy] = None):
+        if stripes < 1:
+            raise ValueError(f"stripes must be >= 1, got {stripes}")
+        super().__init__()
+        self.retention = retention  # applied by each stripe; the outer store holds nothing
+        self._shards = [BeliefSystem(retention) for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Change feed: shards queue changes per stripe under the stripe lock;
+        # writers deliver them after releasing it, so callbacks may read the
+        # store without deadlocking.
+        self._stripe_changes: List[List[BeliefChange]] = [[] for _ in range(stripes)]
+        self._detach: List[Callable[[], None]] = []
+        self._subscribe_lock = threading.Lock()  # attaching and detaching the shard feeds
+
+    def _stripe(self, claim: str) -> int:
+        # Stripe by the un-negated claim so "x" and "not x" share a shard
+        # and its contradiction index.
+        base, _positive = split_negation(self._key(claim))
+        return hash(base) % len(self._shards)
+
+    def _locked(self, i: int, fn: Callable[..., T], *args: Any) -> T:
+        with self._locks[i]:
+            return fn(*args)
+
+    # ─── per-claim operations ─────────────────────────────────────
+
+    def add(self, belief: Belief) -> None:
+        """Add a belief. Multiple beliefs about the same claim are allowed."""
+        i = self._stripe(belief.claim)
+        with self._locks[i]:
+            self._shards[i].add(belief)
+            changes = self._take_changes(i)
+        if changes:
+            self._deliver(changes)
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """Add several beliefs, taking each stripe lock once per batch."""
+        groups: Dict[int, List[Belief]] = {}
+        for belief in beliefs:
+            groups.setdefault(self._stripe(belief.claim), []).append(belief)
+        for i, group in groups.items():
+            with self._locks[i]:
+                self._shards[i].add_many(group)
+                changes = self._take_changes(i)
+            if changes:
+                self._deliver(changes)
+
+    def all(self, claim: str) -> List[Belief]:
+        """All recorded beliefs about a claim, oldest first."""
+        i = self._stripe(claim)
+        with self._locks[i]:
+            return self._shards[i].all(claim)
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim, or None."""
+        i = self._stripe(claim)
+        with self._locks[i]:
+            return self._shards[i].top(claim)
+
+    def fused(self, claim: str) -> Optional[FusedConfidence]:
+        """Combined confidence over every belief about a claim, or None."""
+        i = self._stripe(claim)
+        with self._locks[i]:
+            return self._shards[i].fused(claim)
+
+    def __contains__(self, claim: str) -> bool:
+        i = self._stripe(claim)
+        with self._locks[i]:
+            return claim in self._shards[i]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    # ─── store-wide operations (one stripe at a time) ─────────────
+
+    def _each(self, fn: Callable[[BeliefSystem], T]) -> List[T]:
+        return [self._locked(i, fn, shard) for i, shard in enumerate(self._shards)]
+
+    def claims(self) -> Iterable[str]:
+        """All unique claims (grouped by stripe, not in first-seen order)."""
+        return [k for keys in self._each(BeliefSystem.claims) for k in keys]
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """Beliefs matching every given filter, oldest first."""
+        parts = self._each(
+            lambda shard: shard.query(source, since, until, min_confidence, max_confidence, limit)
+        )
+        merged = heapq.merge(*parts, key=lambda b: b.timestamp)
+        return list(itertools.islice(merged, limit))
+
+    def conflicts(self, claim: Optional[str] = None) -> List[Conflict]:
+        """Claims held together with their negation (see `BeliefSystem.conflicts()`)."""
+        if claim is None:
+            return [c for part in self._each(BeliefSystem.conflicts) for c in part]
+        i = self._stripe(claim)
+        with self._locks[i]:
+            return self._shards[i].conflicts(claim)
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """Best `k` claim keys for `query` across stripes, as (key, score)."""
+        parts = self._each(lambda shard: shard.search(query, k, fuzzy))
+        return heapq.nsmallest(
+            k, itertools.chain.from_iterable(parts), key=lambda item: (-item[1], item[0])
+        )
+
+    def snapshot(self) -> BeliefView:
+        """Frozen view of every stripe at the same instant."""
+        return _StripedView(self, self._all_locked(BeliefSystem.snapshot))
+
+    def as_of(self, *, cycle: Optional[int] = None, at: Optional[float] = None) -> BeliefView:
+        """Past view of every stripe (needs `history_seconds` in the policy)."""
+        views: List[BeliefView] = []
+        try:
+            self._all_locked(lambda shard: views.append(shard.as_of(cycle=cycle, at=at)))
+        except ValueError:
+            for lock, view in zip(self._locks, views):
+                with lock:
+                    view.close()
+            raise
+        return _StripedView(self, views)
+
+    def mark_cycle(self, cycle: int) -> None:
+        """Record a cycle end in every stripe at the same instant."""
+        self._all_locked(lambda shard: shard.mark_cycle(cycle))
+
+    def _all_locked(self, fn: Callable[[BeliefSystem], T]) -> List[T]:
+        """Apply `fn` to every shard while holding every stripe lock."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return [fn(shard) for shard in self._shards]
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Evict beliefs older than the retention TTL in every stripe."""
+        evicted = 0
+        for i, shard in enumerate(self._shards):
+            with self._locks[i]:
+                evicted += shard.expire(now)
+                changes = self._take_changes(i)
+            if changes:
+                self._deliver(changes)
+        return evicted
+
+    def subscribe(
+        self,
+        callback: Callable[[BeliefChange], Any],
+        kinds: Optional[Iterable[str]] = None,
+    ) -> Callable[[], None]:
+        """Like `BeliefSystem.subscribe()`; callbacks run outside stripe locks."""
+        with self._subscribe_lock:
+            unsubscribe = super().subscribe(callback, kinds)
+            if not self._detach:
+                self._detach = [
+                    self._locked(i, shard.subscribe, self._stripe_changes[i].append)
+                    for i, shard in enumerate(self._shards)
+                ]
+
+        def unsubscribe_all() -> None:
+            with self._subscribe_lock:
+                unsubscribe()
+                if not self._observers and self._detach:
+                    for i, detach in enumerate(self._detach):
+                        self._locked(i, detach)
+                    self._detach = []
+
+        return unsubscribe_all
+
+    def _take_changes(self, i: int) -> List[BeliefChange]:
+        """Changes queued by stripe `i`; call with its lock held."""
+        queued = self._stripe_changes[i]
+        if not queued:
+            return queued
+        changes = list(queued)
+        queued.clear()
+        return changes
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the entire belief store (for persistence)."""
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for part in self._each(BeliefSystem.to_dict):
+            out.update(part)
+        return out
+
+    # ─── asyncio-friendly API ─────────────────────────────────────
+
+    async def _acall(self, i: int, fn: Callable[..., T], *args: Any) -> T:
+        lock = self._locks[i]
+        if lock.acquire(blocking=False):
+            try:
+                return fn(*args)
+            finally:
+                lock.release()
+        return await asyncio.to_thread(self._locked, i, fn, *args)
+
+    def _changing(self, i: int, fn: Callable[..., T], *args: Any) -> Tuple[T, List[BeliefChange]]:
+        """Call a shard write and take the changes it queued; call with lock `i` held."""
+        return fn(*args), self._take_changes(i)
+
+    async def _awrite(self, i: int, fn: Callable[..., T], *args: Any) -> T:
+        """Run a shard write like `_acall`, then deliver its changes outside the lock."""
+        result, changes = await self._acall(i, self._changing, i, fn, *args)
+        if changes:
+            self._deliver(changes)
+        return result
+
+    async def aadd(self, belief: Belief) -> None:
+        i = self._stripe(belief.claim)
+        await self._awrite(i, self._shards[i].add, belief)
+
+    async def arevise(
+        self,
+        claim: str,
+        new_confidence: float,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Belief:
+        i = self._stripe(claim)
+        return await self._awrite(
+            i, self._shards[i].revise, claim, new_confidence, source, metadata
+        )
+
+    async def arevise_many(self, *args: Any, **kwargs: Any) -> List[Belief]:
+        return await asyncio.to_thread(self.revise_many, *args, **kwargs)
+
+    async def atop(self, claim: str) -> Optional[Belief]:
+        i = self._stripe(claim)
+        return await self._acall(i, self._shards[i].top, claim)
+
+    async def aall(self, claim: str) -> List[Belief]:
+        i = self._stripe(claim)
+        return await self._acall(i, self._shards[i].all, claim)
+
+    async def aquery(self, **filters: Any) -> List[Belief]:
+        return await asyncio.to_thread(self.query, **filters)
+
+    async def asearch(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        return await asyncio.to_thread(self.search, query, k, fuzzy)
+
+
+class _StripedView(BeliefView):
+    """One view per stripe; each is read (and closed) under its stripe lock."""
+
+    def __init__(self, store: ConcurrentBeliefSystem, views: List[BeliefView]) -> None:
+        locks = store._locks
+
+        def release() -> None:
+            for lock, view in zip(locks, views):
+                with lock:
+                    view.close()
+
+        super().__init__(release)
+        self._store = store
+        self._views = views
+        self._count = sum(len(view) for view in views)
+
+    def _read(self, claim: str, method: str) -> Any:
+        i = self._store._stripe(claim)
+        with self._store._locks[i]:
+            return getattr(self._views[i], method)(claim)
+
+    def top(self, claim: str) -> Optional[Belief]:
+        return self._read(claim, "top")
+
+    def all(self, claim: str) -> List[Belief]:
+        return self._read(claim, "all")
+
+    def claims(self) -> Iterable[str]:
+        keys: List[str] = []
+        for lock, view in zip(self._store._locks, self._views):
+            with lock:
+                keys.extend(view.claims())
+        return keys
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, claim: str) -> bool:
+        return self._read(claim, "__contains__")
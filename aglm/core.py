@@ -5,7 +5,7 @@ AGLMCore — the Perceive-Orient-Decide-Act (PODA) cognitive cycle.
 
 Distilled from mindX `agents/core/agint.py`. Each cycle:
   1. PERCEIVE — gather raw observations from external sources
-  2. ORIENT   — update beliefs against the percept (BeliefSystem.revise)
+  2. ORIENT   — update beliefs against the percept (BeliefSystem.revise_many)
   3. DECIDE   — pick an action; the picker is pluggable (LLM, rule, custom)
   4. ACT      — execute the picked action; record outcome as a new belief
 
@@ -13,15 +13,35 @@ Pluggable interfaces:
   - `Perceiver`   — async callable returning a PerceptionContext
   - `Decider`     — async callable returning a Decision given context + beliefs
   - `Actor`       — async callable executing a Decision, returning an outcome dict
+
+`cycle()` runs the four stages back to back; `pipeline()` overlaps the
+stages of consecutive cycles (Perceive(n+1) while Act(n) is in flight).
+Either way every stage is timed into `core.metrics` (see `aglm.metrics`).
+
+Deadlines: `stage_timeouts={"decide": 5.0}` bounds the async stages
+(perceive, decide, act) one by one, and `cycle_timeout` bounds the time a
+cycle spends in its stages altogether. A stage that runs past either is
+cancelled — the callable sees `CancelledError` at its current `await` and
+can clean up — and the cycle ends with the usual failure outcome,
+`{"success": False, "stage": "decide", "error": "timeout"}`. Orient is
+synchronous and is never interrupted, but its time counts against
+`cycle_timeout`; so does a callable that blocks without awaiting.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
+from collections import deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union,
+)
 
 from .beliefs import Belief, BeliefSystem
+from .metrics import ACT, DECIDE, ORIENT, PERCEIVE, CycleMetrics, CycleSample
+from .views import BeliefView
 
 logger = logging.getLogger("aglm.core")
 
@@ -47,10 +67,57 @@ class Decision:
 
 # Pluggable callable types.
 Perceiver = Callable[[], Awaitable[PerceptionContext]]
-Decider = Callable[[PerceptionContext, BeliefSystem], Awaitable[Decision]]
+Decider = Callable[[PerceptionContext, Union[BeliefSystem, BeliefView]], Awaitable[Decision]]
 Actor = Callable[[Decision], Awaitable[Dict[str, Any]]]
 
 
+# Stages that await a pluggable callable, and so can be given a deadline.
+_TIMED_STAGES = ("perceive", "decide", "act")
+
+
+class _DeadlineExceeded(asyncio.TimeoutError):
+    """A stage ran past its deadline (not a TimeoutError the stage raised itself)."""
+
+
+async def _deadline(awaitable: Awaitable[Any], timeout: float) -> Any:
+    """`asyncio.wait_for`, raising `_DeadlineExceeded` only when the deadline fired."""
+    raised = False
+
+    async def watched() -> Any:
+        nonlocal raised
+        try:
+            return await awaitable
+        except (asyncio.TimeoutError, TimeoutError):
+            raised = True
+            raise
+
+    try:
+        return await asyncio.wait_for(watched(), timeout)
+    except asyncio.TimeoutError as e:
+        if raised:
+            raise
+        raise _DeadlineExceeded() from e
+
+
+class _Turnstile:
+    """Lets cycles through one pipeline stage one at a time, in cycle order."""
+
+    def __init__(self, first: int) -> None:
+        self._next = first
+        self._turn = asyncio.Condition()
+
+    @asynccontextmanager
+    async def turn(self, n: int) -> AsyncIterator[None]:
+        async with self._turn:
+            await self._turn.wait_for(lambda: self._next == n)
+        try:
+            yield
+        finally:
+            async with self._turn:
+                self._next = n + 1
+                self._turn.notify_all()
+
+
 class AGLMCore:
     """
     The PODA cycle. One call to `cycle()` runs one full Perceive →
@@ -80,86 +147,285 @@ class AGLMCore:
         act: Actor,
         beliefs: Optional[BeliefSystem] = None,
         agent_id: str = "aglm.core",
+        snapshot_decide: bool = False,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        cycle_timeout: Optional[float] = None,
     ):
         self.perceive_fn = perceive
         self.decide_fn = decide
         self.act_fn = act
-        self.beliefs = beliefs or BeliefSystem()
+        self.beliefs = beliefs if beliefs is not None else BeliefSystem()
         self.agent_id = agent_id
+        # Decide against a frozen BeliefView instead of the live store, so a
+        # slow decider sees one consistent state while others keep writing.
+        self.snapshot_decide = snapshot_decide
+        # Deadlines in seconds; None means wait as long as the stage takes.
+        self.stage_timeouts = dict(stage_timeouts or {})
+        unknown = set(self.stage_timeouts) - set(_TIMED_STAGES)
+        if unknown:
+            raise ValueError(
+                f"stage_timeouts: unknown or synchronous stages {sorted(unknown)}; "
+                f"expected some of {list(_TIMED_STAGES)} (orient counts toward cycle_timeout)"
+            )
+        self.cycle_timeout = cycle_timeout
 
         self.cycle_count = 0
         self.last_cycle_started_at: Optional[float] = None
         self.last_outcome: Optional[Dict[str, Any]] = None
+        self.metrics = CycleMetrics()
 
     async def cycle(self) -> Dict[str, Any]:
         """Run one PODA cycle. Returns the actor's outcome dict."""
+        try:
+            return await self._run_cycle()
+        finally:
+            self._end_cycle(self.cycle_count)
+
+    def _end_cycle(self, n: int) -> None:
+        # Persistent belief stores batch their writes per cycle; stores
+        # that keep history record where the cycle ended for as_of(). A
+        # rejected mark must not keep the batch from being flushed.
+        try:
+            self.beliefs.flush()
+        except Exception as e:
+            logger.warning(f"{self.agent_id}: belief flush failed: {e}")
+        try:
+            self.beliefs.mark_cycle(n)
+        except Exception as e:
+            logger.warning(f"{self.agent_id}: cycle mark failed: {e}")
+
+    async def _run_cycle(self) -> Dict[str, Any]:
         self.cycle_count += 1
+        n = self.cycle_count
         self.last_cycle_started_at = time.time()
-        logger.info(f"{self.agent_id}: cycle {self.cycle_count} starting")
+        logger.info(f"{self.agent_id}: cycle {n} starting")
+        sample = CycleSample(n, time.perf_counter_ns())
 
         # 1. Perceive
         try:
-            ctx = await self.perceive_fn()
+            ctx = await self._perceive(sample)
         except Exception as e:
-            logger.warning(f"{self.agent_id}: perceive failed: {e}")
-            self.last_outcome = {"success": False, "stage": "perceive", "error": str(e)}
-            return self.last_outcome
-
-        # 2. Orient — turn the percept into beliefs
-        for claim, value in ctx.facts.items():
-            self.beliefs.revise(
-                claim=str(claim),
-                new_confidence=0.7,  # observations come in with reasonable default confidence
-                source=ctx.source,
-                metadata={"value": value, "cycle": self.cycle_count},
+            self.last_outcome = self._failed(n, "perceive", e)
+        else:
+            self.last_outcome = await self._finish(ctx, n, sample)
+        self.metrics.record(sample, self.last_outcome, time.perf_counter_ns())
+        return self.last_outcome
+
+    async def _finish(
+        self, ctx: PerceptionContext, n: int, sample: CycleSample
+    ) -> Dict[str, Any]:
+        """Orient, Decide and Act for cycle `n`; returns the outcome dict."""
+        self._orient(ctx, n, sample)
+        try:
+            decision = await self._decide(ctx, sample)
+        except Exception as e:
+            return self._failed(n, "decide", e)
+        return await self._act(decision, n, sample)
+
+    def _budget(self, stage: str, sample: CycleSample) -> Optional[float]:
+        """Seconds `stage` may run: its own timeout, capped by what is left of the cycle's."""
+        timeout = self.stage_timeouts.get(stage)
+        if self.cycle_timeout is not None:
+            # Only the cycle's own stage time counts, not waits in pipeline().
+            left = self.cycle_timeout - sum(ns for ns in sample.ns if ns is not None) / 1e9
+            timeout = left if timeout is None else min(timeout, left)
+        return timeout
+
+    def _within(
+        self, stage: str, sample: CycleSample, awaitable: Awaitable[Any]
+    ) -> Awaitable[Any]:
+        """`awaitable`, under the stage's deadline if it has one (no wrapper otherwise)."""
+        timeout = self._budget(stage, sample)
+        if timeout is None:
+            return awaitable
+        return _deadline(awaitable, max(timeout, 0.0))
+
+    # Each stage records its own duration (raised or not) in the cycle's sample.
+
+    async def _perceive(self, sample: CycleSample) -> PerceptionContext:
+        started = time.perf_counter_ns()
+        try:
+            return await self._within("perceive", sample, self.perceive_fn())
+        finally:
+            sample.ns[PERCEIVE] = time.perf_counter_ns() - started
+
+    def _orient(self, ctx: PerceptionContext, n: int, sample: CycleSample) -> None:
+        # 2. Orient — turn the percept into beliefs, one batch per percept
+        started = time.perf_counter_ns()
+        if ctx.facts:
+            self.beliefs.revise_many(
+                claims=[str(claim) for claim in ctx.facts],
+                confidences=0.7,  # observations come in with reasonable default confidence
+                sources=ctx.source,
+                metadata=[{"value": value, "cycle": n} for value in ctx.facts.values()],
             )
+            sample.beliefs_added += len(ctx.facts)
+        sample.ns[ORIENT] = time.perf_counter_ns() - started
 
+    async def _decide(self, ctx: PerceptionContext, sample: CycleSample) -> Decision:
         # 3. Decide
+        started = time.perf_counter_ns()
+        view: Optional[BeliefView] = None
         try:
-            decision = await self.decide_fn(ctx, self.beliefs)
-        except Exception as e:
-            logger.warning(f"{self.agent_id}: decide failed: {e}")
-            self.last_outcome = {"success": False, "stage": "decide", "error": str(e)}
-            return self.last_outcome
+            if self.snapshot_decide:
+                view = self.beliefs.snapshot()
+            return await self._within(
+                "decide", sample, self.decide_fn(ctx, view if view is not None else self.beliefs)
+            )
+        finally:
+            if view is not None:
+                view.close()
+            sample.ns[DECIDE] = time.perf_counter_ns() - started
 
+    async def _act(self, decision: Decision, n: int, sample: CycleSample) -> Dict[str, Any]:
         # 4. Act
+        started = time.perf_counter_ns()
         try:
-            outcome = await self.act_fn(decision)
+            outcome = await self._within("act", sample, self.act_fn(decision))
         except Exception as e:
-            logger.warning(f"{self.agent_id}: act failed: {e}")
-            self.last_outcome = {
-                "success": False,
-                "stage": "act",
-                "decision": decision.action,
-                "error": str(e),
-            }
-            return self.last_outcome
+            sample.ns[ACT] = time.perf_counter_ns() - started
+            return self._failed(n, "act", e, decision)
 
         # Update beliefs with the outcome.
         self.beliefs.add(Belief(
             claim=f"outcome:{decision.action}",
             confidence=1.0 if outcome.get("success") else 0.2,
             source=self.agent_id,
-            metadata={"cycle": self.cycle_count, "decision": decision.action, **outcome},
+            metadata={"cycle": n, "decision": decision.action, **outcome},
         ))
-
-        self.last_outcome = {
+        sample.beliefs_added += 1
+        sample.ns[ACT] = time.perf_counter_ns() - started
+        logger.info(f"{self.agent_id}: cycle {n} complete")
+        return {
             "success": bool(outcome.get("success", True)),
             "stage": "complete",
-            "cycle": self.cycle_count,
+            "cycle": n,
             "decision": decision.action,
             "rationale": decision.rationale,
             "outcome": outcome,
         }
-        logger.info(f"{self.agent_id}: cycle {self.cycle_count} complete")
-        return self.last_outcome
+
+    def _failed(
+        self,
+        n: int,
+        stage: str,
+        error: Exception,
+        decision: Optional[Decision] = None,
+    ) -> Dict[str, Any]:
+        if isinstance(error, _DeadlineExceeded):
+            message = "timeout"
+        else:
+            message = str(error) or type(error).__name__
+        logger.warning(f"{self.agent_id}: {stage} failed: {message}")
+        if decision is None:
+            return {"success": False, "stage": stage, "error": message}
+        return {"success": False, "stage": stage, "decision": decision.action, "error": message}
+
+    # ─── pipelined execution ──────────────────────────────────────
+
+    async def pipeline(
+        self,
+        cycles: Optional[int] = None,
+        depth: int = 2,
+        strict: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run `cycles` PODA cycles (forever if None) with up to `depth` in
+        flight, yielding each outcome dict in cycle order.
+
+        Every stage still handles one cycle at a time, in cycle order, but
+        stages of different cycles overlap: Perceive(n+1) runs while
+        cycle n decides and acts. Belief writes keep their cycle order.
+        With `strict` (the default) cycle n orients only after Act(n-1)
+        has recorded its outcome, so `decide()` sees exactly the beliefs a
+        sequential `cycle()` would, and only perception overlaps. With
+        `strict=False` every stage overlaps, throughput approaches that of
+        the slowest stage, and Decide(n) may run before the outcome of
+        Act(n-1) is recorded (or, without `snapshot_decide`, while Orient(n+1)
+        writes).
+
+        Each cycle is flushed and marked for `as_of(cycle=n)` as its last
+        stage ends, before the next cycle can write: exactly where a
+        sequential `cycle()` would mark it with `strict`. With `strict=False`
+        Orient(n+1) may already have written by the time Act(n) ends, so
+        `as_of(cycle=n)` can include those observations too.
+
+            async for outcome in core.pipeline(depth=3, strict=False):
+                ...
+
+        Don't call `cycle()` while a pipeline runs.
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be >= 1, got {depth}")
+        first = self.cycle_count + 1
+        gates = [_Turnstile(first) for _ in range(2 if strict else 4)]
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()  # (cycle, task), oldest first
+        started = 0
+        try:
+            while pending or cycles is None or started < cycles:
+                while len(pending) < depth and (cycles is None or started < cycles):
+                    self.cycle_count += 1
+                    self.last_cycle_started_at = time.time()
+                    n = self.cycle_count
+                    task = asyncio.create_task(self._pipelined_cycle(n, gates, strict))
+                    pending.append((n, task))
+                    started += 1
+                _n, task = pending.popleft()
+                self.last_outcome = await task
+                yield self.last_outcome
+        finally:
+            for _n, task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*(task for _n, task in pending), return_exceptions=True)
+
+    async def _pipelined_cycle(
+        self,
+        n: int,
+        gates: List[_Turnstile],
+        strict: bool,
+    ) -> Dict[str, Any]:
+        outcome: Optional[Dict[str, Any]] = None
+        sample = CycleSample(n, time.perf_counter_ns())
+        async with gates[0].turn(n):
+            logger.info(f"{self.agent_id}: cycle {n} starting")
+            try:
+                ctx = await self._perceive(sample)
+            except Exception as e:
+                outcome = self._failed(n, "perceive", e)
+        if strict:  # the rest of the cycle runs as one stage
+            async with gates[1].turn(n):
+                try:
+                    if outcome is None:
+                        outcome = await self._finish(ctx, n, sample)
+                finally:
+                    self._end_cycle(n)  # before Orient(n+1) can write
+        else:
+            async with gates[1].turn(n):
+                if outcome is None:
+                    self._orient(ctx, n, sample)
+            async with gates[2].turn(n):
+                if outcome is None:
+                    try:
+                        decision = await self._decide(ctx, sample)
+                    except Exception as e:
+                        outcome = self._failed(n, "decide", e)
+            async with gates[3].turn(n):
+                try:
+                    if outcome is None:
+                        outcome = await self._act(decision, n, sample)
+                finally:
+                    self._end_cycle(n)
+        self.metrics.record(sample, outcome, time.perf_counter_ns())
+        return outcome
 
     def status(self) -> Dict[str, Any]:
-        """Quick snapshot of where the loop is."""
+        """Quick snapshot of where the loop is, with per-stage metrics."""
         return {
             "agent_id": self.agent_id,
             "cycle_count": self.cycle_count,
             "last_cycle_started_at": self.last_cycle_started_at,
             "belief_count": len(self.beliefs),
             "last_outcome": self.last_outcome,
+            "metrics": self.metrics.snapshot(),
         }
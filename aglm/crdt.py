@@ -0,0 +1,374 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Delta-state CRDT merge of belief stores across nodes.
+
+A belief store, seen as a CRDT, is a grow-only set of beliefs. A belief's
+identity is its ID — (claim key, source, timestamp, ordinal) — so the same
+observation arriving twice, by any route, is one belief. The ordinal
+tells apart beliefs that share the rest, such as one claim revised twice
+in a `revise_many()` batch: the node that records them numbers them 0, 1,
+... in arrival order, and deltas carry the ordinals so every other node
+keeps them. Merging is set union: idempotent, commutative and
+associative, so nodes that exchange deltas in any order, any number of
+times, converge on the same set.
+
+Each store keeps a `DeltaLog` — every belief it has seen, in arrival
+order — once `delta()` or `merge()` is first called (it then follows the
+store through the change feed). A peer remembers a `DeltaCursor` per
+node and asks only for what arrived after it:
+
+    cursor = None
+    d = node_a.delta(since=cursor)   # beliefs node_a gained since then
+    node_b.merge(d)                  # adds the ones node_b lacks
+    cursor = d.cursor
+
+Over sockets, `serve_deltas()` answers pulls and `pull()` fetches and
+merges one delta (`aglm.wire` framing, `aglm.export` binary encoding).
+
+Notes:
+  - The log (and its ID set) is in memory. A restarted node starts a new
+    log epoch and numbers what it holds again, in the same order, so it
+    derives the same IDs; cursors from the old epoch restart at 0, which
+    is correct (merge is idempotent), just O(store) once.
+  - The log follows evictions: a belief the store drops (a TTL or
+    `max_per_claim`) leaves the log, and its ID is kept as a tombstone so
+    `merge()` does not add it back from a peer that still has it. The
+    newest `tombstones` IDs are kept (100,000 by default), so the log is
+    bounded by the store plus that window; a peer that resends a belief
+    evicted longer ago re-adds it, and the store evicts it again.
+  - With a retention TTL, `merge()` also ignores beliefs already older than
+    the TTL (the store would expire them anyway), and tombstones of such
+    beliefs are dropped early.
+  - `all()` order and `top()` ties (oldest local arrival wins) can differ
+    between nodes; the belief sets, counts and untied leaders converge.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import struct
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .beliefs import Belief, BeliefSystem
+from .changes import ADDED, EVICTED, BeliefChange
+from .export import iter_encode, iter_import
+from .wire import Address, open_connection, read_frame, start_server, write_frame
+
+logger = logging.getLogger("aglm.crdt")
+
+Content = Tuple[str, str, float]  # claim key, source, timestamp
+BeliefId = Tuple[str, str, float, int]
+_HEADER = struct.Struct("<Q32sI")  # version, epoch, number of beliefs
+
+
+def _content(belief: Belief) -> Content:
+    return (BeliefSystem._key(belief.claim), belief.source, belief.timestamp)
+
+
+def belief_id(belief: Belief, ordinal: int = 0) -> BeliefId:
+    """The identity two nodes agree on: (claim key, source, timestamp, ordinal)."""
+    return _content(belief) + (ordinal,)
+
+
+def _ordinals(beliefs: Sequence[Belief]) -> List[int]:
+    """Number beliefs that share (claim key, source, timestamp) 0, 1, ... in order."""
+    counts: Dict[Content, int] = {}
+    out: List[int] = []
+    for belief in beliefs:
+        content = _content(belief)
+        n = counts.get(content, 0)
+        counts[content] = n + 1
+        out.append(n)
+    return out
+
+
+@dataclass(frozen=True)
+class DeltaCursor:
+    """How far a peer has read one node's delta log."""
+
+    epoch: str
+    version: int
+
+
+@dataclass
+class BeliefDelta:
+    """Beliefs a node gained after a cursor, and the cursor to ask from next."""
+
+    beliefs: List[Belief]
+    epoch: str
+    version: int
+    ordinals: List[int] = field(default_factory=list)  # one per belief; empty: all 0
+
+    @property
+    def cursor(self) -> DeltaCursor:
+        return DeltaCursor(self.epoch, self.version)
+
+    def encode(self) -> bytes:
+        """
+        Header (`<Q32sI` version, epoch, count), one `<I` ordinal per belief,
+        then the beliefs in binary export format.
+        """
+        n = len(self.beliefs)
+        ordinals = self.ordinals or [0] * n
+        header = _HEADER.pack(self.version, self.epoch.encode(), n)
+        return (
+            header + struct.pack(f"<{n}I", *ordinals)
+            + b"".join(iter_encode(self.beliefs, format="binary"))
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> "BeliefDelta":
+        version, epoch, n = _HEADER.unpack_from(data)
+        ordinals = list(struct.unpack_from(f"<{n}I", data, _HEADER.size))
+        beliefs = list(iter_import([data[_HEADER.size + 4 * n:]]))
+        if len(beliefs) != n:
+            raise ValueError(f"delta announces {n} beliefs but carries {len(beliefs)}")
+        return cls(beliefs, epoch.decode(), version, ordinals)
+
+
+class DeltaLog:
+    """
+    Every belief a store holds, in arrival order, with their IDs, and the
+    IDs of the last `tombstones` beliefs it evicted.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, tombstones: int = 100_000) -> None:
+        if tombstones < 0:
+            raise ValueError(f"tombstones must be >= 0, got {tombstones}")
+        self.epoch = uuid.uuid4().hex
+        self.ttl = ttl_seconds
+        self.tombstones = tombstones
+        self._log: List[Belief] = []
+        self._ordinals: List[int] = []
+        self._versions: List[int] = []  # log version each entry was recorded at, ascending
+        self._version = 0
+        self._live: Dict[BeliefId, int] = {}  # logged IDs -> their version
+        self._dead: Set[int] = set()  # versions of evicted entries still in the lists
+        self._evicted: Deque[BeliefId] = deque()  # tombstones, oldest first
+        self._tombstoned: Set[BeliefId] = set()
+        self._ids: Dict[Content, int] = {}  # live and tombstoned IDs per content
+        self._next: Dict[Content, int] = {}  # next local ordinal per content
+        self._incoming: Dict[Content, Deque[int]] = {}  # ordinals of beliefs being merged
+        self._trim_at = 0.0
+
+    @classmethod
+    def attach(cls, beliefs: BeliefSystem, tombstones: int = 100_000) -> "DeltaLog":
+        """Log everything `beliefs` holds now and, via the change feed, later."""
+        policy = beliefs.retention
+        log = cls(policy.ttl_seconds if policy is not None else None, tombstones)
+        # Subscribe first: a belief added meanwhile is seen twice, but both
+        # sightings number it alike, so it is logged once.
+        beliefs.subscribe(log._on_change, kinds={ADDED, EVICTED})
+        for key in beliefs.claims():
+            held = beliefs.all(key)
+            for belief, ordinal in zip(held, _ordinals(held)):
+                log.record(belief, ordinal)
+        return log
+
+    def _on_change(self, change: BeliefChange) -> None:
+        if change.kind == EVICTED:
+            self.forget(change.belief)
+        else:
+            self.record(change.belief)
+
+    def _seen(self, bid: BeliefId) -> bool:
+        return bid in self._live or bid in self._tombstoned
+
+    def record(self, belief: Belief, ordinal: Optional[int] = None) -> bool:
+        """
+        Log a belief under `ordinal` (by default: the one it was merged with,
+        or the next free one for its content); False if its ID was seen.
+        """
+        content = _content(belief)
+        if ordinal is None:
+            pending = self._incoming.get(content)
+            if pending:
+                ordinal = pending.popleft()
+            else:
+                ordinal = self._next.get(content, 0)
+        bid = content + (ordinal,)
+        if self._seen(bid):
+            return False
+        self._live[bid] = self._version
+        self._ids[content] = self._ids.get(content, 0) + 1
+        if ordinal >= self._next.get(content, 0):
+            self._next[content] = ordinal + 1
+        self._log.append(belief)
+        self._ordinals.append(ordinal)
+        self._versions.append(self._version)
+        self._version += 1
+        return True
+
+    def forget(self, belief: Belief) -> None:
+        """Drop an evicted belief from the log, keeping its ID as a tombstone."""
+        content = _content(belief)
+        for ordinal in range(self._next.get(content, 0)):
+            bid = content + (ordinal,)
+            version = self._live.get(bid)
+            if version is None:
+                continue
+            i = bisect.bisect_left(self._versions, version)
+            if self._log[i] == belief:
+                break
+        else:
+            return
+        del self._live[bid]
+        self._dead.add(version)
+        self._evicted.append(bid)
+        self._tombstoned.add(bid)
+        while len(self._evicted) > self.tombstones:
+            self._release(self._evicted.popleft())
+        if len(self._dead) > len(self._log) // 2:
+            self._compact()
+
+    def _release(self, bid: BeliefId) -> None:
+        """Forget a tombstone, and its content's numbering once nothing else uses it."""
+        self._tombstoned.discard(bid)
+        content = bid[:3]
+        n = self._ids[content] - 1
+        if n:
+            self._ids[content] = n
+        else:
+            del self._ids[content]
+            del self._next[content]
+
+    def _compact(self) -> None:
+        dead = self._dead
+        keep = [i for i, version in enumerate(self._versions) if version not in dead]
+        self._log = [self._log[i] for i in keep]
+        self._ordinals = [self._ordinals[i] for i in keep]
+        self._versions = [self._versions[i] for i in keep]
+        self._dead = set()
+
+    def delta(self, since: Optional[DeltaCursor] = None) -> BeliefDelta:
+        self._trim()
+        start = 0
+        if since is not None and since.epoch == self.epoch:
+            start = bisect.bisect_left(self._versions, since.version)
+        if not self._dead:
+            return BeliefDelta(self._log[start:], self.epoch, self._version, self._ordinals[start:])
+        dead = self._dead
+        keep = [i for i in range(start, len(self._log)) if self._versions[i] not in dead]
+        return BeliefDelta(
+            [self._log[i] for i in keep], self.epoch, self._version, [self._ordinals[i] for i in keep]
+        )
+
+    def merge(
+        self,
+        beliefs: BeliefSystem,
+        incoming: Sequence[Belief],
+        ordinals: Optional[Sequence[int]] = None,
+    ) -> int:
+        """Add to `beliefs` those of `incoming` whose IDs are new; returns how many."""
+        self._trim()
+        if not ordinals:
+            ordinals = _ordinals(incoming)
+        horizon = time.time() - self.ttl if self.ttl is not None else None
+        fresh: List[Belief] = []
+        ids: Set[BeliefId] = set()
+        for belief, ordinal in zip(incoming, ordinals):
+            if horizon is not None and belief.timestamp < horizon:
+                continue
+            bid = belief_id(belief, ordinal)
+            if not self._seen(bid) and bid not in ids:
+                ids.add(bid)
+                fresh.append(belief)
+                self._incoming.setdefault(bid[:3], deque()).append(ordinal)
+        if not fresh:
+            return 0
+        try:
+            beliefs.add_many(fresh)  # the change feed records them with their ordinals
+        finally:
+            self._incoming.clear()
+        return len(fresh)
+
+    def _trim(self) -> None:
+        """
+        Forget beliefs and tombstones older than the TTL (at most every
+        quarter TTL); `merge()` ignores such beliefs anyway.
+        """
+        if self.ttl is None:
+            return
+        now = time.time()
+        if now < self._trim_at:
+            return
+        self._trim_at = now + self.ttl / 4
+        horizon = now - self.ttl
+        for bid, version in list(self._live.items()):
+            if bid[2] < horizon:
+                del self._live[bid]
+                self._dead.add(version)
+                self._ids[bid[:3]] -= 1
+        expired = [bid for bid in self._evicted if bid[2] < horizon]
+        if expired:
+            self._evicted = deque(bid for bid in self._evicted if bid[2] >= horizon)
+            for bid in expired:
+                self._tombstoned.discard(bid)
+                self._ids[bid[:3]] -= 1
+        for content in [c for c, n in self._ids.items() if not n]:
+            del self._ids[content]
+            del self._next[content]
+        if self._dead:
+            self._compact()
+
+
+# ─── sockets ──────────────────────────────────────────────────────
+
+
+async def serve_deltas(beliefs: BeliefSystem, address: Address) -> asyncio.AbstractServer:
+    """
+    Answer delta pulls for `beliefs` on a TCP `(host, port)` or Unix socket
+    path. Each request frame is a JSON cursor; each reply is an encoded
+    `BeliefDelta`. Close the returned server to stop.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while (frame := await read_frame(reader)) is not None:
+                request = json.loads(frame)
+                since = DeltaCursor(request["epoch"], request["version"]) if request else None
+                await write_frame(writer, beliefs.delta(since).encode())
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"delta peer dropped: {e}")
+        finally:
+            writer.close()
+
+    return await start_server(handle, address)
+
+
+async def pull(
+    beliefs: BeliefSystem,
+    address: Union[Address, Tuple[asyncio.StreamReader, asyncio.StreamWriter]],
+    since: Optional[DeltaCursor] = None,
+) -> DeltaCursor:
+    """
+    Fetch the peer's delta after `since`, merge it into `beliefs` and
+    return the cursor to pass next time. `address` may also be an open
+    (reader, writer) pair to reuse a connection.
+    """
+    if isinstance(address, tuple) and isinstance(address[0], asyncio.StreamReader):
+        reader, writer = address
+        owned = False
+    else:
+        reader, writer = await open_connection(address)
+        owned = True
+    try:
+        request = {} if since is None else {"epoch": since.epoch, "version": since.version}
+        await write_frame(writer, json.dumps(request).encode())
+        frame = await read_frame(reader)
+        if frame is None:
+            raise ConnectionError("delta peer closed the connection")
+        delta = BeliefDelta.decode(frame)
+    finally:
+        if owned:
+            writer.close()
+    added = beliefs.merge(delta)
+    logger.debug(f"pulled {len(delta.beliefs)} beliefs, {added} new")
+    return delta.cursor
@@ -7,7 +7,8 @@ Distilled from mindX `agents/orchestration/startup_agent.py` improvement
 loop pattern. Features:
   - configurable cycle interval (default 300s like mindX)
   - circuit breaker: backoff after N consecutive failures
-  - graceful start / stop via asyncio.Event
+  - graceful start / stop via asyncio.Event; stop waits at most as long
+    as the core's cycle deadline allows before cancelling
   - exception isolation: a failing cycle never kills the loop
 """
 from __future__ import annotations
@@ -55,15 +56,28 @@ class AutonomousLoop:
             f"{self.core.agent_id}: autonomous loop started (interval={self.interval}s)"
         )
 
-    async def stop(self) -> None:
-        """Signal the loop to stop after the current cycle."""
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Signal the loop to stop after the current cycle. A cycle still
+        running after `timeout` seconds is cancelled. The default is the
+        core's `cycle_timeout` plus a second when it has one (its deadline
+        already bounds the cycle), else `interval + 10` seconds.
+        """
         self._stop_event.set()
+        if timeout is None:
+            deadline = self.core.cycle_timeout
+            timeout = self.interval + 10 if deadline is None else deadline + 1.0
         if self._task:
+            # shield: on timeout, cancel the task ourselves and wait for it to unwind.
             try:
-                await asyncio.wait_for(self._task, timeout=self.interval + 10)
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
             except asyncio.TimeoutError:
                 self._task.cancel()
                 logger.warning(f"{self.core.agent_id}: loop did not stop cleanly")
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
         logger.info(f"{self.core.agent_id}: autonomous loop stopped")
 
     async def _run(self) -> None:
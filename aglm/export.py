@@ -0,0 +1,283 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Streaming export / import of belief stores.
+
+`to_dict()` materializes the whole store as one nested dict before it can
+be written, so backing up a large store briefly costs several times its
+live size. `iter_export()` instead yields the store as a sequence of byte
+chunks, encoding one claim at a time, and `import_stream()` reads chunks
+back and adds beliefs in batches. Memory stays bounded by the chunk and
+batch sizes (plus the list of claim keys), whatever the store size:
+
+    with open("beliefs.ndjson.gz", "wb") as f:
+        for chunk in bs.iter_export(compression="gzip"):
+            f.write(chunk)
+
+    with open("beliefs.ndjson.gz", "rb") as f:
+        restored = BeliefSystem()
+        restored.import_stream(f)
+
+Formats:
+
+  - `"ndjson"` — one JSON object per belief per line, the same shape as
+    `PersistentBeliefSystem`'s write-ahead log (so a WAL imports as-is)
+  - `"binary"` — magic `AGLMSTRM`, a u16 version, then one record per
+    belief: `<ddIII` (confidence, timestamp, and the byte lengths of claim,
+    source and metadata JSON) followed by those UTF-8 bytes; empty
+    metadata is stored as zero bytes
+
+`encode_record()` and `decode_records()` expose the binary record on its
+own, without the stream header, for stores that keep beliefs in that
+format (`TieredBeliefSystem`'s segment files).
+
+Compression is optional and uses the standard library: `"gzip"`, `"bz2"`
+or `"xz"`. `import_stream()` detects both compression and format from the
+leading bytes.
+
+Exports read from `snapshot()` when the store supports it, so writers may
+carry on during a long export and the output is still one consistent
+state. Metadata values that are not JSON-serializable become `str()`.
+"""
+from __future__ import annotations
+
+import bz2
+import json
+import logging
+import lzma
+import struct
+import zlib
+from dataclasses import asdict
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from .beliefs import Belief, BeliefSystem
+
+logger = logging.getLogger("aglm.export")
+
+MAGIC = b"AGLMSTRM"
+VERSION = 1
+_RECORD = struct.Struct("<ddIII")
+_VERSION = struct.Struct("<H")
+
+FORMATS = ("ndjson", "binary")
+COMPRESSIONS = ("gzip", "bz2", "xz")
+_SIGNATURES = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "xz"))
+
+
+def _compressor(compression: Optional[str]) -> Optional[Any]:
+    if compression is None:
+        return None
+    if compression == "gzip":
+        return zlib.compressobj(wbits=31)
+    if compression == "bz2":
+        return bz2.BZ2Compressor()
+    if compression == "xz":
+        return lzma.LZMACompressor()
+    raise ValueError(f"compression must be one of {COMPRESSIONS} or None, got {compression!r}")
+
+
+def _decompressor(compression: str) -> Any:
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+def _encode_ndjson(belief: Belief) -> bytes:
+    return json.dumps(asdict(belief), default=str, separators=(",", ":")).encode() + b"\n"
+
+
+def encode_record(belief: Belief) -> bytes:
+    """One belief as a `"binary"` format record, without the stream header."""
+    claim = belief.claim.encode()
+    source = belief.source.encode()
+    metadata = (
+        json.dumps(belief.metadata, default=str, separators=(",", ":")).encode()
+        if belief.metadata else b""
+    )
+    return b"".join((
+        _RECORD.pack(belief.confidence, belief.timestamp, len(claim), len(source), len(metadata)),
+        claim,
+        source,
+        metadata,
+    ))
+
+
+def iter_export(
+    beliefs: BeliefSystem,
+    format: str = "ndjson",
+    compression: Optional[str] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[bytes]:
+    """
+    Yield `beliefs` encoded as `format`, optionally compressed, in chunks
+    of roughly `chunk_size` bytes. Claims come in `claims()` order, beliefs
+    oldest first within a claim.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+    try:
+        view = beliefs.snapshot()
+    except ValueError:  # e.g. an in-memory SQLite store: export the live store
+        view = None
+    reader = view if view is not None else beliefs
+    try:
+        everything = (belief for key in reader.claims() for belief in reader.all(key))
+        yield from iter_encode(everything, format, compression, chunk_size)
+    finally:
+        if view is not None:
+            view.close()
+
+
+def iter_encode(
+    beliefs: Iterable[Belief],
+    format: str = "ndjson",
+    compression: Optional[str] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[bytes]:
+    """Encode any iterable of beliefs the way `iter_export()` encodes a store."""
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+    encode = _encode_ndjson if format == "ndjson" else encode_record
+    compressor = _compressor(compression)
+    buffer = bytearray(MAGIC + _VERSION.pack(VERSION) if format == "binary" else b"")
+    for belief in beliefs:
+        buffer += encode(belief)
+        if len(buffer) >= chunk_size:
+            out = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if out:
+                yield out
+    out = compressor.compress(bytes(buffer)) + compressor.flush() if compressor else bytes(buffer)
+    if out:
+        yield out
+
+
+def _chunks(source: Union[IO[bytes], Iterable[bytes]], chunk_size: int) -> Iterator[bytes]:
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def _decompressed(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Detect compression from the leading bytes and undo it incrementally."""
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 6:
+            break
+    compression = next((name for sig, name in _SIGNATURES if head.startswith(sig)), None)
+    if compression is None:
+        if head:
+            yield head
+        yield from chunks
+        return
+    decompressor = _decompressor(compression)
+    for chunk in _prepend(head, chunks):
+        out = decompressor.decompress(chunk)
+        if out:
+            yield out
+    if not decompressor.eof:
+        raise ValueError(f"truncated {compression} stream")
+
+
+def _prepend(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    yield first
+    yield from rest
+
+
+def _parse_ndjson(data: Iterator[bytes]) -> Iterator[Belief]:
+    tail = b""
+    for chunk in data:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield Belief(**json.loads(line))
+    if tail.strip():
+        yield Belief(**json.loads(tail))
+
+
+def _parse_binary(data: Iterator[bytes], buffer: bytearray) -> Iterator[Belief]:
+    """Parse binary records; `buffer` holds bytes already read past the header."""
+    record_size = _RECORD.size
+    pos = 0
+    while True:
+        while len(buffer) - pos >= record_size:
+            confidence, timestamp, n_claim, n_source, n_metadata = _RECORD.unpack_from(buffer, pos)
+            end = pos + record_size + n_claim + n_source + n_metadata
+            if end > len(buffer):
+                break
+            start = pos + record_size
+            claim = buffer[start:start + n_claim].decode()
+            start += n_claim
+            source = buffer[start:start + n_source].decode()
+            start += n_source
+            metadata = json.loads(buffer[start:end]) if n_metadata else {}
+            yield Belief(claim, confidence, source, timestamp, metadata)
+            pos = end
+        del buffer[:pos]
+        pos = 0
+        chunk = next(data, None)
+        if chunk is None:
+            break
+        buffer += chunk
+    if buffer:
+        raise ValueError(f"truncated binary belief stream ({len(buffer)} trailing bytes)")
+
+
+def decode_records(data: bytes) -> List[Belief]:
+    """Beliefs from concatenated `encode_record()` records."""
+    return list(_parse_binary(iter(()), bytearray(data)))
+
+
+def iter_import(
+    source: Union[IO[bytes], Iterable[bytes]],
+    chunk_size: int = 1 << 16,
+) -> Iterator[Belief]:
+    """
+    Decode beliefs from a binary file object or an iterable of byte chunks
+    produced by `iter_export()` (any format or compression), one at a time.
+    """
+    data = _decompressed(_chunks(source, chunk_size))
+    head = bytearray()
+    for chunk in data:
+        head += chunk
+        if len(head) >= len(MAGIC) + _VERSION.size:
+            break
+    if not head.startswith(MAGIC):
+        yield from _parse_ndjson(_prepend(bytes(head), data))
+        return
+    (version,) = _VERSION.unpack_from(head, len(MAGIC))
+    if version != VERSION:
+        raise ValueError(f"unsupported belief stream version {version}")
+    yield from _parse_binary(data, head[len(MAGIC) + _VERSION.size:])
+
+
+def import_stream(
+    into: BeliefSystem,
+    source: Union[IO[bytes], Iterable[bytes]],
+    batch_size: int = 10_000,
+    chunk_size: int = 1 << 16,
+) -> int:
+    """Add every belief in `source` to `into` with `add_many()` batches; returns the count."""
+    add_many: Callable[[List[Belief]], None] = into.add_many
+    batch: List[Belief] = []
+    count = 0
+    for belief in iter_import(source, chunk_size):
+        batch.append(belief)
+        if len(batch) >= batch_size:
+            add_many(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        add_many(batch)
+        count += len(batch)
+    logger.info(f"imported {count} beliefs")
+    return count
@@ -0,0 +1,281 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+AGLMFleet — many AGLMCore agents on one event loop.
+
+`AutonomousLoop` gives each core its own task and timer. That is fine for
+a handful of agents. At thousands it means thousands of sleeping tasks
+and timers, and agents started together keep ticking together. A fleet
+instead owns every core and runs a single scheduler:
+
+  - one heap of (due time, agent) and one loop timer for the earliest
+    due time — an idle agent costs a heap entry, not a task
+  - at most `max_concurrent` cycles in flight across the whole fleet;
+    due agents wait their turn, oldest due first
+  - first ticks spread evenly over each agent's interval (by a stable
+    hash of its `agent_id`), counted from `start()` (or from `add()` once
+    running), so agents added together don't tick together
+  - the same cadence and circuit breaker as `AutonomousLoop`: the next
+    cycle is due `interval` after the last one finished, or `backoff`
+    after `max_consecutive_failures` failures in a row
+  - fleet-level `status()`: agents, cycles in flight, completed and
+    failed cycles, and how late cycles start (scheduler lag)
+
+    fleet = AGLMFleet(interval_seconds=60, max_concurrent=500)
+    for core in cores:
+        fleet.add(core)
+    await fleet.start()
+    ...
+    await fleet.stop()
+
+Agents are keyed by `agent_id`, which must be unique within a fleet. An
+agent removed and added back while its cycle is still in flight waits for
+that cycle: its next one is due `interval` after it finishes.
+`benchmarks/bench_fleet.py` ticks 10k+ agents on one core.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .core import AGLMCore
+
+logger = logging.getLogger("aglm.fleet")
+
+
+@dataclass(slots=True)
+class _Agent:
+    core: AGLMCore
+    interval: float
+    failures: int = 0
+    due: float = 0.0
+    running: bool = False
+    removed: bool = False
+
+
+class AGLMFleet:
+    """Schedule many `AGLMCore` agents on one event loop."""
+
+    def __init__(
+        self,
+        interval_seconds: float = 300.0,
+        max_concurrent: int = 256,
+        max_consecutive_failures: int = 5,
+        backoff_seconds: float = 120.0,
+    ):
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be >= 1, got {max_concurrent}")
+        self.interval = interval_seconds
+        self.max_concurrent = max_concurrent
+        self.max_failures = max_consecutive_failures
+        self.backoff = backoff_seconds
+
+        self._agents: Dict[str, _Agent] = {}
+        self._heap: List[Tuple[float, int, _Agent]] = []  # (due, tiebreak, agent)
+        self._seq = itertools.count()
+        self._running: Set[asyncio.Task] = set()
+        self._ticking: Dict[str, _Agent] = {}  # agent_id -> agent whose cycle is in flight
+        self._deferred: Dict[str, _Agent] = {}  # re-added while the old cycle runs
+        self._in_flight = 0  # counted in _tick: done callbacks run too late to free slots
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Future] = None
+        self._started_at: Optional[float] = None
+
+        self.cycles_completed = 0
+        self.cycles_failed = 0
+        self.circuit_breaks = 0
+        self.max_lag = 0.0
+        self._lag = 0.0  # moving average of how late cycles start
+
+    # ─── membership ───────────────────────────────────────────────
+
+    def add(self, core: AGLMCore, interval_seconds: Optional[float] = None) -> None:
+        """
+        Add a core; its first tick falls at a stable offset within its
+        interval, counted from `start()` if the fleet is not running yet.
+        """
+        if core.agent_id in self._agents:
+            raise ValueError(f"agent {core.agent_id!r} is already in the fleet")
+        interval = self.interval if interval_seconds is None else interval_seconds
+        agent = _Agent(core, interval)
+        self._agents[core.agent_id] = agent
+        if core.agent_id in self._ticking:  # removed mid-cycle: _tick schedules it
+            self._deferred[core.agent_id] = agent
+        elif self.is_running:
+            self._schedule(agent, self._now() + self._phase(agent))
+
+    def remove(self, agent_id: str) -> AGLMCore:
+        """Remove an agent; a cycle already in flight finishes first."""
+        agent = self._agents.pop(agent_id)
+        agent.removed = True  # its heap entry is skipped when popped
+        return agent.core
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._agents
+
+    # ─── scheduling ───────────────────────────────────────────────
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def _phase(agent: _Agent) -> float:
+        """Stable offset in [0, interval) for the agent's first tick."""
+        return agent.interval * zlib.crc32(agent.core.agent_id.encode("utf-8")) / 2**32
+
+    def _schedule(self, agent: _Agent, due: float) -> None:
+        agent.due = due
+        heapq.heappush(self._heap, (due, next(self._seq), agent))
+        if self._heap[0][2] is agent:
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        heap = self._heap
+        while not self._stopping:
+            now = self._now()
+            while heap and self._in_flight < self.max_concurrent and heap[0][0] <= now:
+                due, _seq, agent = heapq.heappop(heap)
+                if agent.removed:
+                    continue
+                lag = now - due
+                self._lag += (lag - self._lag) * 0.01
+                if lag > self.max_lag:
+                    self.max_lag = lag
+                agent.running = True
+                self._ticking[agent.core.agent_id] = agent
+                self._in_flight += 1
+                task = loop.create_task(self._tick(agent))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            # Sleep until the earliest due time, a free slot or a new agent.
+            self._wakeup = loop.create_future()
+            timer = None
+            if heap and self._in_flight < self.max_concurrent:
+                delay = heap[0][0] - self._now()
+                timer = loop.call_later(max(delay, 0.0), self._wake)
+            try:
+                await self._wakeup
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    async def _tick(self, agent: _Agent) -> None:
+        core = agent.core
+        try:
+            outcome = await core.cycle()
+            ok = bool(outcome.get("success"))
+        except Exception as e:
+            # Defensive: AGLMCore.cycle should not raise, but guard anyway.
+            logger.error(f"{core.agent_id}: cycle raised {type(e).__name__}: {e}")
+            ok = False
+        finally:
+            agent.running = False
+            self._ticking.pop(core.agent_id, None)
+            self._in_flight -= 1
+            self._wake()  # a slot is free
+        if ok:
+            agent.failures = 0
+            self.cycles_completed += 1
+        else:
+            agent.failures += 1
+            self.cycles_failed += 1
+        wait = agent.interval
+        if agent.failures >= self.max_failures:
+            logger.warning(f"{core.agent_id}: circuit-breaker OPEN — backing off {self.backoff}s")
+            wait = self.backoff
+            agent.failures = 0
+            self.circuit_breaks += 1
+        if self._stopping:
+            return
+        if not agent.removed:
+            self._schedule(agent, self._now() + wait)
+        else:
+            readded = self._deferred.pop(core.agent_id, None)
+            if readded is not None and not readded.removed:
+                self._schedule(readded, self._now() + readded.interval)
+
+    # ─── lifecycle ────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Begin scheduling. Returns immediately; the scheduler runs as a task."""
+        if self.is_running:
+            logger.warning("fleet already running")
+            return
+        # First ticks count from now, however long ago agents were added
+        # (or the fleet stopped).
+        self._stopping = False
+        self._heap.clear()
+        now = self._now()
+        for agent in self._agents.values():
+            self._schedule(agent, now + self._phase(agent))
+        self._started_at = time.time()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"fleet started with {len(self._agents)} agents")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop scheduling; wait up to `timeout` for cycles in flight, then cancel them."""
+        self._stopping = True
+        self._wake()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._running:
+            _done, pending = await asyncio.wait(set(self._running), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"fleet: cancelled {len(pending)} cycles that did not finish")
+                await asyncio.gather(*pending, return_exceptions=True)
+        # A cycle cancelled before it started never ran _tick's cleanup.
+        self._in_flight = 0
+        self._ticking.clear()
+        self._deferred.clear()
+        for agent in self._agents.values():
+            agent.running = False
+        logger.info("fleet stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        """Fleet-level counters; `agent_status()` has one agent's detail."""
+        return {
+            "is_running": self.is_running,
+            "started_at": self._started_at,
+            "agents": len(self._agents),
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "cycles_completed": self.cycles_completed,
+            "cycles_failed": self.cycles_failed,
+            "circuit_breaks": self.circuit_breaks,
+            "lag_seconds": self._lag,
+            "max_lag_seconds": self.max_lag,
+        }
+
+    def agent_status(self, agent_id: str) -> Dict[str, Any]:
+        agent = self._agents[agent_id]
+        return {
+            "interval_seconds": agent.interval,
+            "consecutive_failures": agent.failures,
+            "running": agent.running,
+            "next_due_in": None if agent.running else agent.due - self._now(),
+            "core": agent.core.status(),
+        }
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Fused confidence per claim.
+
+`top()` reports the single most confident belief; deciders that want the
+combined weight of every observation would otherwise loop over `all()`
+each cycle. `ClaimFusion` keeps running aggregates per claim, updated as
+beliefs are added and evicted, so `BeliefSystem.fused(claim)` is O(1)
+however many observations a claim has collected:
+
+  - `count`        number of beliefs
+  - `mean`         plain mean confidence
+  - `source_mean`  mean of each source's mean confidence, so a chatty
+                   source counts once
+  - `log_odds`     sum of each belief's log-odds — naive-Bayes fusion of
+                   independent evidence against a 0.5 prior;
+                   `probability` maps it back to [0, 1]
+  - `noisy_or`     1 - Π(1 - c): the chance at least one source is right
+
+Confidences are clamped to [1e-6, 1 - 1e-6] for the log-odds sum, and the
+noisy-or product is kept in log space with certain (c == 1) beliefs
+counted separately, so evictions can subtract exactly what was added.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .beliefs import Belief
+
+_EPSILON = 1e-6
+
+
+def _logit(confidence: float) -> float:
+    c = min(max(confidence, _EPSILON), 1.0 - _EPSILON)
+    return math.log(c / (1.0 - c))
+
+
+@dataclass(frozen=True, slots=True)
+class FusedConfidence:
+    """Aggregate view of every belief about one claim."""
+
+    count: int
+    mean: float
+    source_mean: float
+    log_odds: float
+    noisy_or: float
+
+    @property
+    def probability(self) -> float:
+        """`log_odds` as a probability (numerically stable sigmoid)."""
+        if self.log_odds >= 0:
+            return 1.0 / (1.0 + math.exp(-self.log_odds))
+        z = math.exp(self.log_odds)
+        return z / (1.0 + z)
+
+
+class _Aggregate:
+    __slots__ = ("count", "total", "log_odds", "log_miss", "certain", "sources", "source_total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.log_odds = 0.0
+        self.log_miss = 0.0  # Σ log(1 - c) over beliefs with c < 1
+        self.certain = 0  # beliefs with c == 1
+        self.sources: Dict[str, List[float]] = {}  # source -> [sum, count]
+        self.source_total = 0.0  # Σ over sources of that source's mean
+
+    def update(self, confidence: float, source: str, sign: int) -> None:
+        self.count += sign
+        self.total += sign * confidence
+        self.log_odds += sign * _logit(confidence)
+        if confidence >= 1.0:
+            self.certain += sign
+        else:
+            self.log_miss += sign * math.log1p(-confidence)
+        per_source = self.sources.get(source)
+        if per_source is None:
+            per_source = self.sources[source] = [0.0, 0]
+        else:
+            self.source_total -= per_source[0] / per_source[1]
+        per_source[0] += sign * confidence
+        per_source[1] += sign
+        if per_source[1]:
+            self.source_total += per_source[0] / per_source[1]
+        else:
+            del self.sources[source]
+
+    def fused(self) -> FusedConfidence:
+        return FusedConfidence(
+            count=self.count,
+            mean=self.total / self.count,
+            source_mean=self.source_total / len(self.sources),
+            log_odds=self.log_odds,
+            noisy_or=1.0 if self.certain else -math.expm1(self.log_miss),
+        )
+
+
+class ClaimFusion:
+    """Per-claim running aggregates behind `BeliefSystem.fused()`."""
+
+    def __init__(self) -> None:
+        self._claims: Dict[str, _Aggregate] = {}
+
+    @classmethod
+    def build(cls, beliefs: Iterable[Tuple[str, Belief]]) -> "ClaimFusion":
+        """Aggregate (claim key, belief) pairs."""
+        fusion = cls()
+        for key, belief in beliefs:
+            fusion.add(key, belief)
+        return fusion
+
+    def add(self, key: str, belief: Belief) -> None:
+        aggregate = self._claims.get(key)
+        if aggregate is None:
+            aggregate = self._claims[key] = _Aggregate()
+        aggregate.update(belief.confidence, belief.source, 1)
+
+    def remove(self, key: str, belief: Belief) -> None:
+        aggregate = self._claims[key]
+        if aggregate.count == 1:
+            del self._claims[key]
+        else:
+            aggregate.update(belief.confidence, belief.source, -1)
+
+    def get(self, key: str) -> Optional[FusedConfidence]:
+        aggregate = self._claims.get(key)
+        return None if aggregate is None else aggregate.fused()
+
+
+def fuse(beliefs: Iterable[Belief]) -> Optional[FusedConfidence]:
+    """Fuse beliefs about one claim in a single pass (no running state)."""
+    aggregate = _Aggregate()
+    for belief in beliefs:
+        aggregate.update(belief.confidence, belief.source, 1)
+    return aggregate.fused() if aggregate.count else None
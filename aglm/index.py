@@ -0,0 +1,397 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Secondary indexes over a belief store.
+
+`BeliefSystem` is keyed by claim only. `BeliefIndex` adds maintained
+indexes for the other questions deciders ask every cycle:
+
+  - source → beliefs            ("everything sensor.7 asserted")
+  - a timestamp-ordered timeline ("everything in the last 5 minutes")
+  - confidence buckets           ("all beliefs with confidence > 0.9")
+
+`query()` estimates how many candidates each applicable index yields,
+walks only the smallest one and filters the rest of the predicates, so
+selective queries cost O(matches) instead of O(store).
+
+Indexes hold references, not copies; belief identity (`id()`) is the
+index key, counted when a store holds the same object more than once so
+that removing one copy leaves the others indexed. The timeline uses
+tombstones for removals and compacts once they make up half of it,
+keeping eviction amortized O(1).
+
+`ClaimSearchIndex` is a token-level inverted index over claim keys with
+BM25 ranking. Query terms missing from the vocabulary (or all terms, with
+`fuzzy=True`) are expanded to similar vocabulary tokens through a
+character-trigram index, weighted by trigram Jaccard similarity — so
+"disk usage" also finds "disks_used".
+
+`ContradictionIndex` groups claim keys by their un-negated form
+(`split_negation()` strips leading "not " prefixes; an odd number of them
+makes a negative claim), so "x" and "not x" land in the same group.
+Adding or removing a claim updates one group, and the set of groups that
+hold both polarities is kept as claims come and go: listing every
+conflict costs O(conflicts), and checking one claim costs O(1).
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .beliefs import Belief
+
+CONFIDENCE_BUCKETS = 100
+
+_TOKEN_RE = re.compile(r"[^\W_]+")  # word characters, split on "_" too
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens; `_`, `.`, `:` and spaces all separate."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class BeliefQuery:
+    """Conjunctive belief filter. Ranges are inclusive; None means unbounded."""
+
+    source: Optional[str] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    min_confidence: Optional[float] = None
+    max_confidence: Optional[float] = None
+
+    def matches(self, confidence: float, source: str, timestamp: float) -> bool:
+        return (
+            (self.source is None or source == self.source)
+            and (self.since is None or timestamp >= self.since)
+            and (self.until is None or timestamp <= self.until)
+            and (self.min_confidence is None or confidence >= self.min_confidence)
+            and (self.max_confidence is None or confidence <= self.max_confidence)
+        )
+
+
+def _bucket(confidence: float) -> int:
+    return min(max(int(confidence * CONFIDENCE_BUCKETS), 0), CONFIDENCE_BUCKETS - 1)
+
+
+class BeliefIndex:
+    """Source, time and confidence indexes maintained alongside a store."""
+
+    def __init__(self) -> None:
+        self._by_source: Dict[str, Dict[int, Belief]] = {}
+        self._buckets: List[Dict[int, Belief]] = [{} for _ in range(CONFIDENCE_BUCKETS)]
+        self._times: List[float] = []  # sorted; parallel to _timeline
+        self._timeline: List[Belief] = []
+        self._copies: Dict[int, int] = {}  # id -> count, for objects indexed more than once
+        self._removed: Dict[int, int] = {}  # id -> copies tombstoned in the timeline
+        self._tombstones = 0
+
+    @classmethod
+    def build(cls, beliefs: Iterable[Belief]) -> "BeliefIndex":
+        """Index existing beliefs in one pass (one sort instead of n inserts)."""
+        index = cls()
+        ordered = sorted(beliefs, key=lambda b: b.timestamp)
+        for b in ordered:
+            index._index_by_key(b)
+        index._timeline = ordered
+        index._times = [b.timestamp for b in ordered]
+        return index
+
+    def _index_by_key(self, b: Belief) -> None:
+        bid = id(b)
+        bucket = self._buckets[_bucket(b.confidence)]
+        if bid in bucket:  # the same object again: count it, index it once
+            self._copies[bid] = self._copies.get(bid, 1) + 1
+            return
+        bucket[bid] = b
+        entries = self._by_source.get(b.source)
+        if entries is None:
+            entries = self._by_source[b.source] = {}
+        entries[bid] = b
+
+    def add(self, b: Belief) -> None:
+        if id(b) in self._removed:  # the same object re-added after removal
+            self._compact()
+        self._index_by_key(b)
+        ts = b.timestamp
+        if not self._times or ts >= self._times[-1]:
+            self._times.append(ts)
+            self._timeline.append(b)
+        else:
+            i = bisect_right(self._times, ts)
+            self._times.insert(i, ts)
+            self._timeline.insert(i, b)
+
+    def remove(self, b: Belief) -> None:
+        bid = id(b)
+        copies = self._copies.get(bid)
+        if copies is not None:  # other copies stay indexed
+            if copies > 2:
+                self._copies[bid] = copies - 1
+            else:
+                del self._copies[bid]
+        else:
+            entries = self._by_source.get(b.source)
+            if entries is not None:
+                entries.pop(bid, None)
+                if not entries:
+                    del self._by_source[b.source]
+            self._buckets[_bucket(b.confidence)].pop(bid, None)
+        self._removed[bid] = self._removed.get(bid, 0) + 1
+        self._tombstones += 1
+        if self._tombstones * 2 > len(self._timeline):
+            self._compact()
+
+    def _compact(self) -> None:
+        pending = dict(self._removed)
+        timeline: List[Belief] = []
+        for b in self._timeline:
+            n = pending.get(id(b))
+            if n:
+                pending[id(b)] = n - 1
+            else:
+                timeline.append(b)
+        self._timeline = timeline
+        self._times = [b.timestamp for b in timeline]
+        self._removed.clear()
+        self._tombstones = 0
+
+    def query(self, q: BeliefQuery, limit: Optional[int] = None) -> List[Belief]:
+        """Beliefs matching `q`, oldest first (ties in insertion order)."""
+        lo, hi = 0, len(self._times)
+        if q.since is not None:
+            lo = bisect_left(self._times, q.since)
+        if q.until is not None:
+            hi = bisect_right(self._times, q.until)
+
+        # Pick the index with the fewest candidates.
+        plans = [(max(hi - lo, 0), "time")]
+        if q.source is not None:
+            plans.append((len(self._by_source.get(q.source, ())), "source"))
+        if q.min_confidence is not None or q.max_confidence is not None:
+            first = _bucket(q.min_confidence) if q.min_confidence is not None else 0
+            last = (
+                _bucket(q.max_confidence) if q.max_confidence is not None
+                else CONFIDENCE_BUCKETS - 1
+            )
+            buckets = self._buckets[first:last + 1]
+            plans.append((sum(len(bucket) for bucket in buckets), "confidence"))
+        _size, plan = min(plans)
+
+        if plan == "time":
+            removed = self._removed
+            skipped: Dict[int, int] = {}
+            out: List[Belief] = []
+            for b in self._timeline[lo:hi]:
+                if removed:
+                    # Copies of one object share a timestamp, so all of them
+                    # are in the slice; skip as many as were tombstoned.
+                    n = removed.get(id(b))
+                    if n and skipped.get(id(b), 0) < n:
+                        skipped[id(b)] = skipped.get(id(b), 0) + 1
+                        continue
+                if not q.matches(b.confidence, b.source, b.timestamp):
+                    continue
+                out.append(b)
+                if limit is not None and len(out) >= limit:
+                    break
+            return out
+
+        if plan == "source":
+            candidates: Iterable[Belief] = self._by_source.get(q.source, {}).values()
+        else:
+            candidates = (b for bucket in buckets for b in bucket.values())
+        out = [b for b in candidates if q.matches(b.confidence, b.source, b.timestamp)]
+        if self._copies:
+            copies = self._copies
+            out = [b for b in out for _ in range(copies.get(id(b), 1))]
+        out.sort(key=lambda b: b.timestamp)
+        return out if limit is None else out[:limit]
+
+
+class ClaimSearchIndex:
+    """Incrementally maintained BM25 inverted index over claim keys."""
+
+    K1 = 1.2
+    B = 0.75
+    MIN_SIMILARITY = 0.4  # trigram Jaccard needed for a fuzzy expansion
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[str, int]] = {}  # token -> {key: term frequency}
+        self._lengths: Dict[str, int] = {}  # key -> token count
+        self._total_length = 0
+        self._trigram_tokens: Dict[str, Set[str]] = {}  # trigram -> vocabulary tokens
+
+    @classmethod
+    def build(cls, keys: Iterable[str]) -> "ClaimSearchIndex":
+        index = cls()
+        for key in keys:
+            index.add_claim(key)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add_claim(self, key: str) -> None:
+        if key in self._lengths:
+            return
+        tokens = tokenize(key)
+        self._lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                for gram in _trigrams(token):
+                    self._trigram_tokens.setdefault(gram, set()).add(token)
+            postings[key] = postings.get(key, 0) + 1
+
+    def remove_claim(self, key: str) -> None:
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for token in set(tokenize(key)):
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+                for gram in _trigrams(token):
+                    grams = self._trigram_tokens[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self._trigram_tokens[gram]
+
+    def _similar(self, token: str) -> Dict[str, float]:
+        """Vocabulary tokens whose trigram Jaccard similarity clears the bar."""
+        grams = _trigrams(token)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigram_tokens.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        similar = {}
+        for candidate, overlap in shared.items():
+            union = len(grams) + len(_trigrams(candidate)) - overlap
+            score = overlap / union
+            if score >= self.MIN_SIMILARITY:
+                similar[candidate] = score
+        return similar
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """Top-`k` claim keys for `query` as (key, score), best first."""
+        n = len(self._lengths)
+        if not n or k <= 0:
+            return []
+        avg_length = self._total_length / n
+
+        # Query term -> weight; exact vocabulary hits weigh 1.0.
+        terms: Dict[str, float] = {}
+        for token in tokenize(query):
+            if token in self._postings:
+                terms[token] = 1.0
+            if fuzzy or token not in self._postings:
+                for candidate, similarity in self._similar(token).items():
+                    if similarity > terms.get(candidate, 0.0):
+                        terms[candidate] = similarity
+
+        # BM25: idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len / avg_len)).
+        base = self.K1 * (1 - self.B)
+        scale = self.K1 * self.B / avg_length
+        lengths = self._lengths
+        scores: Dict[str, float] = {}
+        get = scores.get
+        for term, weight in terms.items():
+            postings = self._postings[term]
+            df = len(postings)
+            boost = weight * math.log(1.0 + (n - df + 0.5) / (df + 0.5)) * (self.K1 + 1)
+            for key, tf in postings.items():
+                scores[key] = get(key, 0.0) + boost * tf / (tf + base + scale * lengths[key])
+        return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+NEGATION = "not "
+
+
+def split_negation(key: str) -> Tuple[str, bool]:
+    """("x", True) for "x", ("x", False) for "not x", ("x", True) for "not not x"."""
+    positive = True
+    while key.startswith(NEGATION):
+        key = key[len(NEGATION):].lstrip()
+        positive = not positive
+    return key, positive
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """A claim and a claim that negates it, with each side's leading belief."""
+
+    claim: str
+    negation: str
+    claim_top: Optional[Belief] = None
+    negation_top: Optional[Belief] = None
+
+
+class ContradictionIndex:
+    """Claim keys grouped by un-negated form, with the groups in conflict."""
+
+    def __init__(self) -> None:
+        self._groups: Dict[str, Dict[str, bool]] = {}  # base -> {key: positive}
+        self._conflicting: Dict[str, None] = {}  # bases with both polarities, in order
+
+    @classmethod
+    def build(cls, keys: Iterable[str]) -> "ContradictionIndex":
+        index = cls()
+        for key in keys:
+            index.add_claim(key)
+        return index
+
+    def add_claim(self, key: str) -> None:
+        """Register a claim key (idempotent)."""
+        base, positive = split_negation(key)
+        group = self._groups.get(base)
+        if group is None:
+            self._groups[base] = {key: positive}
+            return
+        if key in group:
+            return
+        group[key] = positive
+        if base not in self._conflicting and len(set(group.values())) == 2:
+            self._conflicting[base] = None
+
+    def remove_claim(self, key: str) -> None:
+        base, _positive = split_negation(key)
+        group = self._groups.get(base)
+        if group is None or group.pop(key, None) is None:
+            return
+        if not group:
+            del self._groups[base]
+        if base in self._conflicting and len(set(group.values())) < 2:
+            del self._conflicting[base]
+
+    def pairs(self, key: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(claim, negation) key pairs: all of them, or those involving `key`."""
+        if key is None:
+            bases: Iterable[str] = self._conflicting
+        else:
+            base, _positive = split_negation(key)
+            bases = (base,) if base in self._conflicting else ()
+        out = []
+        for base in bases:
+            group = self._groups[base]
+            for claim, positive in group.items():
+                if not positive:
+                    continue
+                for negation, other in group.items():
+                    if not other and key in (None, claim, negation):
+                        out.append((claim, negation))
+        return out
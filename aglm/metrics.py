@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Per-stage cycle metrics for AGLMCore.
+
+Every cycle records how long each stage — perceive, orient, decide, act —
+took, on the monotonic `time.perf_counter_ns()` clock, into fixed-bucket
+log-linear histograms in the style of HdrHistogram: 16 linear sub-buckets
+per power of two, so any recorded value is known to within 1/16 (6.25%)
+from 1ns up to 2**41ns (about 36.6 minutes); longer durations count in
+the last bucket. Counts live in preallocated lists, 608 buckets per
+histogram: about 25KB per core. Recording a cycle is a few integer
+operations and list increments per stage, with no sorting and no
+allocation beyond the cycle's `CycleSample`; measure the per-stage cost on
+your hardware with `benchmarks/bench_metrics.py`. Percentiles are
+computed only when asked for.
+
+Alongside the histograms: how many times each stage completed, raised or
+timed out, how many cycles succeeded or failed, and how many beliefs
+cycles wrote (percept facts in Orient, the outcome in Act).
+
+    core.status()["metrics"]["stages"]["decide"]["p99"]    # seconds
+    unsubscribe = core.metrics.subscribe(exporter)          # per-cycle push
+
+An exporter receives a `CycleSample` after every cycle — cycle number,
+stage durations, beliefs added, success — and can forward it (Prometheus,
+StatsD, OpenTelemetry) or aggregate it; `snapshot()` gives the pulled
+view.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("aglm.metrics")
+
+STAGES = ("perceive", "orient", "decide", "act")
+PERCEIVE, ORIENT, DECIDE, ACT = range(len(STAGES))  # positions in `CycleSample.ns`
+
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS  # linear sub-buckets per power of two
+_MASK = _SUB - 1
+_MAX_BITS = 41  # bucketed up to 2**41 ns ≈ 36.6 minutes; longer lands in the last bucket
+_BUCKETS = (_MAX_BITS - _SUB_BITS + 1) << _SUB_BITS
+
+
+def _index(ns: int) -> int:
+    """Bucket index of a duration of `ns` nanoseconds."""
+    if ns < _SUB:
+        return ns if ns > 0 else 0
+    shift = ns.bit_length() - _SUB_BITS - 1
+    return min(((shift + 1) << _SUB_BITS) | ((ns >> shift) & _MASK), _BUCKETS - 1)
+
+
+def _lower(index: int) -> int:
+    """Smallest value that falls in bucket `index`."""
+    exponent, sub = index >> _SUB_BITS, index & _MASK
+    return sub if exponent == 0 else (_SUB + sub) << (exponent - 1)
+
+
+class LatencyHistogram:
+    """Fixed-bucket log-linear histogram of nanosecond durations."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * _BUCKETS  # bucket index -> count
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        self.counts[_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    @property
+    def min(self) -> int:
+        """Lower bound of the lowest occupied bucket (exact below 16ns)."""
+        if not self.count:
+            return 0
+        return _lower(next(i for i, n in enumerate(self.counts) if n))
+
+    def percentile(self, q: float) -> int:
+        """Value (ns) at quantile `q` in [0, 1], to within the bucket width."""
+        count = self.count
+        if not count:
+            return 0
+        rank = max(1, round(q * count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min((_lower(index) + _lower(index + 1)) // 2, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, and mean / min / max / p50 / p95 / p99 in seconds."""
+        scale = 1e-9
+        count = self.count
+        return {
+            "count": count,
+            "mean": self.total / count * scale if count else 0.0,
+            "min": self.min * scale,
+            "max": self.max * scale,
+            "p50": self.percentile(0.50) * scale,
+            "p95": self.percentile(0.95) * scale,
+            "p99": self.percentile(0.99) * scale,
+        }
+
+
+class CycleSample:
+    """One cycle's measurements, as handed to exporters."""
+
+    __slots__ = ("cycle", "started", "ns", "beliefs_added", "success", "stage")
+
+    def __init__(self, cycle: int, started: int) -> None:
+        self.cycle = cycle
+        self.started = started  # perf_counter_ns() at cycle start
+        # ns per stage, in STAGES order; None for stages that did not run.
+        self.ns: List[Optional[int]] = [None, None, None, None]
+        self.beliefs_added = 0
+        self.success = False
+        self.stage = ""  # "complete", or the stage that failed
+
+    @property
+    def durations(self) -> Dict[str, int]:
+        """Stage -> ns, for the stages that ran."""
+        return {stage: ns for stage, ns in zip(STAGES, self.ns) if ns is not None}
+
+    def __repr__(self) -> str:
+        return (
+            f"CycleSample(cycle={self.cycle}, stage={self.stage!r}, success={self.success}, "
+            f"durations={self.durations}, beliefs_added={self.beliefs_added})"
+        )
+
+
+class CycleMetrics:
+    """Stage histograms and counters for one AGLMCore."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, LatencyHistogram] = {s: LatencyHistogram() for s in STAGES}
+        self._by_position = [self.stages[s] for s in STAGES]
+        self.cycle = LatencyHistogram()
+        self.failed: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.timeouts: Dict[str, int] = dict.fromkeys(STAGES, 0)  # failures that timed out
+        self.cycles_succeeded = 0
+        self.cycles_failed = 0
+        self.beliefs_added = 0
+        self._exporters: List[Callable[[CycleSample], Any]] = []
+
+    def record(self, sample: CycleSample, outcome: Dict[str, Any], ended: int) -> None:
+        """Fold a finished cycle (ended at perf_counter_ns() `ended`) into the metrics."""
+        for hist, ns in zip(self._by_position, sample.ns):
+            if ns is None:
+                continue
+            # LatencyHistogram.record with _index() inlined (_SUB_BITS = 4, _MASK = 15):
+            # a call per stage is most of the cost. test_metrics checks both agree.
+            if ns >= 16:
+                shift = ns.bit_length() - 5
+                index = ((shift + 1) << 4) | ((ns >> shift) & 15)
+                if index >= _BUCKETS:
+                    index = _BUCKETS - 1
+            else:
+                index = ns if ns > 0 else 0
+            hist.counts[index] += 1
+            hist.count += 1
+            hist.total += ns
+            if ns > hist.max:
+                hist.max = ns
+        sample.stage = stage = outcome.get("stage", "complete")
+        sample.success = outcome.get("success", False)
+        if stage in self.failed:  # that stage raised: it ran, but did not complete
+            self.failed[stage] += 1
+            if outcome.get("error") == "timeout":
+                self.timeouts[stage] += 1
+        if sample.success:
+            self.cycles_succeeded += 1
+        else:
+            self.cycles_failed += 1
+        self.beliefs_added += sample.beliefs_added
+        self.cycle.record(ended - sample.started)
+        for exporter in self._exporters:
+            try:
+                exporter(sample)
+            except Exception as e:
+                logger.warning(f"metrics exporter failed: {e}")
+
+    def subscribe(self, exporter: Callable[[CycleSample], Any]) -> Callable[[], None]:
+        """
+        Call `exporter(sample)` after every cycle with its `CycleSample`.
+        Returns a function that unsubscribes. Exporters run inline on the
+        cycle's task: keep them quick, or hand off to a queue.
+        """
+        self._exporters.append(exporter)
+
+        def unsubscribe() -> None:
+            if exporter in self._exporters:
+                self._exporters.remove(exporter)
+
+        return unsubscribe
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and per-stage latency summaries (seconds)."""
+        cycles = self.cycles_succeeded + self.cycles_failed
+        return {
+            "cycles_succeeded": self.cycles_succeeded,
+            "cycles_failed": self.cycles_failed,
+            "beliefs_added": self.beliefs_added,
+            "beliefs_per_cycle": self.beliefs_added / cycles if cycles else 0.0,
+            "cycle": self.cycle.summary(),
+            "stages": {
+                stage: {
+                    "completed": self.stages[stage].count - self.failed[stage],
+                    "failed": self.failed[stage],
+                    "timeouts": self.timeouts[stage],
+                    **self.stages[stage].summary(),
+                }
+                for stage in STAGES
+            },
+        }
@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+PersistentBeliefSystem — write-ahead log + snapshot persistence (aGLM-2).
+
+Every `add()` / `revise()` is appended to a write-ahead log (WAL) as one
+JSON line. Appends are group-committed: the log is fsync'd once per
+`sync_every` records, once `sync_interval` seconds have passed, or when
+`flush()` is called (`AGLMCore` flushes once per cycle). The cost of a
+checkpoint is therefore proportional to what changed, not to the size of
+the store.
+
+Every `compact_every` records the store is compacted: the full state is
+written to a new snapshot and a fresh, empty WAL is started. On startup
+the latest snapshot is loaded and the tail of its WAL is replayed.
+
+On-disk layout of `directory` for generation G:
+
+    snapshot-G.jsonl   full state at the start of generation G (absent for G=0)
+    wal-G.jsonl        beliefs added during generation G
+
+A snapshot is written to a temporary file and renamed into place, so a
+crash during compaction leaves the previous generation intact. A torn
+final WAL line (crash mid-append) is discarded on recovery; a bad record
+with good records after it is corruption, and recovery raises
+`ValueError` rather than drop them.
+
+With a `RetentionPolicy`, evicted beliefs drop out at the next snapshot
+and are evicted again if replayed from the WAL tail.
+
+Metadata values that are not JSON-serializable are stored as `str()`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import IO, Iterable, Optional, Union
+
+from .beliefs import Belief, BeliefSystem, RetentionPolicy
+
+logger = logging.getLogger("aglm.persistence")
+
+_FILE_RE = re.compile(r"^(snapshot|wal)-(\d+)\.jsonl$")
+
+
+def _encode(belief: Belief) -> bytes:
+    return json.dumps(asdict(belief), default=str, separators=(",", ":")).encode() + b"\n"
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Directory fsync makes renames/creates durable; not supported everywhere.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class PersistentBeliefSystem(BeliefSystem):
+    """
+    A `BeliefSystem` that survives restarts.
+
+    Example:
+        with PersistentBeliefSystem("./beliefs") as bs:
+            bs.revise("door is open", 0.9, "sensor.door")
+        # … later, in a new process …
+        bs = PersistentBeliefSystem("./beliefs")
+        assert "door is open" in bs
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        sync_every: int = 256,
+        sync_interval: float = 1.0,
+        compact_every: Optional[int] = 100_000,
+        retention: Optional[RetentionPolicy] = None,
+    ):
+        super().__init__(retention)
+        self.directory = Path(directory)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+
+        self._generation = 0
+        self._wal: Optional[IO[bytes]] = None
+        self._wal_records = 0  # records in the current WAL
+        self._unsynced = 0  # records written since the last fsync
+        self._last_sync = time.monotonic()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._recover()
+        self._wal = open(self._path("wal", self._generation), "ab")
+
+    # ─── file layout ──────────────────────────────────────────────
+
+    def _path(self, kind: str, generation: int) -> Path:
+        return self.directory / f"{kind}-{generation:08d}.jsonl"
+
+    def _generations(self, kind: str) -> list[int]:
+        found = []
+        for entry in self.directory.iterdir():
+            m = _FILE_RE.match(entry.name)
+            if m and m.group(1) == kind:
+                found.append(int(m.group(2)))
+        return sorted(found)
+
+    # ─── recovery ─────────────────────────────────────────────────
+
+    def _recover(self) -> None:
+        snapshots = self._generations("snapshot")
+        self._generation = snapshots[-1] if snapshots else 0
+        if snapshots:
+            self._replay(self._path("snapshot", self._generation), truncate=False)
+        wal_path = self._path("wal", self._generation)
+        if wal_path.exists():
+            self._wal_records = self._replay(wal_path, truncate=True)
+        self._remove_older_generations()
+        logger.info(
+            f"recovered {len(self)} beliefs from {self.directory} "
+            f"(generation {self._generation}, {self._wal_records} WAL records)"
+        )
+
+    def _replay(self, path: Path, truncate: bool) -> int:
+        """Load beliefs from a JSONL file; returns the number of records."""
+        count = 0
+        good_offset = 0
+        batch: list[Belief] = []
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write
+                try:
+                    belief = Belief(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    # Only the last line can be a torn write; a bad record
+                    # with records after it is corruption, and truncating
+                    # would silently drop every good record that follows.
+                    if f.read():
+                        raise ValueError(
+                            f"corrupt record {count + 1} in {path}, with records after it: {e}"
+                        ) from e
+                    break
+                batch.append(belief)
+                if len(batch) >= 10_000:
+                    BeliefSystem.add_many(self, batch)
+                    batch.clear()
+                good_offset += len(line)
+                count += 1
+        BeliefSystem.add_many(self, batch)
+        if good_offset != path.stat().st_size:
+            if not truncate:
+                raise ValueError(f"corrupt snapshot {path}")
+            logger.warning(f"discarding torn tail of {path} after {count} records")
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+        return count
+
+    def _remove_older_generations(self) -> None:
+        for kind in ("snapshot", "wal"):
+            for gen in self._generations(kind):
+                if gen < self._generation:
+                    self._path(kind, gen).unlink(missing_ok=True)
+        for stale in self.directory.glob("*.tmp"):
+            stale.unlink(missing_ok=True)
+
+    # ─── writes ───────────────────────────────────────────────────
+
+    def add(self, belief: Belief) -> None:
+        """Add a belief and append it to the write-ahead log."""
+        self.add_many((belief,))
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """Add several beliefs and append them to the write-ahead log together."""
+        if self._wal is None:
+            raise ValueError("PersistentBeliefSystem is closed")
+        beliefs = list(beliefs)
+        # Log first: if encoding or the write fails, nothing has reached
+        # memory, the indexes or subscribers that is not in the WAL.
+        self._wal.write(b"".join(map(_encode, beliefs)))
+        super().add_many(beliefs)
+        self._wal_records += len(beliefs)
+        self._unsynced += len(beliefs)
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.flush()
+        if self.compact_every and self._wal_records >= self.compact_every:
+            self.checkpoint()
+
+    def flush(self) -> None:
+        """Group commit: fsync every WAL record written since the last flush."""
+        if self._wal is None or not self._unsynced:
+            return
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def checkpoint(self) -> None:
+        """
+        Compact: write the full store to a new snapshot, start an empty WAL
+        and drop the previous generation.
+        """
+        if self._wal is None:
+            raise ValueError("PersistentBeliefSystem is closed")
+        self.flush()
+        self._wal.close()
+
+        generation = self._generation + 1
+        final = self._path("snapshot", generation)
+        tmp = final.with_name(final.name + ".tmp")
+        with open(tmp, "wb") as f:
+            for entries in self._beliefs.values():
+                for belief in entries:
+                    f.write(_encode(belief))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, final)
+        _fsync_dir(self.directory)
+
+        self._generation = generation
+        self._wal = open(self._path("wal", generation), "ab")
+        self._wal_records = 0
+        self._remove_older_generations()
+        logger.info(f"checkpointed {len(self)} beliefs to {final}")
+
+    def close(self) -> None:
+        """Flush and close the WAL. Further writes raise."""
+        if self._wal is None:
+            return
+        self.flush()
+        self._wal.close()
+        self._wal = None
+
+    def __enter__(self) -> "PersistentBeliefSystem":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,362 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Leader/follower log-shipping replication of a belief store.
+
+One agent perceives and writes; dashboards, analytics and other agents
+read. Instead of each reader re-running perception, the writer's store
+becomes a replication leader: it keeps its ordered mutation log — beliefs
+added and beliefs evicted, in the order they happened — in a bounded
+backlog and streams it over TCP or a Unix socket. Each `Follower` applies
+the stream to a local `BeliefSystem`, so `top()`, `query()`, `search()`,
+`snapshot()` and the rest scale out across processes and machines:
+
+    leader = await bs.serve_replicas(("0.0.0.0", 7411))     # on the writer
+
+    follower = Follower(("writer-host", 7411))               # on each reader
+    await follower.start()
+    follower.beliefs.top("disk_usage:/var")
+    follower.status()["lag"]                                 # ops behind
+
+Protocol (`aglm.wire` frames; beliefs in the `aglm.export` binary format):
+the follower connects and sends its cursor, the leader epoch and the last
+sequence number it applied. If the leader still holds every operation
+after it, it streams from there; otherwise — a new follower, a restarted
+leader, or a follower more than `backlog` operations behind — it sends a
+reset: a full copy of the store and the sequence number it stands for.
+Live operations follow, one frame per run of adds or evictions, and an
+idle leader sends a heartbeat every `heartbeat` seconds. Followers
+reconnect on their own and resume from their cursor.
+
+Lag is bounded by the backlog: a follower is never streamed more than
+`backlog` operations to catch up. `Follower.status()` reports how many
+operations it trails the leader and how long ago it last matched it (at
+most about `heartbeat` seconds for a healthy follower);
+`ReplicationLeader.status()` reports the furthest-behind follower.
+
+Notes:
+  - Replicas are plain in-memory `BeliefSystem`s without a retention
+    policy of their own; the leader's evictions are replayed instead.
+  - Replicas are read-only by convention: local writes are not shipped
+    back, and the next reset drops them.
+  - With a `ConcurrentBeliefSystem` leader, a write that races a
+    follower's reset may be applied twice on that follower.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import struct
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .beliefs import Belief, BeliefSystem
+from .changes import ADDED, EVICTED, BeliefChange
+from .export import iter_encode, iter_import
+from .wire import Address, open_connection, read_frame, start_server, write_frame
+
+logger = logging.getLogger("aglm.replication")
+
+# Frame header: kind, sequence number the frame brings the follower to,
+# the leader's latest sequence number, the leader's clock.
+_HEADER = struct.Struct("<cQQd")
+_EPOCH = struct.Struct("<32s")
+_ADD = b"a"
+_EVICT = b"e"
+_RESET = b"r"
+_HEARTBEAT = b"h"
+_KINDS = {ADDED: _ADD, EVICTED: _EVICT}
+_MAX_BATCH = 10_000
+
+
+def _encode(beliefs: List[Belief]) -> bytes:
+    return b"".join(iter_encode(beliefs, format="binary"))
+
+
+def _decode(payload: bytes) -> List[Belief]:
+    return list(iter_import([payload])) if payload else []
+
+
+class ReplicationLeader:
+    """
+    Streams a store's mutation log to followers. Create it with
+    `serve_replication()` (or `BeliefSystem.serve_replicas()`); close it to
+    stop serving.
+    """
+
+    def __init__(self, beliefs: BeliefSystem, backlog: int = 100_000, heartbeat: float = 1.0):
+        if backlog < 1:
+            raise ValueError(f"backlog must be >= 1, got {backlog}")
+        self.beliefs = beliefs
+        self.backlog = backlog
+        self.heartbeat = heartbeat
+        self.epoch = uuid.uuid4().hex
+        self.seq = 0  # sequence number of the newest operation
+        self.updated_at = time.time()
+        self.resets = 0
+        self._log: Deque[Tuple[bytes, Belief]] = deque(maxlen=backlog)
+        self._lock = threading.Lock()  # writers may be on other threads
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.get_ident()
+        self._waiters: Set[asyncio.Event] = set()
+        self._sessions: Dict[asyncio.StreamWriter, int] = {}  # follower -> seq sent
+        self._tasks: Set[asyncio.Task] = set()  # one per connected follower
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unsubscribe = beliefs.subscribe(self._on_change, kinds={ADDED, EVICTED})
+
+    def _on_change(self, change: BeliefChange) -> None:
+        with self._lock:
+            self._log.append((_KINDS[change.kind], change.belief))
+            self.seq += 1
+            self.updated_at = time.time()
+        for event in list(self._waiters):
+            if threading.get_ident() == self._thread:
+                event.set()
+            else:
+                self._loop.call_soon_threadsafe(event.set)
+
+    def _since(self, seq: int) -> Optional[List[Tuple[bytes, Belief]]]:
+        """Operations after `seq`, or None if the backlog no longer reaches back."""
+        with self._lock:
+            behind = self.seq - seq
+            if behind < 0 or behind > len(self._log):
+                return None
+            return [self._log[i] for i in range(len(self._log) - behind, len(self._log))]
+
+    def _reset(self) -> Tuple[int, bytes]:
+        with self._lock:  # hold off logging so the copy matches the seq
+            seq = self.seq
+            view = self.beliefs.snapshot()
+        try:
+            payload = _encode([b for key in view.claims() for b in view.all(key)])
+        finally:
+            view.close()
+        self.resets += 1
+        return seq, _EPOCH.pack(self.epoch.encode()) + payload
+
+    async def _send(
+        self, writer: asyncio.StreamWriter, kind: bytes, seq: int, payload: bytes
+    ) -> None:
+        await write_frame(writer, _HEADER.pack(kind, seq, self.seq, time.time()) + payload)
+        self._sessions[writer] = seq
+
+    async def _stream(self, writer: asyncio.StreamWriter, sent: int) -> int:
+        """Send everything after `sent`, resetting the follower if it fell too far behind."""
+        ops = self._since(sent)
+        if ops is None:
+            seq, payload = self._reset()
+            await self._send(writer, _RESET, seq, payload)
+            return seq
+        start = 0
+        while start < len(ops):
+            kind = ops[start][0]
+            end = start + 1
+            while end < len(ops) and ops[end][0] == kind and end - start < _MAX_BATCH:
+                end += 1
+            sent += end - start
+            await self._send(writer, kind, sent, _encode([b for _k, b in ops[start:end]]))
+            start = end
+        return sent
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        event = asyncio.Event()
+        self._waiters.add(event)
+        try:
+            frame = await read_frame(reader)
+            if frame is None:
+                return
+            cursor = json.loads(frame)
+            sent = cursor["seq"] if cursor.get("epoch") == self.epoch else -1
+            self._sessions[writer] = max(sent, 0)
+            while True:
+                event.clear()
+                if sent != self.seq:
+                    sent = await self._stream(writer, sent)
+                    continue
+                try:
+                    await asyncio.wait_for(event.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    await self._send(writer, _HEARTBEAT, sent, b"")
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.info(f"replication follower dropped: {e}")
+        finally:
+            self._tasks.discard(task)
+            self._waiters.discard(event)
+            self._sessions.pop(writer, None)
+            writer.close()
+
+    def status(self) -> Dict[str, Any]:
+        """Leader position and how far behind each connected follower was last sent."""
+        return {
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "backlog": len(self._log),
+            "followers": len(self._sessions),
+            "max_lag": max((self.seq - s for s in self._sessions.values()), default=0),
+            "resets": self.resets,
+        }
+
+    def close(self) -> None:
+        """Stop accepting followers, drop connected ones and stop logging."""
+        self._unsubscribe()
+        if self._server is not None:
+            self._server.close()
+        for task in self._tasks:
+            task.cancel()
+
+    async def wait_closed(self) -> None:
+        """Wait for the server and every follower session to finish closing."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+
+async def serve_replication(
+    beliefs: BeliefSystem,
+    address: Address,
+    backlog: int = 100_000,
+    heartbeat: float = 1.0,
+) -> ReplicationLeader:
+    """
+    Make `beliefs` a replication leader on a TCP `(host, port)` or Unix
+    socket path, keeping the last `backlog` operations for followers that
+    reconnect. Call from the event loop the store is written on.
+    """
+    leader = ReplicationLeader(beliefs, backlog, heartbeat)
+    leader._server = await start_server(leader._session, address)
+    return leader
+
+
+class Follower:
+    """
+    A local read replica of a leader's store. `start()` runs it in the
+    background (reconnecting every `reconnect` seconds on failure);
+    `beliefs` is the replica.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        beliefs: Optional[BeliefSystem] = None,
+        reconnect: float = 1.0,
+    ):
+        if beliefs is not None:
+            if type(beliefs) is not BeliefSystem:
+                # Evictions are replayed on BeliefSystem's own storage, which
+                # other backends (compact, striped, SQLite, ...) do not use.
+                raise TypeError(
+                    f"a replica must be a plain BeliefSystem, got {type(beliefs).__name__}"
+                )
+            if beliefs.retention is not None:
+                # Its own TTL or per-claim limits would evict apart from the leader's log.
+                raise ValueError("a replica must not have a retention policy of its own")
+        self.address = address
+        self.beliefs = beliefs if beliefs is not None else BeliefSystem()
+        self.reconnect = reconnect
+        self.epoch: Optional[str] = None
+        self.applied = 0  # leader sequence number the replica matches
+        self.leader_seq = 0
+        self.connected = False
+        self.resets = 0
+        self.last_heard: Optional[float] = None
+        self._caught_up_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._progress = asyncio.Event()  # set whenever a frame is applied
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                reader, writer = await open_connection(self.address)
+            except OSError as e:
+                logger.info(f"replication leader unreachable: {e}")
+            else:
+                self.connected = True
+                try:
+                    await self._follow(reader, writer)
+                except ConnectionError as e:
+                    logger.info(f"replication stream lost: {e}")
+                except Exception as e:
+                    # A frame that does not decode (short header, bad belief
+                    # record, ...) may have been applied in part: start over
+                    # from a reset rather than resume from the cursor.
+                    logger.warning(
+                        f"replication frame rejected, resetting: {type(e).__name__}: {e}"
+                    )
+                    self.epoch = None
+                finally:
+                    self.connected = False
+                    writer.close()
+            await asyncio.sleep(self.reconnect)
+
+    async def _follow(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        cursor = {"epoch": self.epoch, "seq": self.applied}
+        await write_frame(writer, json.dumps(cursor).encode())
+        while (frame := await read_frame(reader)) is not None:
+            self._apply(frame)
+
+    def _apply(self, frame: bytes) -> None:
+        kind, seq, head, _leader_time = _HEADER.unpack_from(frame)
+        payload = frame[_HEADER.size:]
+        if kind == _ADD:
+            self.beliefs.add_many(_decode(payload))
+        elif kind == _EVICT:
+            self.beliefs._discard(_decode(payload))
+        elif kind == _RESET:
+            (epoch,) = _EPOCH.unpack_from(payload)
+            replica = self.beliefs
+            replica._discard([b for key in list(replica.claims()) for b in replica.all(key)])
+            replica.add_many(_decode(payload[_EPOCH.size:]))
+            self.epoch = epoch.decode()
+            self.resets += 1
+        self.applied = seq
+        self.leader_seq = max(head, seq)
+        self.last_heard = time.time()
+        if self.applied >= self.leader_seq:
+            self._caught_up_at = self.last_heard
+        self._progress.set()
+
+    async def wait_for(self, seq: int, timeout: Optional[float] = None) -> None:
+        """Wait until the replica has applied the leader's operation `seq`."""
+
+        async def applied() -> None:
+            while self.epoch is None or self.applied < seq:
+                self._progress.clear()
+                await self._progress.wait()
+
+        await asyncio.wait_for(applied(), timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """Replica position and lag: operations behind, and seconds since it last matched."""
+        now = time.time()
+        return {
+            "connected": self.connected,
+            "epoch": self.epoch,
+            "applied": self.applied,
+            "leader_seq": self.leader_seq,
+            "lag": self.leader_seq - self.applied,
+            "lag_seconds": None if self._caught_up_at is None else now - self._caught_up_at,
+            "last_heard": self.last_heard,
+            "resets": self.resets,
+            "belief_count": len(self.beliefs),
+        }
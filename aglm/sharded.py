@@ -0,0 +1,264 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+ShardedFleet — AGLMCore agents sharded across worker processes.
+
+`AGLMFleet` runs every agent on one event loop, so every `decide_fn`
+shares one core. A `ShardedFleet` places agents on `workers` processes by
+a stable hash of their `agent_id`; each worker runs its shard as an
+`AGLMFleet` on its own event loop, so CPU-bound deciders spread across
+the cores of the box. The parent only starts, stops and watches:
+
+    def make_agent(agent_id: str) -> AGLMCore:      # module level: picklable
+        return AGLMCore(perceive, decide, act, agent_id=agent_id)
+
+    fleet = ShardedFleet(make_agent, agent_ids, workers=8, interval_seconds=60)
+    await fleet.start()
+    fleet.status()          # totals + per-shard, reported by the workers
+    await fleet.stop()
+
+Agents are built inside their worker by calling `factory(agent_id)`, so
+cores, their callables and their belief stores never cross a process
+boundary; the factory must be importable by the workers (a module-level
+function), because workers are spawned rather than forked by default.
+Workers report their fleet's `status()` every `report_seconds`, and once
+more when they stop.
+
+Membership is fixed for the life of a run; placement depends only on the
+agent id and the worker count, so a restart puts every agent back on the
+same shard.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .core import AGLMCore
+from .fleet import AGLMFleet
+
+logger = logging.getLogger("aglm.sharded")
+
+AgentFactory = Callable[[str], AGLMCore]
+
+# Fleet counters that add up across shards.
+_TOTALS = ("agents", "in_flight", "cycles_completed", "cycles_failed", "circuit_breaks")
+
+
+def shard_of(agent_id: str, shards: int) -> int:
+    """Worker index for `agent_id`; stable across processes and runs."""
+    return zlib.crc32(agent_id.encode("utf-8")) % shards
+
+
+def _worker(shard, factory, agent_ids, options, report_seconds, control, reports) -> None:
+    asyncio.run(_serve(shard, factory, agent_ids, options, report_seconds, control, reports))
+
+
+async def _serve(shard, factory, agent_ids, options, report_seconds, control, reports) -> None:
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    stop_timeout = [10.0]
+
+    def wait_for_stop() -> None:
+        try:
+            stop_timeout[0] = control.recv()
+        except EOFError:  # the parent went away: stop as well
+            pass
+        loop.call_soon_threadsafe(stopping.set)
+
+    threading.Thread(target=wait_for_stop, daemon=True).start()
+
+    fleet = AGLMFleet(**options)
+    for agent_id in agent_ids:
+        fleet.add(factory(agent_id))
+    await fleet.start()
+
+    def report() -> None:
+        reports.send({"shard": shard, "pid": os.getpid(), "at": time.time(), **fleet.status()})
+
+    try:
+        report()
+        while not stopping.is_set():
+            try:
+                await asyncio.wait_for(stopping.wait(), report_seconds)
+            except asyncio.TimeoutError:
+                report()
+        await fleet.stop(stop_timeout[0])
+        report()
+    finally:
+        reports.close()
+
+
+class _Shard:
+    __slots__ = ("index", "process", "control", "reports", "report", "rate", "closed")
+
+    def __init__(self, index: int, process, control, reports):
+        self.index = index
+        self.process = process
+        self.control = control
+        self.reports = reports
+        self.report: Dict[str, Any] = {}
+        self.rate = 0.0  # cycles/s between the last two reports
+        self.closed: Optional[asyncio.Future] = None  # done once the worker hung up
+
+
+class ShardedFleet:
+    """Run `AGLMFleet`s of agents in `workers` processes, sharded by agent id."""
+
+    def __init__(
+        self,
+        factory: AgentFactory,
+        agent_ids: Iterable[str],
+        workers: Optional[int] = None,
+        interval_seconds: float = 300.0,
+        max_concurrent: int = 256,
+        max_consecutive_failures: int = 5,
+        backoff_seconds: float = 120.0,
+        report_seconds: float = 1.0,
+        mp_context: str = "spawn",
+    ):
+        self.factory = factory
+        self.agent_ids = list(agent_ids)
+        if len(set(self.agent_ids)) != len(self.agent_ids):
+            raise ValueError("agent ids must be unique")
+        self.workers = workers or os.cpu_count() or 1
+        self.report_seconds = report_seconds
+        # Per worker: each shard caps its own concurrent cycles.
+        self._options = {
+            "interval_seconds": interval_seconds,
+            "max_concurrent": max_concurrent,
+            "max_consecutive_failures": max_consecutive_failures,
+            "backoff_seconds": backoff_seconds,
+        }
+        self._context = multiprocessing.get_context(mp_context)
+        self._shards: List[_Shard] = []
+        self._started_at: Optional[float] = None
+
+    def shard_of(self, agent_id: str) -> int:
+        return shard_of(agent_id, self.workers)
+
+    def placement(self) -> List[List[str]]:
+        """Agent ids on each worker, in worker order."""
+        shards: List[List[str]] = [[] for _ in range(self.workers)]
+        for agent_id in self.agent_ids:
+            shards[self.shard_of(agent_id)].append(agent_id)
+        return shards
+
+    # ─── lifecycle ────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Spawn the workers. Returns once they are launched; agents tick in the workers."""
+        if self.is_running:
+            logger.warning("sharded fleet already running")
+            return
+        loop = asyncio.get_running_loop()
+        self._shards = []
+        for index, agent_ids in enumerate(self.placement()):
+            control_recv, control_send = self._context.Pipe(duplex=False)
+            reports_recv, reports_send = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_worker,
+                name=f"aglm-shard-{index}",
+                args=(
+                    index, self.factory, agent_ids, self._options,
+                    self.report_seconds, control_recv, reports_send,
+                ),
+                daemon=True,
+            )
+            process.start()
+            control_recv.close()
+            reports_send.close()
+            shard = _Shard(index, process, control_send, reports_recv)
+            shard.closed = loop.create_future()
+            threading.Thread(
+                target=self._read, args=(shard, loop), name=f"aglm-shard-{index}-reports",
+                daemon=True,
+            ).start()
+            self._shards.append(shard)
+        self._started_at = time.time()
+        logger.info(
+            f"sharded fleet started: {len(self.agent_ids)} agents on {self.workers} workers"
+        )
+
+    @staticmethod
+    def _read(shard: _Shard, loop: asyncio.AbstractEventLoop) -> None:
+        """Collect a worker's reports until it closes its end (runs in a thread)."""
+        while True:
+            try:
+                report = shard.reports.recv()
+            except (EOFError, OSError):
+                try:
+                    loop.call_soon_threadsafe(shard.closed.set_result, None)
+                except RuntimeError:  # the parent's loop is already closed
+                    pass
+                return
+            previous = shard.report
+            if previous and report["at"] > previous["at"]:
+                cycles = report["cycles_completed"] + report["cycles_failed"]
+                cycles -= previous["cycles_completed"] + previous["cycles_failed"]
+                shard.rate = cycles / (report["at"] - previous["at"])
+            shard.report = report
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop every worker after its cycles in flight (cancelling any still
+        running after `timeout`); terminate workers that have not exited
+        shortly after that.
+        """
+        if not self._shards:
+            return
+        for shard in self._shards:
+            try:
+                shard.control.send(timeout)
+            except OSError:  # worker already gone
+                pass
+        _done, pending = await asyncio.wait(
+            [shard.closed for shard in self._shards], timeout=timeout + 10.0
+        )
+        for shard in self._shards:
+            if shard.closed in pending:
+                logger.warning(f"shard {shard.index}: did not stop cleanly, terminating")
+                shard.process.terminate()
+        await asyncio.gather(*(asyncio.to_thread(s.process.join) for s in self._shards))
+        await asyncio.gather(*(shard.closed for shard in self._shards))
+        for shard in self._shards:
+            shard.control.close()
+            shard.reports.close()
+        logger.info("sharded fleet stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return any(shard.process.is_alive() for shard in self._shards)
+
+    def status(self) -> Dict[str, Any]:
+        """Fleet totals across workers, from each worker's latest report, plus per-shard detail."""
+        reports = [shard.report for shard in self._shards]
+        status: Dict[str, Any] = {
+            "is_running": self.is_running,
+            "started_at": self._started_at,
+            "workers": self.workers,
+            "workers_alive": sum(shard.process.is_alive() for shard in self._shards),
+        }
+        for key in _TOTALS:
+            status[key] = sum(report.get(key, 0) for report in reports)
+        status["cycles_per_second"] = sum(shard.rate for shard in self._shards)
+        status["max_lag_seconds"] = max(
+            (report.get("max_lag_seconds", 0.0) for report in reports), default=0.0
+        )
+        status["shards"] = [
+            {
+                "shard": shard.index,
+                "pid": shard.process.pid,
+                "alive": shard.process.is_alive(),
+                "exitcode": shard.process.exitcode,
+                "cycles_per_second": shard.rate,
+                **shard.report,
+            }
+            for shard in self._shards
+        ]
+        return status
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Belief stores shared between processes through shared memory.
+
+Handing a `BeliefSystem` to a process pool pickles the whole store into
+every worker: slow to send, and memory grows with the worker count.
+`SharedBeliefSystem.create()` instead writes the store once, in the binary
+snapshot layout of `aglm.snapshot`, into a `multiprocessing.shared_memory`
+segment. Workers attach to the segment by name and answer `top()`,
+`all()`, `claims()`, `query()` and `in` from the shared pages in place,
+the way `MappedBeliefSystem` reads a mapped file. Nothing is copied or
+parsed up front, and pickling a `SharedBeliefSystem` sends only the
+segment name, so it can be passed straight to pool tasks:
+
+    with SharedBeliefSystem.create(core.beliefs) as shared:
+        with ProcessPoolExecutor() as pool:
+            scores = list(pool.map(evaluate, [shared] * n, candidates))
+
+    def evaluate(beliefs, candidate):       # in a worker: attaches, no copy
+        return beliefs.top(candidate)
+
+The segment is read-only once written. Beliefs added to a
+`SharedBeliefSystem` go to that process's in-memory overlay and are not
+seen by other processes; to publish a newer state, create a new segment.
+The process that created a segment unlinks it on `close()`; attached
+processes only detach.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import sys
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+from .beliefs import BeliefSystem, RetentionPolicy
+from .snapshot import BeliefSnapshot, MappedBeliefSystem, _write
+
+logger = logging.getLogger("aglm.shared")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # Attached processes must not unlink the segment when they exit.
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedBeliefSystem(MappedBeliefSystem):
+    """
+    A `MappedBeliefSystem` whose snapshot lives in a named shared-memory
+    segment. `create()` publishes a store; `SharedBeliefSystem(name)`
+    attaches to one.
+    """
+
+    def __init__(self, name: str, retention: Optional[RetentionPolicy] = None):
+        BeliefSystem.__init__(self, retention)
+        self._segment: Optional[shared_memory.SharedMemory] = _attach(name)
+        self._owner = False
+        self._snapshot = BeliefSnapshot(self._segment.buf)
+
+    @classmethod
+    def create(
+        cls,
+        beliefs: BeliefSystem,
+        name: Optional[str] = None,
+        retention: Optional[RetentionPolicy] = None,
+    ) -> "SharedBeliefSystem":
+        """
+        Write `beliefs` (any backend) to a new shared-memory segment (named
+        `name`, or a generated name) and return a store attached to it that
+        owns the segment.
+        """
+        buffer = io.BytesIO()
+        record_count, claim_count = _write(beliefs, buffer)
+        with buffer.getbuffer() as data:
+            size = len(data)
+            segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+            segment.buf[:size] = data
+        shared = cls.__new__(cls)
+        BeliefSystem.__init__(shared, retention)
+        shared._segment = segment
+        shared._owner = True
+        shared._snapshot = BeliefSnapshot(segment.buf)
+        logger.info(
+            f"shared {record_count} beliefs ({claim_count} claims) in {segment.name}, "
+            f"{size} bytes"
+        )
+        return shared
+
+    @property
+    def name(self) -> str:
+        """Segment name other processes attach with."""
+        return self._segment.name
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Workers re-attach by name; the overlay stays with this process.
+        return (type(self), (self.name, self.retention))
+
+    def close(self) -> None:
+        """Detach from the segment, and unlink it if this store created it."""
+        if self._segment is None:
+            return
+        self._snapshot = None
+        self._segment.close()
+        if self._owner:
+            self._segment.unlink()
+        self._segment = None
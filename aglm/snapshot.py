@@ -0,0 +1,422 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Binary belief snapshots — memory-mapped, queryable in place.
+
+`from_dict()` rebuilds every `Belief` from a JSON-shaped dict, which makes
+cold starts of large stores slow and briefly doubles memory.
+`write_snapshot()` instead writes a versioned binary file of fixed-width
+records plus a string table; `MappedBeliefSystem` opens it with `mmap` and
+answers `top()` / `all()` / `claims()` / `len()` / `in` straight from the
+mapping. Nothing is deserialized up front, so opening is O(1) and pages
+are loaded by the OS as they are touched. New beliefs go to an in-memory
+overlay; `materialize()` builds a plain `BeliefSystem` on demand. The
+mapped file never changes, so `snapshot()` and `as_of()` only version the
+overlay (the retention policy, history included, applies to it alone).
+
+File layout (little-endian, version 1):
+
+    header      magic "AGLMSNAP", version, counts and section offsets
+    records     record_count × (claim_sid u32, source_sid u32,
+                metadata_sid u32, pad u32, confidence f64, timestamp f64),
+                grouped by claim, oldest first within a claim
+    claims      claim_count × (key_sid u32, count u32, first u64, top u64),
+                in first-seen order
+    sorted      claim_count × u32 — claim indices ordered by key bytes,
+                for binary search
+    offsets     (string_count + 1) × u64 — string boundaries in the blob
+    blob        UTF-8 string data (claim text, keys, sources, metadata JSON)
+
+Metadata is stored as JSON (values that are not JSON-serializable become
+`str()`); `metadata_sid` 0xFFFFFFFF means empty metadata.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import mmap
+import os
+import struct
+from dataclasses import replace
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .beliefs import Belief, BeliefSystem, RetentionPolicy
+from .changes import TOP
+from .index import BeliefQuery
+from .views import BeliefView
+
+logger = logging.getLogger("aglm.snapshot")
+
+MAGIC = b"AGLMSNAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQQQQQQQQ")
+_RECORD = struct.Struct("<IIIIdd")
+_CLAIM = struct.Struct("<IIQQ")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_NO_METADATA = 0xFFFFFFFF
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[bytes] = []
+
+    def intern(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text.encode("utf-8"))
+        return sid
+
+
+def write_snapshot(beliefs: BeliefSystem, path: Union[str, os.PathLike]) -> int:
+    """
+    Write `beliefs` (any `BeliefSystem` backend) to a binary snapshot at
+    `path`, atomically. Returns the number of records written.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        record_count, claim_count = _write(beliefs, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    logger.info(f"wrote {record_count} beliefs ({claim_count} claims) to {path}")
+    return record_count
+
+
+def _write(beliefs: BeliefSystem, f: IO[bytes]) -> Tuple[int, int]:
+    """Write the snapshot layout to a seekable binary file; returns (records, claims)."""
+    strings = _StringTable()
+    claims: List[Tuple[int, int, int, int]] = []
+    keys: List[bytes] = []
+    record_count = 0
+    f.write(b"\0" * _HEADER.size)
+    records_offset = f.tell()
+    for key in beliefs.claims():
+        first = record_count
+        top = first
+        top_confidence = -1.0
+        for b in beliefs.all(key):
+            if b.confidence > top_confidence:
+                top, top_confidence = record_count, b.confidence
+            metadata_sid = (
+                strings.intern(json.dumps(b.metadata, default=str, sort_keys=True))
+                if b.metadata else _NO_METADATA
+            )
+            f.write(_RECORD.pack(
+                strings.intern(b.claim),
+                strings.intern(b.source),
+                metadata_sid,
+                0,
+                b.confidence,
+                b.timestamp,
+            ))
+            record_count += 1
+        if record_count > first:
+            claims.append((strings.intern(key), record_count - first, first, top))
+            keys.append(key.encode("utf-8"))
+
+    claims_offset = f.tell()
+    for claim in claims:
+        f.write(_CLAIM.pack(*claim))
+
+    sorted_offset = f.tell()
+    for index in sorted(range(len(keys)), key=keys.__getitem__):
+        f.write(_U32.pack(index))
+
+    offsets_offset = f.tell()
+    position = 0
+    for s in strings.strings:
+        f.write(_U64.pack(position))
+        position += len(s)
+    f.write(_U64.pack(position))
+
+    blob_offset = f.tell()
+    for s in strings.strings:
+        f.write(s)
+
+    f.seek(0)
+    f.write(_HEADER.pack(
+        MAGIC, VERSION, 0, 0,
+        record_count, len(claims), len(strings.strings),
+        records_offset, claims_offset, sorted_offset, offsets_offset, blob_offset,
+    ))
+    return record_count, len(claims)
+
+
+class BeliefSnapshot:
+    """
+    Read-only view over a snapshot held in any buffer (an `mmap`, `bytes`,
+    a shared-memory segment). Every query reads the buffer in place.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self._buf = buffer
+        (
+            magic, version, _flags, _reserved,
+            self._record_count, self._claim_count, self._string_count,
+            self._records, self._claims, self._sorted, self._offsets, self._blob,
+        ) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not an aGLM belief snapshot")
+        if version != VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+    # ─── low-level access ─────────────────────────────────────────
+
+    def _bytes(self, sid: int) -> bytes:
+        start, end = struct.unpack_from("<QQ", self._buf, self._offsets + 8 * sid)
+        return bytes(self._buf[self._blob + start:self._blob + end])
+
+    def _string(self, sid: int) -> str:
+        return self._bytes(sid).decode("utf-8")
+
+    def _claim(self, index: int) -> Tuple[int, int, int, int]:
+        return _CLAIM.unpack_from(self._buf, self._claims + _CLAIM.size * index)
+
+    def _belief(self, row: int) -> Belief:
+        claim_sid, source_sid, metadata_sid, _pad, confidence, timestamp = _RECORD.unpack_from(
+            self._buf, self._records + _RECORD.size * row
+        )
+        return Belief(
+            claim=self._string(claim_sid),
+            confidence=confidence,
+            source=self._string(source_sid),
+            timestamp=timestamp,
+            metadata={} if metadata_sid == _NO_METADATA else json.loads(self._string(metadata_sid)),
+        )
+
+    def _find(self, key: str) -> Optional[int]:
+        """Binary search the sorted claim index; returns a claim index or None."""
+        target = key.encode("utf-8")
+        lo, hi = 0, self._claim_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            index = _U32.unpack_from(self._buf, self._sorted + 4 * mid)[0]
+            probe = self._bytes(self._claim(index)[0])
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return index
+        return None
+
+    # ─── BeliefSystem-shaped queries ──────────────────────────────
+
+    def top(self, key: str) -> Optional[Belief]:
+        """Highest-confidence belief for a normalized claim key, or None."""
+        index = self._find(key)
+        return None if index is None else self._belief(self._claim(index)[3])
+
+    def all(self, key: str) -> List[Belief]:
+        """All beliefs for a normalized claim key, oldest first."""
+        index = self._find(key)
+        if index is None:
+            return []
+        _sid, count, first, _top = self._claim(index)
+        return [self._belief(row) for row in range(first, first + count)]
+
+    def query(self, q: BeliefQuery, limit: Optional[int] = None) -> List[Belief]:
+        """
+        Beliefs matching `q`, oldest first. Snapshots carry no secondary
+        indexes, so this scans the fixed-width records (in C, via
+        `struct.iter_unpack`) and decodes only the matches.
+        """
+        end = self._records + _RECORD.size * self._record_count
+        source_names: Dict[int, str] = {}
+        rows: List[Tuple[float, int]] = []
+        with memoryview(self._buf)[self._records:end] as records:
+            for row, (_c, source_sid, _m, _p, confidence, timestamp) in enumerate(
+                _RECORD.iter_unpack(records)
+            ):
+                name = ""
+                if q.source is not None:
+                    name = source_names.get(source_sid)
+                    if name is None:
+                        name = source_names[source_sid] = self._string(source_sid)
+                if q.matches(confidence, name, timestamp):
+                    rows.append((timestamp, row))
+        rows.sort()
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._belief(row) for _ts, row in rows]
+
+    def claims(self) -> Iterator[str]:
+        """Claim keys in first-seen order."""
+        for index in range(self._claim_count):
+            yield self._string(self._claim(index)[0])
+
+    def __len__(self) -> int:
+        return self._record_count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+
+def _leader(base: Optional[Belief], newer: Optional[Belief]) -> Optional[Belief]:
+    """Leader of a claim from the snapshot's and the overlay's leaders."""
+    # Snapshot beliefs are older, so they keep the lead on ties.
+    if base is None or (newer is not None and newer.confidence > base.confidence):
+        return newer
+    return base
+
+
+class MappedBeliefSystem(BeliefSystem):
+    """
+    A `BeliefSystem` that opens a binary snapshot with `mmap` and queries it
+    in place. Beliefs added after opening live in an in-memory overlay and
+    are combined with the snapshot on every read.
+
+    Example:
+        write_snapshot(core.beliefs, "beliefs.snap")
+        # … on restart …
+        beliefs = MappedBeliefSystem("beliefs.snap")   # O(1), no parsing
+        core = AGLMCore(perceive=..., decide=..., act=..., beliefs=beliefs)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        retention: Optional[RetentionPolicy] = None,
+    ):
+        super().__init__(retention)
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap: Optional[mmap.mmap] = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_READ
+        )
+        self._snapshot = BeliefSnapshot(self._mmap)
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim, or None."""
+        k = self._key(claim)
+        return _leader(self._snapshot.top(k), self._top.get(k))
+
+    def all(self, claim: str) -> List[Belief]:
+        """All recorded beliefs about a claim, oldest first."""
+        k = self._key(claim)
+        return self._snapshot.all(k) + super().all(k)
+
+    def claims(self) -> Iterable[str]:
+        """All unique claims known to the system (lowercased keys)."""
+        keys = list(self._snapshot.claims())
+        keys.extend(k for k in self._beliefs if k not in self._snapshot)
+        return keys
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """
+        Beliefs matching every given filter, oldest first. The snapshot part
+        is a record scan; the overlay uses the regular indexes.
+        """
+        q = BeliefQuery(source, since, until, min_confidence, max_confidence)
+        merged = heapq.merge(
+            self._snapshot.query(q, limit),
+            super().query(source, since, until, min_confidence, max_confidence, limit),
+            key=lambda b: b.timestamp,
+        )
+        return list(itertools.islice(merged, limit))
+
+    def snapshot(self) -> BeliefView:
+        """Frozen view of the store as it is now, in O(1)."""
+        return _LayeredView(self._snapshot, super().snapshot())
+
+    def as_of(self, *, cycle: Optional[int] = None, at: Optional[float] = None) -> BeliefView:
+        """Past view; the mapped file is always visible, the overlay travels."""
+        return _LayeredView(self._snapshot, super().as_of(cycle=cycle, at=at))
+
+    def _unindex_claim(self, k: str) -> None:
+        # The overlay ran out of beliefs about `k`; the mapped file may not have.
+        if k not in self._snapshot:
+            super()._unindex_claim(k)
+
+    def _publish(self) -> None:
+        # Overlay leader changes only count when they beat the mapped leader.
+        changes = self._pending_changes
+        for i, change in enumerate(changes):
+            if change.kind != TOP:
+                continue
+            base = self._snapshot.top(change.key)
+            if base is None:
+                continue
+            new, old = _leader(base, change.belief), _leader(base, change.previous)
+            changes[i] = None if new is old else replace(change, belief=new, previous=old)
+        self._pending_changes = [c for c in changes if c is not None]
+        super()._publish()
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the entire belief store (for persistence)."""
+        return self.materialize().to_dict()
+
+    def materialize(self) -> BeliefSystem:
+        """Build a plain in-memory `BeliefSystem` holding every belief."""
+        bs = BeliefSystem()
+        for key in self.claims():
+            for belief in self.all(key):
+                bs.add(belief)
+        return bs
+
+    def close(self) -> None:
+        """Unmap the snapshot. Materialize first if the beliefs are still needed."""
+        if self._mmap is None:
+            return
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+
+    def __enter__(self) -> "MappedBeliefSystem":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._snapshot) + self._count
+
+    def __contains__(self, claim: str) -> bool:
+        k = self._key(claim)
+        return k in self._beliefs or k in self._snapshot
+
+
+class _LayeredView(BeliefView):
+    """The immutable mapped snapshot under a view of the overlay."""
+
+    def __init__(self, base: BeliefSnapshot, overlay: BeliefView) -> None:
+        super().__init__(overlay.close)
+        self._base = base
+        self._overlay = overlay
+        self.version = overlay.version
+
+    def top(self, claim: str) -> Optional[Belief]:
+        k = BeliefSystem._key(claim)
+        return _leader(self._base.top(k), self._overlay.top(k))
+
+    def all(self, claim: str) -> List[Belief]:
+        k = BeliefSystem._key(claim)
+        return self._base.all(k) + self._overlay.all(k)
+
+    def claims(self) -> Iterable[str]:
+        keys = list(self._base.claims())
+        keys.extend(k for k in self._overlay.claims() if k not in self._base)
+        return keys
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._overlay)
+
+    def __contains__(self, claim: str) -> bool:
+        k = BeliefSystem._key(claim)
+        return k in self._base or k in self._overlay
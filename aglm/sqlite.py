@@ -0,0 +1,433 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+SQLiteBeliefSystem — a `BeliefSystem` backed by a local SQLite file (aGLM-2).
+
+Beliefs live on disk, so a store larger than RAM stays usable from
+`AGLMCore`. Design:
+
+  - WAL journal mode with `synchronous=NORMAL` (durable across process
+    crashes, cheap commits)
+  - writes are buffered and inserted with `executemany`, inside one
+    transaction that is committed by `flush()` — i.e. once per
+    `AGLMCore` cycle — or as soon as it holds `batch_size` rows, so a
+    caller that never flushes still commits (and lets WAL checkpoints
+    run) every `batch_size` rows
+  - reads see the caller's own uncommitted writes (same connection)
+  - `top()` is an indexed query on (key, confidence DESC, id); source,
+    timestamp and confidence are indexed for `query()`
+  - claim keys are mirrored into an FTS5 table (when SQLite was built with
+    FTS5) so `search()` is a ranked full-text query
+  - `snapshot()` pins a read transaction on a second connection
+  - `fused()` aggregates are built by one scan on first use and then kept
+    in memory (one small record per claim)
+
+Metadata is stored as JSON; values that are not JSON-serializable are
+stored as `str()`. A connection is not safe to share across threads
+without external locking.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .beliefs import Belief, BeliefSystem
+from .changes import ADDED, TOP, BeliefChange
+from .index import ClaimSearchIndex, tokenize
+from .views import BeliefView
+
+logger = logging.getLogger("aglm.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS beliefs (
+    id         INTEGER PRIMARY KEY,
+    key        TEXT NOT NULL,
+    claim      TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    source     TEXT NOT NULL,
+    timestamp  REAL NOT NULL,
+    metadata   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS beliefs_key_top ON beliefs (key, confidence DESC, id);
+CREATE INDEX IF NOT EXISTS beliefs_source ON beliefs (source, timestamp);
+CREATE INDEX IF NOT EXISTS beliefs_timestamp ON beliefs (timestamp);
+CREATE INDEX IF NOT EXISTS beliefs_confidence ON beliefs (confidence);
+CREATE TABLE IF NOT EXISTS claims (
+    id  INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE claims_fts USING fts5 (key, content='claims', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS claims_fts_insert AFTER INSERT ON claims BEGIN
+    INSERT INTO claims_fts (rowid, key) VALUES (new.id, new.key);
+END;
+INSERT INTO claims_fts (claims_fts) VALUES ('rebuild');
+"""
+
+_INSERT_BELIEF = (
+    "INSERT INTO beliefs (key, claim, confidence, source, timestamp, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_INSERT_CLAIM = "INSERT OR IGNORE INTO claims (key) VALUES (?)"
+_COLUMNS = "claim, confidence, source, timestamp, metadata"
+_SELECT_TOP = (
+    f"SELECT {_COLUMNS} FROM beliefs WHERE key = ? ORDER BY confidence DESC, id LIMIT 1"
+)
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM beliefs WHERE key = ? ORDER BY id"
+_SELECT_CLAIMS = "SELECT key FROM claims ORDER BY id"
+_SELECT_HAS_CLAIM = "SELECT 1 FROM claims WHERE key = ?"
+_SELECT_SEARCH = (
+    "SELECT key, bm25(claims_fts) AS score FROM claims_fts WHERE claims_fts MATCH ? "
+    "ORDER BY score, key LIMIT ?"
+)
+_SELECT_DUMP = (
+    "SELECT b.key, b.claim, b.confidence, b.source, b.timestamp, b.metadata "
+    "FROM beliefs b JOIN claims c ON c.key = b.key ORDER BY c.id, b.id"
+)
+
+_Row = Tuple[str, str, float, str, float, str]
+
+
+def _belief(row: Tuple[str, float, str, float, str]) -> Belief:
+    claim, confidence, source, timestamp, metadata = row
+    return Belief(
+        claim=claim,
+        confidence=confidence,
+        source=source,
+        timestamp=timestamp,
+        metadata=json.loads(metadata),
+    )
+
+
+def _query(
+    db: sqlite3.Connection,
+    source: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+    min_confidence: Optional[float],
+    max_confidence: Optional[float],
+    limit: Optional[int],
+) -> List[Belief]:
+    where, params = [], []
+    for clause, value in (
+        ("source = ?", source),
+        ("timestamp >= ?", since),
+        ("timestamp <= ?", until),
+        ("confidence >= ?", min_confidence),
+        ("confidence <= ?", max_confidence),
+    ):
+        if value is not None:
+            where.append(clause)
+            params.append(value)
+    sql = f"SELECT {_COLUMNS} FROM beliefs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp, id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [_belief(row) for row in db.execute(sql, params)]
+
+
+def _fts_search(db: sqlite3.Connection, query: str, k: int) -> List[Tuple[str, float]]:
+    tokens = tokenize(query)
+    if not tokens or k <= 0:
+        return []
+    match = " OR ".join(f'"{token}"' for token in tokens)
+    # bm25() is lower-is-better; flip it so scores read like BeliefSystem's.
+    return [(key, -score) for key, score in db.execute(_SELECT_SEARCH, (match, k))]
+
+
+class SQLiteBeliefSystem(BeliefSystem):
+    """
+    Drop-in `BeliefSystem` persisted in SQLite.
+
+    Example:
+        bs = SQLiteBeliefSystem("beliefs.db")
+        core = AGLMCore(perceive=..., decide=..., act=..., beliefs=bs)
+        await core.cycle()   # the cycle's writes are committed together
+        bs.close()
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike] = ":memory:",
+        batch_size: int = 1000,
+    ):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._fts = self._create_fts()
+        self._pending: List[_Row] = []
+        self._in_transaction = False
+        self._uncommitted = 0  # rows written into the open transaction
+        self._count = self._conn.execute("SELECT COUNT(*) FROM beliefs").fetchone()[0]
+
+    def _create_fts(self) -> bool:
+        """Create the claim full-text index if needed; False if FTS5 is unavailable."""
+        db = self._db
+        exists = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'claims_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            db.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.info(f"FTS5 unavailable ({e}); search() will scan claim keys")
+            return False
+        return True
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise ValueError("SQLiteBeliefSystem is closed")
+        return self._conn
+
+    def _write_pending(self) -> sqlite3.Connection:
+        """
+        Insert buffered rows into the open transaction, committing it once
+        it holds `batch_size` rows; returns the connection.
+        """
+        db = self._db
+        if self._pending:
+            if not self._in_transaction:
+                db.execute("BEGIN")
+                self._in_transaction = True
+            db.executemany(_INSERT_CLAIM, ((row[0],) for row in self._pending))
+            db.executemany(_INSERT_BELIEF, self._pending)
+            self._uncommitted += len(self._pending)
+            self._pending.clear()
+            if self._uncommitted >= self.batch_size:
+                self._commit()
+        return db
+
+    def _commit(self) -> None:
+        if self._in_transaction:
+            self._db.execute("COMMIT")
+            self._in_transaction = False
+        self._uncommitted = 0
+
+    def _row(self, belief: Belief) -> _Row:
+        return (
+            self._key(belief.claim),
+            belief.claim,
+            belief.confidence,
+            belief.source,
+            belief.timestamp,
+            json.dumps(belief.metadata, default=str, separators=(",", ":")),
+        )
+
+    def add(self, belief: Belief) -> None:
+        """Add a belief. Multiple beliefs about the same claim are allowed."""
+        self.add_many((belief,))
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """Add several beliefs in one call; equivalent to `add()` on each."""
+        if (
+            self._observers or self._fusion is not None
+            or self._contradictions is not None or self._search is not None
+        ):
+            # Leaders as of this batch: read from SQLite once per claim (one
+            # flush per call, not per belief), then kept current in memory.
+            leaders: Optional[Dict[str, Optional[Belief]]] = None
+            if self._observers:
+                self._write_pending()
+                leaders = {}
+            for belief in beliefs:
+                self._track(belief, leaders)
+                self._pending.append(self._row(belief))
+                self._count += 1
+        else:
+            before = len(self._pending)
+            self._pending.extend(map(self._row, beliefs))
+            self._count += len(self._pending) - before
+        if len(self._pending) >= self.batch_size:
+            self._write_pending()
+        if self._pending_changes:
+            self._publish()
+
+    def _track(self, belief: Belief, leaders: Optional[Dict[str, Optional[Belief]]]) -> None:
+        """
+        Keep the in-memory side structures current for a belief about to be
+        added: change-feed events (against `leaders`, the batch's leader per
+        claim), `fused()` aggregates, the contradiction index and the cached
+        search index.
+        """
+        k = self._key(belief.claim)
+        if leaders is not None:
+            if k in leaders:
+                leader = leaders[k]
+            else:  # pending rows were written before the batch: SQLite is current
+                row = self._db.execute(_SELECT_TOP, (k,)).fetchone()
+                leader = None if row is None else _belief(row)
+            version = self._count + 1  # SQLite rows are unversioned; count them instead
+            self._pending_changes.append(BeliefChange(ADDED, k, belief, None, version))
+            if leader is None or belief.confidence > leader.confidence:
+                self._pending_changes.append(BeliefChange(TOP, k, belief, leader, version))
+                leader = belief
+            leaders[k] = leader
+        if self._fusion is not None:
+            self._fusion.add(k, belief)
+        if self._contradictions is not None:
+            self._contradictions.add_claim(k)
+        if self._search is not None:
+            self._search.add_claim(k)
+
+    def flush(self) -> None:
+        """Commit every belief added since the last flush."""
+        self._write_pending()
+        self._commit()
+
+    def all(self, claim: str) -> List[Belief]:
+        """All recorded beliefs about a claim, oldest first."""
+        rows = self._write_pending().execute(_SELECT_ALL, (self._key(claim),))
+        return [_belief(row) for row in rows]
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim, or None."""
+        row = self._write_pending().execute(_SELECT_TOP, (self._key(claim),)).fetchone()
+        return None if row is None else _belief(row)
+
+    def claims(self) -> Iterable[str]:
+        """All unique claims known to the system (lowercased keys)."""
+        return [key for (key,) in self._write_pending().execute(_SELECT_CLAIMS)]
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """Beliefs matching every given filter, oldest first (SQLite picks the index)."""
+        return _query(
+            self._write_pending(), source, since, until, min_confidence, max_confidence, limit
+        )
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """
+        Rank claim keys against free text with FTS5's BM25. Fuzzy matching
+        (and stores without FTS5) use an in-memory index, built from
+        `claims()` on first use and kept current by later writes.
+        """
+        db = self._write_pending()
+        if fuzzy or not self._fts:
+            if self._search is None:
+                self._search = ClaimSearchIndex.build(self.claims())
+            return self._search.search(query, k, fuzzy)
+        return _fts_search(db, query, k)
+
+    def snapshot(self) -> BeliefView:
+        """
+        Frozen view of the committed store: pending writes are flushed, then
+        a second connection holds a read transaction open, which WAL mode
+        keeps consistent while this connection goes on writing. Needs a file
+        path; an in-memory database cannot be shared between connections.
+        """
+        if str(self.path) == ":memory:":
+            raise ValueError("snapshot() needs a file-backed SQLiteBeliefSystem")
+        self.flush()
+        return _SQLiteView(self)
+
+    def as_of(self, *, cycle: Optional[int] = None, at: Optional[float] = None) -> BeliefView:
+        raise ValueError("SQLiteBeliefSystem does not support as_of(): it keeps no version history")
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the entire belief store (for persistence)."""
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for key, *row in self._write_pending().execute(_SELECT_DUMP):
+            claim, confidence, source, timestamp, metadata = row
+            out.setdefault(key, []).append({
+                "claim": claim,
+                "confidence": confidence,
+                "source": source,
+                "timestamp": timestamp,
+                "metadata": json.loads(metadata),
+            })
+        return out
+
+    def close(self) -> None:
+        """Commit pending writes and close the connection."""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> "SQLiteBeliefSystem":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, claim: str) -> bool:
+        key = self._key(claim)
+        return self._write_pending().execute(_SELECT_HAS_CLAIM, (key,)).fetchone() is not None
+
+
+class _SQLiteView(BeliefView):
+    """A read transaction on its own connection to the store's database."""
+
+    def __init__(self, store: SQLiteBeliefSystem) -> None:
+        conn = sqlite3.connect(store.path, isolation_level=None, check_same_thread=False)
+
+        def release() -> None:
+            conn.execute("ROLLBACK")
+            conn.close()
+
+        conn.execute("BEGIN")
+        # The first read starts the WAL read transaction that pins the view.
+        self._count = conn.execute("SELECT COUNT(*) FROM beliefs").fetchone()[0]
+        super().__init__(release)
+        self._conn = conn
+        self._store = store
+
+    def top(self, claim: str) -> Optional[Belief]:
+        row = self._conn.execute(_SELECT_TOP, (self._store._key(claim),)).fetchone()
+        return None if row is None else _belief(row)
+
+    def all(self, claim: str) -> List[Belief]:
+        return [_belief(row) for row in self._conn.execute(_SELECT_ALL, (self._store._key(claim),))]
+
+    def claims(self) -> Iterable[str]:
+        return [key for (key,) in self._conn.execute(_SELECT_CLAIMS)]
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        return _query(self._conn, source, since, until, min_confidence, max_confidence, limit)
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        if fuzzy or not self._store._fts:
+            return super().search(query, k, fuzzy)
+        return _fts_search(self._conn, query, k)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, claim: str) -> bool:
+        key = self._store._key(claim)
+        return self._conn.execute(_SELECT_HAS_CLAIM, (key,)).fetchone() is not None
@@ -0,0 +1,526 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+TieredBeliefSystem — a bounded hot tier in memory, the rest on disk.
+
+Most claims in a long-running store are written once and never touched
+again, yet `BeliefSystem` keeps every one of them in memory. This store
+keeps at most `hot_claims` claims in the regular in-memory structures (the
+hot tier) and spills the least recently used ones to a cold tier of sorted
+segment files in `directory`:
+
+  - hot claims are served exactly as by `BeliefSystem`; touching one (a
+    write, `top()`, `all()`) marks it recently used
+  - when the hot tier overflows, the least recently used quarter is
+    written out as one segment: claims sorted by key, each with its
+    beliefs in the `aglm.export` binary record format
+  - each segment keeps a sparse index (every 16th key and its offset) and
+    a Bloom filter of its keys in memory, about 10 bits per cold claim;
+    the data itself is `mmap`'d and paged in by the OS on demand
+  - each entry records its claim's timestamp and confidence ranges, each
+    sparse-index block the ranges over its 16 claims, and each segment
+    the set of sources in it (up to 64), so `query()` skips segments,
+    blocks and claims that cannot match without decoding them
+  - a write to a cold claim promotes it back to the hot tier; reading a
+    cold claim is served from disk without promoting it, so bulk readers
+    (exports, snapshots for other processes) do not churn the tiers
+  - segments are merged size-tiered, newest copy of each claim winning,
+    so there are O(log n) of them
+
+`in` and reads of unknown claims check the Bloom filters first, so a miss
+touches disk only on a false positive (about 1%). Store size is then
+bounded by disk, and the hot path is the in-memory one.
+
+Listing every claim still costs a pass over the cold tier: `claims()`
+reads each segment's keys (skipping the payloads, so no belief is
+decoded), and an unfiltered `query()` or `to_dict()` decodes every cold
+belief, since that is what it returns.
+
+The segment files are a spill area, not durability: they are deleted on
+`close()`. Pair a `PersistentBeliefSystem` WAL for that. Tiered stores
+take no retention policy and do not support `snapshot()` / `as_of()`.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .beliefs import Belief, BeliefSystem
+from .export import decode_records, encode_record
+from .fusion import ClaimFusion, FusedConfidence, fuse
+from .index import BeliefQuery
+from .views import BeliefView
+
+logger = logging.getLogger("aglm.tiered")
+
+# key bytes, payload bytes, then the claim's min/max timestamp and min/max confidence
+_ENTRY = struct.Struct("<IIdddd")
+_SPARSE = 16  # sparse index: one key in this many
+_SOURCES = 64  # segments with more distinct sources do not list them
+
+Zone = Tuple[float, float, float, float]  # min/max timestamp, min/max confidence
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        # Filters live only as long as the process, so the built-in string
+        # hash will do; two halves of it seed double hashing.
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        # Inlined _positions() with an early exit: most misses stop at the
+        # first or second probe.
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        size = self.size
+        bits = self._bits
+        for i in range(self.hashes):
+            p = (h1 + i * h2) % size
+            if not bits[p >> 3] >> (p & 7) & 1:
+                return False
+        return True
+
+
+def _zone_of(beliefs: Sequence[Belief]) -> Zone:
+    times = [b.timestamp for b in beliefs]
+    confidences = [b.confidence for b in beliefs]
+    return min(times), max(times), min(confidences), max(confidences)
+
+
+def _overlaps(q: BeliefQuery, zone: Zone) -> bool:
+    """Whether any belief within `zone`'s ranges could match `q`."""
+    t0, t1, c0, c1 = zone
+    return not (
+        (q.since is not None and t1 < q.since)
+        or (q.until is not None and t0 > q.until)
+        or (q.min_confidence is not None and c1 < q.min_confidence)
+        or (q.max_confidence is not None and c0 > q.max_confidence)
+    )
+
+
+class _Segment:
+    """
+    One immutable sorted segment file, its sparse index, per-block zones and
+    Bloom filter. `sources` is the set of sources in it, or None if more
+    than `_SOURCES`.
+    """
+
+    def __init__(self, path: Path, keys: List[str], offsets: List[int], zones: List[Zone],
+                 bloom: BloomFilter, claims: int, sources: Optional[frozenset]) -> None:
+        self.path = path
+        self.claims = claims
+        self.sources = sources
+        self._keys = keys
+        self._offsets = offsets
+        self._zones = zones
+        self._bloom = bloom
+        self._file = open(path, "rb")
+        self._map: Any = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if claims else b""
+        )
+
+    @classmethod
+    def write(cls, path: Path, entries: Iterable[Tuple[str, Zone, bytes]], capacity: int,
+              sources: Optional[frozenset]) -> "_Segment":
+        """Write (key, zone, payload) entries, already sorted by key."""
+        keys: List[str] = []
+        offsets: List[int] = []
+        zones: List[Zone] = []
+        bloom = BloomFilter(capacity)
+        claims = 0
+        with open(path, "wb") as f:
+            for key, zone, payload in entries:
+                if claims % _SPARSE == 0:
+                    keys.append(key)
+                    offsets.append(f.tell())
+                    zones.append(zone)
+                else:
+                    t0, t1, c0, c1 = zones[-1]
+                    zones[-1] = (
+                        min(t0, zone[0]), max(t1, zone[1]), min(c0, zone[2]), max(c1, zone[3])
+                    )
+                raw = key.encode("utf-8")
+                f.write(_ENTRY.pack(len(raw), len(payload), *zone))
+                f.write(raw)
+                f.write(payload)
+                bloom.add(key)
+                claims += 1
+            offsets.append(f.tell())
+        return cls(path, keys, offsets, zones, bloom, claims, sources)
+
+    def _scan(self, start: int, end: int) -> Iterator[Tuple[str, Zone, bytes]]:
+        view = self._map
+        pos = start
+        while pos < end:
+            n_key, n_payload, *zone = _ENTRY.unpack_from(view, pos)
+            pos += _ENTRY.size
+            key = view[pos:pos + n_key].decode("utf-8")
+            pos += n_key
+            yield key, tuple(zone), view[pos:pos + n_payload]
+            pos += n_payload
+
+    def keys(self) -> Iterator[str]:
+        """Every key in order, without reading the payloads."""
+        view = self._map
+        pos = 0
+        end = self._offsets[-1]
+        while pos < end:
+            n_key, n_payload = _ENTRY.unpack_from(view, pos)[:2]
+            pos += _ENTRY.size
+            yield view[pos:pos + n_key].decode("utf-8")
+            pos += n_key + n_payload
+
+    def matching(self, q: BeliefQuery) -> Iterator[Tuple[str, bytes]]:
+        """(key, payload) of the claims whose ranges and sources could match `q`."""
+        if q.source is not None and self.sources is not None and q.source not in self.sources:
+            return
+        offsets = self._offsets
+        for block, zone in enumerate(self._zones):
+            if not _overlaps(q, zone):
+                continue
+            for key, claim_zone, payload in self._scan(offsets[block], offsets[block + 1]):
+                if _overlaps(q, claim_zone):
+                    yield key, payload
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Payload for `key`, reading one sparse-index block, or None."""
+        if key not in self._bloom:
+            return None
+        block = bisect_right(self._keys, key) - 1
+        if block < 0:
+            return None
+        for probe, _zone, payload in self._scan(self._offsets[block], self._offsets[block + 1]):
+            if probe == key:
+                return payload
+            if probe > key:
+                break
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[str, Zone, bytes]]:
+        return self._scan(0, self._offsets[-1])
+
+    def close(self, delete: bool = True) -> None:
+        if self.claims:
+            self._map.close()
+        self._file.close()
+        if delete:
+            self.path.unlink(missing_ok=True)
+
+
+def _aged(segment: _Segment, rank: int) -> Iterator[Tuple[str, int, Zone, bytes]]:
+    """A segment's entries tagged with `rank` (lower is newer) for merging."""
+    for key, zone, payload in segment:
+        yield key, rank, zone, payload
+
+
+def _union(segments: List[_Segment]) -> Optional[frozenset]:
+    """Sources of merged segments, or None once there are too many to list."""
+    sources: frozenset = frozenset()
+    for segment in segments:
+        if segment.sources is None:
+            return None
+        sources |= segment.sources
+    return sources if len(sources) <= _SOURCES else None
+
+
+class TieredBeliefSystem(BeliefSystem):
+    """
+    `BeliefSystem` with at most `hot_claims` claims in memory and the rest
+    in segment files under `directory` (a temporary directory by default).
+    Use it as a context manager, or call `close()`, to remove the files.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, os.PathLike]] = None,
+        hot_claims: int = 100_000,
+    ):
+        if hot_claims < 4:
+            raise ValueError(f"hot_claims must be >= 4, got {hot_claims}")
+        super().__init__()
+        self.hot_claims = hot_claims
+        self._owns_directory = directory is None
+        self.directory = Path(tempfile.mkdtemp(prefix="aglm-tiered-") if directory is None
+                              else directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lru: "OrderedDict[str, None]" = OrderedDict()  # hot keys, least recent first
+        self._segments: List[_Segment] = []  # oldest first; newest copy of a key wins
+        self._segment_ids = itertools.count()
+        self._cold_claims = 0
+        self._cold_count = 0
+        self.demotions = 0
+        self.promotions = 0
+
+    # ─── tiers ────────────────────────────────────────────────────
+
+    def _cold_payload(self, k: str) -> Optional[bytes]:
+        for segment in reversed(self._segments):
+            payload = segment.get(k)
+            if payload is not None:
+                return payload
+        return None
+
+    def _cold(self, k: str) -> List[Belief]:
+        """A cold claim's beliefs, read from disk (empty if hot or unknown)."""
+        if k in self._beliefs:
+            return []
+        payload = self._cold_payload(k)
+        return [] if payload is None else decode_records(payload)
+
+    def _cold_entries(self) -> Iterator[Tuple[str, Zone, bytes]]:
+        """Every cold claim's (key, zone, payload), by key, newest copy only."""
+        return self._merged(self._segments)
+
+    def _merged(self, segments: List[_Segment]) -> Iterator[Tuple[str, Zone, bytes]]:
+        streams = [_aged(segment, -age) for age, segment in enumerate(segments)]
+        previous = None
+        for key, _age, zone, payload in heapq.merge(*streams, key=lambda e: (e[0], e[1])):
+            if key != previous:
+                previous = key
+                if key not in self._beliefs:  # hot copies supersede cold ones
+                    yield key, zone, payload
+
+    def _superseded(self, key: str, newer: List[_Segment]) -> bool:
+        """Whether a cold copy of `key` is stale: the claim is hot or in a newer segment."""
+        return key in self._beliefs or any(segment.get(key) is not None for segment in newer)
+
+    def _promote(self, k: str) -> None:
+        """Move cold claim `k` (if there is one) into the hot tier."""
+        beliefs = self._cold(k)
+        if not beliefs:
+            return
+        self._beliefs[k] = deque(beliefs)
+        self._versions[k] = deque(itertools.repeat(self._version, len(beliefs)))
+        leader = beliefs[0]
+        for b in beliefs:
+            if b.confidence > leader.confidence:
+                leader = b
+        self._top[k] = leader
+        self._count += len(beliefs)
+        self._cold_count -= len(beliefs)
+        self._cold_claims -= 1
+        self.promotions += 1
+        for b in beliefs:
+            if self._index is not None:
+                self._index.add(b)
+            if self._fusion is not None:
+                self._fusion.add(k, b)
+
+    def _demote(self) -> None:
+        """Spill the least recently used quarter of the hot tier to a new segment."""
+        spill = len(self._lru) - self.hot_claims + self.hot_claims // 4
+        entries: List[Tuple[str, Zone, bytes]] = []
+        sources: Optional[set] = set()
+        for _ in range(spill):
+            k, _ = self._lru.popitem(last=False)
+            beliefs = self._beliefs.pop(k)
+            del self._versions[k]
+            del self._top[k]
+            self._count -= len(beliefs)
+            self._cold_count += len(beliefs)
+            for b in beliefs:
+                if self._index is not None:
+                    self._index.remove(b)
+                if self._fusion is not None:
+                    self._fusion.remove(k, b)
+            if sources is not None:
+                sources.update(b.source for b in beliefs)
+                if len(sources) > _SOURCES:
+                    sources = None
+            entries.append((k, _zone_of(beliefs), b"".join(encode_record(b) for b in beliefs)))
+        entries.sort(key=lambda e: e[0])
+        self._cold_claims += len(entries)
+        self.demotions += len(entries)
+        self._segments.append(self._write_segment(
+            entries, len(entries), None if sources is None else frozenset(sources)
+        ))
+        # Size-tiered merging: fold the newest segment into the one before
+        # while that one is not much bigger.
+        segments = self._segments
+        while len(segments) >= 2 and segments[-2].claims <= 2 * segments[-1].claims:
+            pair = segments[-2:]
+            merged = self._write_segment(
+                self._merged(pair), pair[0].claims + pair[1].claims, _union(pair)
+            )
+            for segment in pair:
+                segment.close()
+            segments[-2:] = [merged]
+            if not merged.claims:  # every claim in it was hot again
+                segments.pop().close()
+
+    def _write_segment(self, entries: Iterable[Tuple[str, Zone, bytes]], capacity: int,
+                       sources: Optional[frozenset]) -> _Segment:
+        path = self.directory / f"{next(self._segment_ids):08d}.seg"
+        return _Segment.write(path, entries, capacity, sources)
+
+    def tier_stats(self) -> Dict[str, Any]:
+        """Claims and beliefs per tier, segment count and bytes on disk."""
+        return {
+            "hot_claims": len(self._beliefs),
+            "hot_beliefs": self._count,
+            "cold_claims": self._cold_claims,
+            "cold_beliefs": self._cold_count,
+            "segments": len(self._segments),
+            "cold_bytes": sum(s.path.stat().st_size for s in self._segments),
+            "demotions": self.demotions,
+            "promotions": self.promotions,
+        }
+
+    # ─── BeliefSystem ─────────────────────────────────────────────
+
+    def add_many(self, beliefs: Iterable[Belief]) -> None:
+        """Add several beliefs; claims that were cold are promoted first."""
+        batch = beliefs if isinstance(beliefs, list) else list(beliefs)
+        key = self._key
+        hot = self._beliefs
+        lru = self._lru
+        for belief in batch:
+            k = key(belief.claim)
+            if k in hot:
+                lru.move_to_end(k)
+            elif k not in lru:
+                if self._segments:
+                    self._promote(k)
+                lru[k] = None
+        super().add_many(batch)
+        if len(hot) > self.hot_claims:
+            self._demote()
+
+    def all(self, claim: str) -> List[Belief]:
+        """All recorded beliefs about a claim, oldest first."""
+        k = self._key(claim)
+        entries = self._beliefs.get(k)
+        if entries is not None:
+            self._lru.move_to_end(k)
+            return list(entries)
+        return self._cold(k)
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim, or None."""
+        k = self._key(claim)
+        leader = self._top.get(k)
+        if leader is not None:
+            self._lru.move_to_end(k)
+            return leader
+        for b in self._cold(k):
+            if leader is None or b.confidence > leader.confidence:
+                leader = b
+        return leader
+
+    def fused(self, claim: str) -> Optional[FusedConfidence]:
+        """Fused confidence; O(1) for hot claims, one disk read for cold ones."""
+        k = self._key(claim)
+        if k not in self._beliefs:
+            return fuse(self._cold(k))
+        if self._fusion is None:
+            self._fusion = ClaimFusion.build(
+                (key, b) for key, entries in self._beliefs.items() for b in entries
+            )
+        return self._fusion.get(k)
+
+    def claims(self) -> Iterable[str]:
+        """
+        All unique claims: hot ones, then cold ones by key. Reads every
+        segment's keys, but none of their beliefs.
+        """
+        keys = list(self._beliefs.keys())
+        previous = None
+        for key in heapq.merge(*(segment.keys() for segment in self._segments)):
+            if key != previous:
+                previous = key
+                if key not in self._beliefs:
+                    keys.append(key)
+        return keys
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """
+        Beliefs matching every given filter, oldest first: the hot tier from
+        its indexes, the cold tier by decoding only the claims whose segment
+        sources and block and claim ranges could match.
+        """
+        q = BeliefQuery(source, since, until, min_confidence, max_confidence)
+        segments = self._segments
+        cold = sorted(
+            (
+                b
+                for age, segment in enumerate(segments)
+                for k, payload in segment.matching(q)
+                if not self._superseded(k, segments[age + 1:])
+                for b in decode_records(payload)
+                if q.matches(b.confidence, b.source, b.timestamp)
+            ),
+            key=lambda b: b.timestamp,
+        )
+        merged = heapq.merge(
+            super().query(source, since, until, min_confidence, max_confidence, limit),
+            cold,
+            key=lambda b: b.timestamp,
+        )
+        return list(itertools.islice(merged, limit))
+
+    def snapshot(self) -> BeliefView:
+        raise ValueError("TieredBeliefSystem does not support snapshots")
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the entire belief store, both tiers."""
+        data = super().to_dict()
+        for k, _zone, payload in self._cold_entries():
+            data[k] = [asdict(b) for b in decode_records(payload)]
+        return data
+
+    def close(self) -> None:
+        """Delete the segment files (and the directory, if it was a temporary one)."""
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "TieredBeliefSystem":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count + self._cold_count
+
+    def __contains__(self, claim: str) -> bool:
+        k = self._key(claim)
+        return k in self._beliefs or self._cold_payload(k) is not None
@@ -0,0 +1,184 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Read-only, point-in-time views of a belief store.
+
+`BeliefSystem.snapshot()` returns a `BeliefView`: a frozen view of the
+store as of the moment it was taken, that keeps answering `top()` /
+`all()` / `claims()` / `len()` / `in` consistently while writers carry on.
+`AGLMCore(snapshot_decide=True)` hands one to `decide_fn` each cycle.
+
+Taking a view is O(1) — nothing is copied. The in-memory store versions
+every mutation; while any view is open, writers log the leaders they
+replace and the beliefs they evict (an undo log), and `VersionedView`
+reconstructs its version from the live data plus that log. Logs are
+trimmed as views close, so a store with no open views pays only a version
+counter per belief. `BeliefSystem.as_of()` opens the same kind of view at a
+past version, when the store keeps history
+(`RetentionPolicy(history_seconds=...)`) and so keeps that log for the
+window. Close views when done (or use `with`); a view that is
+garbage-collected is closed automatically.
+
+Other backends provide their own views (see `CompactBeliefSystem`,
+`SQLiteBeliefSystem`, `MappedBeliefSystem`, `ConcurrentBeliefSystem`).
+"""
+from __future__ import annotations
+
+import itertools
+import weakref
+from bisect import bisect_right
+from dataclasses import asdict
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .fusion import FusedConfidence, fuse
+from .index import BeliefQuery, ClaimSearchIndex, Conflict, ContradictionIndex
+
+if TYPE_CHECKING:
+    from .beliefs import Belief, BeliefSystem
+
+_first = itemgetter(0)
+
+
+class BeliefView:
+    """
+    Read-only interface shared by every view. Subclasses implement `top`,
+    `all`, `claims`, `__len__` and `__contains__`; `query`, `search`,
+    `fused`, `conflicts` and `to_dict` are derived from those by scanning the view.
+    """
+
+    version: int = 0
+
+    def __init__(self, release: Optional[Callable[[], Any]] = None) -> None:
+        # finalize() runs `release` exactly once: on close() or on collection.
+        self._finalizer = weakref.finalize(self, release) if release else None
+
+    def top(self, claim: str) -> Optional[Belief]:
+        raise NotImplementedError
+
+    def all(self, claim: str) -> List[Belief]:
+        raise NotImplementedError
+
+    def claims(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, claim: str) -> bool:
+        raise NotImplementedError
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Belief]:
+        """Beliefs matching every given filter, oldest first (a scan of the view)."""
+        q = BeliefQuery(source, since, until, min_confidence, max_confidence)
+        out = [
+            b for k in self.claims() for b in self.all(k)
+            if q.matches(b.confidence, b.source, b.timestamp)
+        ]
+        out.sort(key=lambda b: b.timestamp)
+        return out if limit is None else out[:limit]
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """Rank the view's claims against free text (index built per call)."""
+        return ClaimSearchIndex.build(self.claims()).search(query, k, fuzzy)
+
+    def fused(self, claim: str) -> Optional[FusedConfidence]:
+        """Combined confidence over the view's beliefs about a claim (one pass)."""
+        return fuse(self.all(claim))
+
+    def conflicts(self, claim: Optional[str] = None) -> List[Conflict]:
+        """Claims held together with their negation (index built per call)."""
+        key = None if claim is None else claim.strip().lower()
+        return [
+            Conflict(positive, negative, self.top(positive), self.top(negative))
+            for positive, negative in ContradictionIndex.build(self.claims()).pairs(key)
+        ]
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialize the view in `BeliefSystem.to_dict()` shape."""
+        return {k: [asdict(b) for b in self.all(k)] for k in self.claims()}
+
+    def close(self) -> None:
+        """Release the view; later reads are undefined."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self) -> "BeliefView":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class VersionedView(BeliefView):
+    """A view of an in-memory `BeliefSystem` at one version."""
+
+    def __init__(self, store: BeliefSystem, version: int, count: int) -> None:
+        super().__init__(lambda: store._release_view(version))
+        self._store = store
+        self.version = version
+        self._count = count
+
+    def _evicted(self, k: str) -> List[Tuple[int, Belief]]:
+        """(entry version, belief) for beliefs visible here but evicted since."""
+        v = self.version
+        return [
+            (entry_version, b)
+            for evicted_at, entry_version, b in self._store._evicted_log.get(k, ())
+            if entry_version <= v < evicted_at
+        ]
+
+    def _visible(self, k: str) -> bool:
+        versions = self._store._versions.get(k)
+        return bool((versions and versions[0] <= self.version) or self._evicted(k))
+
+    def top(self, claim: str) -> Optional[Belief]:
+        """Highest-confidence belief about a claim at this view's version."""
+        store = self._store
+        k = store._key(claim)
+        log = store._leader_log.get(k)
+        if log:
+            # The first leader change after this version recorded the leader
+            # this version saw.
+            i = bisect_right(log, self.version, key=_first)
+            if i < len(log):
+                return log[i][1]
+        return store._top.get(k)
+
+    def all(self, claim: str) -> List[Belief]:
+        """All beliefs about a claim at this view's version, oldest first."""
+        store = self._store
+        k = store._key(claim)
+        entries = store._beliefs.get(k)
+        live: List[Belief] = []
+        if entries:
+            versions = store._versions[k]
+            n = bisect_right(versions, self.version)  # entries are in version order
+            live = list(itertools.islice(entries, n))
+        evicted = self._evicted(k)
+        if not evicted:
+            return live
+        versions = store._versions.get(k, ())
+        merged = sorted(itertools.chain(zip(versions, live), evicted), key=_first)
+        return [b for _version, b in merged]
+
+    def claims(self) -> Iterable[str]:
+        """Claims visible at this view's version."""
+        store = self._store
+        keys = [k for k in store._beliefs if self._visible(k)]
+        keys.extend(k for k in store._evicted_log if k not in store._beliefs and self._visible(k))
+        return keys
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, claim: str) -> bool:
+        return self._visible(self._store._key(claim))
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: Apache-2.0
+# (c) 2024-2026 GATERAGE — aGLM
+"""
+Length-prefixed frames over asyncio streams, for belief sync between
+processes and hosts.
+
+An address is either `(host, port)` for TCP or a filesystem path for a
+Unix domain socket. Each frame is a little-endian u32 byte count followed
+by that many bytes; what the bytes mean is up to the protocol using them
+(`aglm.crdt`, `aglm.replication`).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+from typing import Awaitable, Callable, Optional, Tuple, Union
+
+Address = Union[Tuple[str, int], str, os.PathLike]
+Handler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+MAX_FRAME = 1 << 30
+_LENGTH = struct.Struct("<I")
+
+
+async def write_frame(writer: asyncio.StreamWriter, payload: bytes) -> None:
+    """Send one frame and wait until the transport has buffered it."""
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f"frame of {len(payload)} bytes exceeds {MAX_FRAME}")
+    writer.write(_LENGTH.pack(len(payload)) + payload)
+    await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Read one frame; None on a clean end of stream between frames."""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ConnectionError("connection closed mid-frame") from e
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_FRAME:
+        raise ConnectionError(f"frame of {length} bytes exceeds {MAX_FRAME}")
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise ConnectionError("connection closed mid-frame") from e
+
+
+async def open_connection(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a TCP `(host, port)` or a Unix socket path."""
+    if isinstance(address, tuple):
+        return await asyncio.open_connection(*address)
+    return await asyncio.open_unix_connection(os.fspath(address))
+
+
+async def start_server(handler: Handler, address: Address) -> asyncio.AbstractServer:
+    """Serve `handler` on a TCP `(host, port)` (port 0 picks one) or a Unix socket path."""
+    if isinstance(address, tuple):
+        return await asyncio.start_server(handler, *address)
+    return await asyncio.start_unix_server(handler, os.fspath(address))
+
+
+def server_address(server: asyncio.AbstractServer) -> Address:
+    """The address a started server is listening on (useful with port 0)."""
+    sockname = server.sockets[0].getsockname()
+    return (sockname[0], sockname[1]) if isinstance(sockname, tuple) else sockname
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Stress benchmark: one BeliefSystem behind a global lock vs the
+lock-striped ConcurrentBeliefSystem, with N threads doing a mixed
+read/write workload (80% top(), 20% revise()) on random claims.
+
+Each operation also holds its lock across a short simulated I/O wait
+(`time.sleep(0)`-style yield) so lock hold time, not just CPU, is
+measured — the situation where a global lock serializes request threads.
+On free-threaded CPython builds the striped store also scales CPU work.
+
+    pip install -e .
+    python benchmarks/bench_concurrent.py            # 1, 2, 4, 8, 16 threads
+    python benchmarks/bench_concurrent.py 4 32
+"""
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+
+from aglm import BeliefSystem, ConcurrentBeliefSystem
+
+CLAIMS = 5_000
+OPS_PER_THREAD = 20_000
+HOLD_EVERY = 50  # every Nth op yields the GIL while holding its lock
+
+
+class GlobalLockBeliefSystem:
+    """What callers do today: one lock around a shared BeliefSystem."""
+
+    def __init__(self) -> None:
+        self._bs = BeliefSystem()
+        self._lock = threading.Lock()
+
+    def top(self, claim, hold=False):
+        with self._lock:
+            if hold:
+                time.sleep(0)
+            return self._bs.top(claim)
+
+    def revise(self, claim, confidence, source, hold=False):
+        with self._lock:
+            if hold:
+                time.sleep(0)
+            return self._bs.revise(claim, confidence, source)
+
+
+class StripedBench:
+    def __init__(self) -> None:
+        self._bs = ConcurrentBeliefSystem(stripes=64)
+
+    def top(self, claim, hold=False):
+        i = self._bs._stripe(claim)
+        with self._bs._locks[i]:
+            if hold:
+                time.sleep(0)
+            return self._bs._shards[i].top(claim)
+
+    def revise(self, claim, confidence, source, hold=False):
+        i = self._bs._stripe(claim)
+        with self._bs._locks[i]:
+            if hold:
+                time.sleep(0)
+            return self._bs._shards[i].revise(claim, confidence, source)
+
+
+def run(store, threads: int) -> float:
+    for i in range(CLAIMS):
+        store.revise(f"claim.{i}", 0.5, "seed")
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for n in range(OPS_PER_THREAD):
+            claim = f"claim.{rng.randrange(CLAIMS)}"
+            hold = n % HOLD_EVERY == 0
+            if rng.random() < 0.8:
+                store.top(claim, hold)
+            else:
+                store.revise(claim, rng.random(), f"t{seed}", hold)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return threads * OPS_PER_THREAD / (time.perf_counter() - t0)
+
+
+def main(thread_counts: list[int]) -> None:
+    print(f"{'threads':>8}{'global lock ops/s':>20}{'striped ops/s':>18}{'speedup':>10}")
+    for threads in thread_counts:
+        global_rate = run(GlobalLockBeliefSystem(), threads)
+        striped_rate = run(StripedBench(), threads)
+        print(
+            f"{threads:>8}{global_rate:>20,.0f}{striped_rate:>18,.0f}"
+            f"{striped_rate / global_rate:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1, 2, 4, 8, 16])
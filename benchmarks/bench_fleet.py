@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Many agents on one event loop: AGLMFleet vs one AutonomousLoop per agent.
+
+Every agent is a full AGLMCore (perceive → revise beliefs → decide → act →
+outcome belief) with trivial callables, so the numbers measure the
+scheduling and cycle overhead. Each run ticks N agents at INTERVAL for
+DURATION seconds and reports cycles per second against the target rate
+(N / INTERVAL), CPU seconds used per wall second (1.0 = one core
+saturated) and, for the fleet, how late cycles started.
+
+    pip install -e .
+    python benchmarks/bench_fleet.py                 # 1k, 10k and 20k agents
+    python benchmarks/bench_fleet.py 50000
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from aglm import AGLMCore, AGLMFleet, AutonomousLoop, Decision, PerceptionContext
+
+INTERVAL = 5.0
+DURATION = 15.0
+MAX_CONCURRENT = 1_000
+
+
+def make_core(i: int) -> AGLMCore:
+    facts = {"load": i % 7}
+
+    async def perceive():
+        return PerceptionContext(facts=facts)
+
+    async def decide(ctx, beliefs):
+        return Decision(action="noop", confidence=0.9)
+
+    async def act(decision):
+        return {"success": True}
+
+    return AGLMCore(perceive=perceive, decide=decide, act=act, agent_id=f"agent-{i}")
+
+
+async def run_fleet(cores: list[AGLMCore]) -> dict:
+    fleet = AGLMFleet(interval_seconds=INTERVAL, max_concurrent=MAX_CONCURRENT)
+    for core in cores:
+        fleet.add(core)
+    await fleet.start()
+    await asyncio.sleep(DURATION)
+    await fleet.stop()
+    status = fleet.status()
+    return {"cycles": status["cycles_completed"], "lag": status["max_lag_seconds"]}
+
+
+async def run_loops(cores: list[AGLMCore]) -> dict:
+    loops = [AutonomousLoop(core, interval_seconds=INTERVAL) for core in cores]
+    for loop in loops:
+        await loop.start()
+    await asyncio.sleep(DURATION)
+    await asyncio.gather(*(loop.stop() for loop in loops))
+    return {"cycles": sum(core.cycle_count for core in cores), "lag": None}
+
+
+def measure(runner, agents: int) -> tuple[float, float, object]:
+    cores = [make_core(i) for i in range(agents)]
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = asyncio.run(runner(cores))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return result["cycles"] / wall, cpu / wall, result["lag"]
+
+
+def main(sizes: list[int]) -> None:
+    print(
+        f"{'agents':>8}{'runner':>16}{'target/s':>10}{'cycles/s':>10}"
+        f"{'cpu/wall':>10}{'max lag s':>11}"
+    )
+    for agents in sizes:
+        for name, runner in (("AGLMFleet", run_fleet), ("AutonomousLoop", run_loops)):
+            rate, load, lag = measure(runner, agents)
+            lag_text = "-" if lag is None else f"{lag:.3f}"
+            print(
+                f"{agents:>8}{name:>16}{agents / INTERVAL:>10,.0f}{rate:>10,.0f}"
+                f"{load:>10.2f}{lag_text:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 20_000])
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Peak-RSS comparison of BeliefSystem (dict of Belief lists) and
+CompactBeliefSystem (interned strings + typed columns).
+
+Each (store, size) pair runs in a fresh interpreter so peak RSS is not
+polluted by earlier runs. The workload mirrors AGLMCore: a bounded set of
+claims revised over and over by a handful of sources, with small
+metadata dicts.
+
+    pip install -e .
+    python benchmarks/bench_memory.py                 # 1M and 10M beliefs
+    python benchmarks/bench_memory.py 100000 1000000  # custom sizes
+"""
+from __future__ import annotations
+
+import resource
+import subprocess
+import sys
+import time
+
+STORES = ("BeliefSystem", "CompactBeliefSystem")
+CLAIMS = 10_000
+SOURCES = 50
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def child(store_name: str, n: int) -> None:
+    import aglm
+
+    store = getattr(aglm, store_name)()
+    baseline = _peak_rss_mb()
+    t0 = time.perf_counter()
+    for i in range(n):
+        store.revise(
+            f"sensor.{i % CLAIMS}.reading",
+            (i % 100) / 100,
+            f"source.{i % SOURCES}",
+            metadata={"value": i % 100},
+        )
+    elapsed = time.perf_counter() - t0
+    assert len(store) == n
+    print(f"{_peak_rss_mb() - baseline:.1f} {elapsed:.2f}")
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'store':<22}{'beliefs':>12}{'peak MB':>12}{'bytes/belief':>14}{'load s':>9}")
+    for n in sizes:
+        for store_name in STORES:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", store_name, str(n)],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            mb, elapsed = float(out[0]), float(out[1])
+            per = mb * 1024 * 1024 / n
+            print(f"{store_name:<22}{n:>12,}{mb:>12.1f}{per:>14.1f}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(a) for a in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+CPU-bound deciders: AGLMFleet on one event loop vs ShardedFleet across
+worker processes.
+
+Each agent's decide() scores RULES rules against its percept in pure
+Python, so a single event loop is CPU-bound long before it is I/O-bound.
+Agents are due every INTERVAL seconds — more decide work than one core
+can do — and each run reports cycles per second over DURATION seconds.
+Throughput should grow with the worker count up to the number of cores.
+
+    pip install -e .
+    python benchmarks/bench_sharded.py            # 1, 2, 4 … cpu_count workers
+    python benchmarks/bench_sharded.py 1 8
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+from aglm import AGLMCore, AGLMFleet, Decision, PerceptionContext, ShardedFleet
+
+AGENTS = 2_000
+INTERVAL = 0.5
+DURATION = 10.0
+RULES = 2_000
+
+
+def make_agent(agent_id: str) -> AGLMCore:
+    weights = [((i * 7919) % 101) / 100 for i in range(RULES)]
+
+    async def perceive():
+        return PerceptionContext(facts={"load": time.time() % 1})
+
+    async def decide(ctx, beliefs):
+        load = ctx.facts["load"]
+        score = sum(w * load for w in weights if w > 0.5)
+        return Decision(action="scale" if score > RULES / 8 else "noop")
+
+    async def act(decision):
+        return {"success": True}
+
+    return AGLMCore(perceive=perceive, decide=decide, act=act, agent_id=agent_id)
+
+
+AGENT_IDS = [f"agent-{i}" for i in range(AGENTS)]
+
+
+async def single_loop() -> float:
+    fleet = AGLMFleet(interval_seconds=INTERVAL)
+    for agent_id in AGENT_IDS:
+        fleet.add(make_agent(agent_id))
+    await fleet.start()
+    await asyncio.sleep(DURATION)
+    await fleet.stop()
+    return fleet.status()["cycles_completed"]
+
+
+async def sharded(workers: int) -> float:
+    fleet = ShardedFleet(make_agent, AGENT_IDS, workers=workers, interval_seconds=INTERVAL)
+    await fleet.start()
+    # Don't count worker start-up: wait for the first report from every shard.
+    while any(not shard.get("agents") for shard in fleet.status()["shards"]):
+        await asyncio.sleep(0.1)
+    before = fleet.status()["cycles_completed"]
+    await asyncio.sleep(DURATION)
+    after = fleet.status()["cycles_completed"]
+    await fleet.stop()
+    return after - before
+
+
+def main(worker_counts: list[int]) -> None:
+    print(f"{'runner':>20}{'cycles/s':>12}{'speedup':>10}")
+    base = asyncio.run(single_loop()) / DURATION
+    print(f"{'AGLMFleet':>20}{base:>12,.0f}{1.0:>9.2f}x")
+    for workers in worker_counts:
+        rate = asyncio.run(sharded(workers)) / DURATION
+        print(f"{f'ShardedFleet x{workers}':>20}{rate:>12,.0f}{rate / base:>9.2f}x")
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    default = [n for n in (1, 2, 4, 8, 16, 32) if n < cores] + [cores]
+    main([int(a) for a in sys.argv[1:]] or default)
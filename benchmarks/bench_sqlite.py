@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Throughput of the in-memory BeliefSystem vs SQLiteBeliefSystem for
+add / top / claims.
+
+Adds are flushed every `CYCLE` beliefs, the way AGLMCore commits once per
+cycle.
+
+    pip install -e .
+    python benchmarks/bench_sqlite.py            # 200k beliefs
+    python benchmarks/bench_sqlite.py 1000000
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aglm import Belief, BeliefSystem, SQLiteBeliefSystem
+
+CLAIMS = 10_000
+CYCLE = 100
+TOP_QUERIES = 50_000
+CLAIMS_CALLS = 20
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>12,.0f}/s"
+
+
+def run(name: str, store: BeliefSystem, n: int) -> None:
+    beliefs = [
+        Belief(claim=f"sensor.{i % CLAIMS}", confidence=random.random(), source=f"s{i % 7}")
+        for i in range(n)
+    ]
+
+    t0 = time.perf_counter()
+    for i, b in enumerate(beliefs, 1):
+        store.add(b)
+        if i % CYCLE == 0:
+            store.flush()
+    store.flush()
+    add_s = time.perf_counter() - t0
+
+    keys = [f"sensor.{random.randrange(CLAIMS)}" for _ in range(TOP_QUERIES)]
+    t0 = time.perf_counter()
+    for k in keys:
+        store.top(k)
+    top_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(CLAIMS_CALLS):
+        store.claims()
+    claims_s = time.perf_counter() - t0
+
+    print(
+        f"{name:<20} add {_rate(n, add_s)}   top {_rate(TOP_QUERIES, top_s)}"
+        f"   claims() {_rate(CLAIMS_CALLS, claims_s)}"
+    )
+
+
+def main(n: int) -> None:
+    print(f"{n:,} beliefs over {CLAIMS:,} claims, flush every {CYCLE}")
+    run("BeliefSystem", BeliefSystem(), n)
+    with tempfile.TemporaryDirectory() as tmp:
+        with SQLiteBeliefSystem(Path(tmp) / "bench.db") as store:
+            run("SQLiteBeliefSystem", store, n)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -55,3 +55,79 @@ def test_belief_system_round_trip():
     bs2 = BeliefSystem.from_dict(data)
     assert len(bs2) == 2
     assert bs2.top("a").metadata == {"key": "value"}
+
+
+def test_belief_system_top_tracks_leader_and_ties_keep_oldest():
+    bs = BeliefSystem()
+    assert bs.top("x") is None
+    bs.revise("x", 0.4, "agent.a")
+    bs.revise("x", 0.9, "agent.b")
+    bs.revise("X ", 0.9, "agent.c")  # tie: the earlier 0.9 keeps the lead
+    bs.revise("x", 0.1, "agent.d")
+    assert bs.top("x").source == "agent.b"
+    assert bs.top("x") is max(bs.all("x"), key=lambda b: b.confidence)
+    assert len(bs) == 4
+
+
+def test_revise_many_matches_revise():
+    bs = BeliefSystem()
+    added = bs.revise_many(
+        ["cpu", "Disk", "cpu"],
+        [0.2, 0.5, 0.9],
+        ["s1", "s2", "s3"],
+        metadata=[{"value": 1}, None, {"value": 3}],
+        timestamp=10.0,
+    )
+    assert [b.claim for b in added] == ["cpu", "Disk", "cpu"]
+    assert len(bs) == 3
+    assert bs.top("cpu").source == "s3"
+    assert bs.all("disk")[0].metadata == {}
+    assert {b.timestamp for b in added} == {10.0}
+
+
+def test_revise_many_broadcasts_scalars_and_copies_metadata():
+    from array import array
+
+    bs = BeliefSystem()
+    shared = {"cycle": 1}
+    added = bs.revise_many(["a", "b"], 0.7, "sensor", metadata=shared)
+    assert [b.source for b in added] == ["sensor", "sensor"]
+    added[0].metadata["cycle"] = 2
+    assert added[1].metadata == shared == {"cycle": 1}
+
+    bs.revise_many(["a", "b"], array("d", [0.1, 0.8]), "sensor")
+    assert bs.top("b").confidence == 0.8
+
+
+def test_revise_many_validates_before_adding():
+    bs = BeliefSystem()
+    with pytest.raises(ValueError, match="index 1"):
+        bs.revise_many(["a", "b"], [0.5, 1.5], "s")
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], [0.5, float("nan")], "s")
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], [0.5], "s")
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], 0.5, ["s"])
+    assert len(bs) == 0
+
+
+def test_revise_many_accepts_numpy():
+    np = pytest.importorskip("numpy")
+    bs = BeliefSystem()
+    bs.revise_many(["a", "b"], np.array([0.25, 0.75]), "s")
+    assert type(bs.top("b").confidence) is float
+    with pytest.raises(ValueError):
+        bs.revise_many(["a"], np.array([-0.1]), "s")
+
+
+def test_revise_many_rejects_mismatched_numpy():
+    np = pytest.importorskip("numpy")
+    bs = BeliefSystem()
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], np.array([0.5]), "s")
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], np.array(0.5), "s")
+    with pytest.raises(ValueError):
+        bs.revise_many(["a", "b"], np.array([[0.5, 0.5]]), "s")
+    assert len(bs) == 0
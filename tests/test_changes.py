@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for the belief change feed."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from aglm import (
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    ConcurrentBeliefSystem,
+    MappedBeliefSystem,
+    RetentionPolicy,
+    SQLiteBeliefSystem,
+    write_snapshot,
+)
+from aglm.changes import ADDED, EVICTED, TOP
+
+
+def _summary(changes):
+    return [(c.kind, c.key, c.belief and c.belief.confidence,
+             c.previous and c.previous.confidence) for c in changes]
+
+
+@pytest.mark.parametrize("make", [BeliefSystem, CompactBeliefSystem, SQLiteBeliefSystem,
+                                  lambda: ConcurrentBeliefSystem(stripes=4)])
+def test_add_and_top_changes(make):
+    bs = make()
+    seen, tops = [], []
+    unsubscribe = bs.subscribe(seen.append)
+    bs.subscribe(tops.append, kinds={TOP})
+    bs.add(Belief("A", 0.5, "s"))
+    bs.add_many([Belief("a", 0.4, "s"), Belief("a", 0.5, "s"), Belief("a", 0.7, "s")])
+    assert _summary(seen) == [
+        (ADDED, "a", 0.5, None), (TOP, "a", 0.5, None),
+        (ADDED, "a", 0.4, None), (ADDED, "a", 0.5, None),
+        (ADDED, "a", 0.7, None), (TOP, "a", 0.7, 0.5),
+    ]
+    assert _summary(tops) == [(TOP, "a", 0.5, None), (TOP, "a", 0.7, 0.5)]
+    unsubscribe()
+    bs.add(Belief("b", 0.1, "s"))
+    assert len(seen) == 6 and len(tops) == 3
+    with pytest.raises(ValueError):
+        bs.subscribe(seen.append, kinds={"nope"})
+
+
+def test_evictions_and_failing_callbacks():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=1))
+    seen = []
+    bs.subscribe(lambda change: 1 / 0)  # logged, never breaks the write
+    bs.subscribe(seen.append, kinds={EVICTED, TOP})
+    bs.add(Belief("a", 0.9, "s"))
+    bs.add(Belief("a", 0.1, "s"))
+    assert _summary(seen) == [(TOP, "a", 0.9, None), (EVICTED, "a", 0.9, None),
+                              (TOP, "a", 0.1, 0.9)]
+    assert bs.top("a").confidence == 0.1
+
+
+def test_callbacks_see_the_completed_write():
+    bs = ConcurrentBeliefSystem(stripes=2)
+    seen = []
+    # Reading the store from a callback must not deadlock on the stripe lock.
+    bs.subscribe(lambda change: seen.append(bs.top(change.key).confidence), kinds={ADDED})
+    bs.add_many([Belief("a", 0.2, "s"), Belief("a", 0.6, "s")])
+    assert seen == [0.6, 0.6]
+
+
+def test_mapped_overlay_only_reports_real_leader_changes(tmp_path):
+    base = BeliefSystem()
+    base.add(Belief("a", 0.8, "s"))
+    write_snapshot(base, tmp_path / "b.snap")
+    with MappedBeliefSystem(tmp_path / "b.snap") as bs:
+        tops = []
+        bs.subscribe(tops.append, kinds={TOP})
+        bs.add(Belief("a", 0.5, "s"))   # below the mapped leader
+        bs.add(Belief("a", 0.9, "s"))
+        assert _summary(tops) == [(TOP, "a", 0.9, 0.8)]
+
+
+@pytest.mark.asyncio
+async def test_change_stream_is_bounded_and_thread_safe():
+    bs = ConcurrentBeliefSystem(stripes=4)
+    async with bs.changes(kinds={ADDED}, maxsize=8) as feed:
+        for i in range(10):
+            bs.add(Belief(f"c{i}", 0.5, "s"))
+        assert feed.dropped == 2
+        assert [(await feed.__anext__()).key for _ in range(8)] == [f"c{i}" for i in range(2, 10)]
+
+        writer = threading.Thread(target=bs.add, args=(Belief("from thread", 0.5, "s"),))
+        writer.start()
+        change = await asyncio.wait_for(feed.__anext__(), timeout=5)
+        writer.join()
+        assert change.key == "from thread"
+    assert [c async for c in feed] == []
+    bs.add(Belief("after close", 0.5, "s"))
+    assert not bs._observers and not bs._detach
+
+
+@pytest.mark.asyncio
+async def test_async_writes_are_delivered():
+    bs = ConcurrentBeliefSystem(stripes=4)
+    seen = []
+    bs.subscribe(seen.append)
+    await bs.arevise("a", 0.4, "s")
+    await bs.aadd(Belief("a", 0.8, "s"))
+    # A contended stripe goes through a worker thread; its changes still arrive.
+    i = bs._stripe("b")
+    bs._locks[i].acquire()
+    pending = asyncio.ensure_future(bs.arevise("b", 0.3, "s"))
+    await asyncio.sleep(0.01)
+    bs._locks[i].release()
+    await pending
+    assert _summary(seen) == [
+        (ADDED, "a", 0.4, None), (TOP, "a", 0.4, None),
+        (ADDED, "a", 0.8, None), (TOP, "a", 0.8, 0.4),
+        (ADDED, "b", 0.3, None), (TOP, "b", 0.3, None),
+    ]
@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for the compact, array-backed belief store."""
+from __future__ import annotations
+
+import pytest
+
+from aglm import Belief, BeliefSystem, CompactBeliefSystem
+
+
+def test_compact_matches_belief_system():
+    plain, compact = BeliefSystem(), CompactBeliefSystem()
+    for bs in (plain, compact):
+        bs.add(Belief(claim="Sky is blue", confidence=0.5, source="a", timestamp=1.0))
+        bs.add(Belief(claim="sky is blue", confidence=0.9, source="b", timestamp=2.0))
+        bs.add(Belief(claim="sky is blue", confidence=0.9, source="c", timestamp=3.0))
+        bs.add(Belief(claim="grass", confidence=0.7, source="a", timestamp=4.0,
+                      metadata={"value": 1}))
+
+    assert len(compact) == len(plain) == 4
+    assert list(compact.claims()) == list(plain.claims())
+    assert compact.top("SKY IS BLUE") == plain.top("sky is blue")
+    assert compact.all("sky is blue") == plain.all("sky is blue")
+    assert compact.to_dict() == plain.to_dict()
+    assert "grass" in compact and "nope" not in compact
+    assert compact.top("nope") is None and compact.all("nope") == []
+
+
+def test_compact_interns_strings_and_shares_metadata():
+    bs = CompactBeliefSystem()
+    for i in range(100):
+        bs.revise("cpu", 0.5, "sensor.1", metadata={"value": i % 2})
+    bs.revise("cpu", 0.5, "sensor.1", metadata={"value": True})
+
+    assert bs._strings == ["cpu", "sensor.1"]
+    # {} plus {"value": 0}, {"value": 1} and {"value": True} (kept distinct from 1).
+    assert len(bs._metadata) == 4
+    assert bs.all("cpu")[-1].metadata["value"] is True
+
+
+def test_compact_materialized_beliefs_are_copies():
+    bs = CompactBeliefSystem()
+    bs.revise("x", 0.5, "s", metadata={"k": "v"})
+    bs.top("x").metadata["k"] = "changed"
+    assert bs.top("x").metadata == {"k": "v"}
+    with pytest.raises(ValueError):  # no version history to go back to
+        bs.as_of(cycle=1)
+
+
+def test_compact_round_trip():
+    bs = CompactBeliefSystem()
+    bs.add(Belief(claim="a", confidence=0.5, source="s", metadata={"nested": {"x": 1}}))
+    bs2 = CompactBeliefSystem.from_dict(bs.to_dict())
+    assert isinstance(bs2, CompactBeliefSystem)
+    assert bs2.top("a").metadata == {"nested": {"x": 1}}
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for the lock-striped, thread-safe belief store."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aglm import Belief, BeliefSystem, ConcurrentBeliefSystem, RetentionPolicy
+
+
+def test_concurrent_matches_belief_system():
+    plain, striped = BeliefSystem(), ConcurrentBeliefSystem(stripes=4)
+    for bs in (plain, striped):
+        for i in range(40):
+            bs.add(Belief(claim=f"C{i % 7}", confidence=(i % 10) / 10, source=f"s{i % 3}",
+                          timestamp=float(i)))
+        bs.revise_many(["x", "y"], [0.2, 0.9], "batch", timestamp=100.0)
+
+    assert len(striped) == len(plain) == 42
+    assert sorted(striped.claims()) == sorted(plain.claims())
+    for key in plain.claims():
+        assert striped.top(key) == plain.top(key)
+        assert striped.all(key) == plain.all(key)
+    assert "c3" in striped and "nope" not in striped
+    assert striped.to_dict() == plain.to_dict()
+    assert striped.query(source="s1", since=10.0) == plain.query(source="s1", since=10.0)
+    assert striped.query(limit=5) == plain.query(limit=5)
+    assert striped.search("c3")[0][0] == "c3"
+
+
+def test_concurrent_writers_and_readers_lose_nothing():
+    bs = ConcurrentBeliefSystem(stripes=8)
+    errors = []
+
+    def writer(n: int) -> None:
+        for i in range(2000):
+            bs.revise(f"claim.{i % 50}", 0.5, f"writer.{n}")
+
+    def reader() -> None:
+        try:
+            for i in range(2000):
+                bs.top(f"claim.{i % 50}")
+                bs.all(f"claim.{i % 50}")
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(bs) == 8000
+    assert len(list(bs.claims())) == 50
+
+
+def test_concurrent_retention_applies_per_stripe():
+    bs = ConcurrentBeliefSystem(stripes=4, retention=RetentionPolicy(max_per_claim=2))
+    for i in range(10):
+        bs.revise("x", i / 10, "s")
+    assert len(bs) == 2
+
+
+def test_racing_subscribers_attach_the_shard_feeds_once(monkeypatch):
+    bs = ConcurrentBeliefSystem(stripes=4)
+    locked = bs._locked
+
+    def slow_locked(i, fn, *args):
+        time.sleep(0.001)  # widen the window between checking and setting _detach
+        return locked(i, fn, *args)
+
+    monkeypatch.setattr(bs, "_locked", slow_locked)
+    seen = []
+    barrier = threading.Barrier(8)
+    unsubscribes = []
+
+    def subscriber() -> None:
+        barrier.wait()
+        unsubscribes.append(bs.subscribe(seen.append))
+
+    threads = [threading.Thread(target=subscriber) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(len(shard._observers) == 1 for shard in bs._shards)
+    bs.revise("x", 0.5, "s")
+    assert len(seen) == 8 * 2  # added + top, once per subscriber
+
+    for unsubscribe in unsubscribes:
+        unsubscribe()
+    assert all(not shard._observers for shard in bs._shards)
+
+
+def test_stripes_must_be_positive():
+    with pytest.raises(ValueError):
+        ConcurrentBeliefSystem(stripes=0)
+
+
+@pytest.mark.asyncio
+async def test_async_api():
+    bs = ConcurrentBeliefSystem()
+    await bs.arevise("x", 0.3, "a")
+    await bs.aadd(Belief(claim="x", confidence=0.8, source="b"))
+    await bs.arevise_many(["y", "z"], 0.5, "c")
+    assert (await bs.atop("x")).source == "b"
+    assert len(await bs.aall("x")) == 2
+    assert len(await bs.aquery(source="c")) == 2
+    assert (await bs.asearch("y"))[0][0] == "y"
+
+    # A contended stripe falls back to a worker thread instead of blocking the loop.
+    i = bs._stripe("x")
+    bs._locks[i].acquire()
+    pending = asyncio.ensure_future(bs.atop("x"))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+    bs._locks[i].release()
+    assert (await pending).source == "b"
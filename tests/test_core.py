@@ -2,6 +2,9 @@
 """Smoke tests for AGLMCore — the PODA cycle."""
 from __future__ import annotations
 
+import asyncio
+import time
+
 import pytest
 
 from aglm import AGLMCore, BeliefSystem, Decision, PerceptionContext
@@ -102,3 +105,134 @@ async def test_cycle_counts_increment():
         out = await core.cycle()
         assert out["cycle"] == i
     assert core.cycle_count == 3
+
+
+def _staged_core(delay: float, log: list, perceive_fails_on: int = 0) -> AGLMCore:
+    calls = {"perceive": 0}
+
+    async def perceive():
+        calls["perceive"] += 1
+        n = calls["perceive"]
+        await asyncio.sleep(delay)
+        if n == perceive_fails_on:
+            raise RuntimeError("sensor offline")
+        return PerceptionContext(facts={f"tick{n}": n}, source="clock")
+
+    async def decide(ctx, beliefs):
+        n = next(iter(ctx.facts.values()))
+        log.append(("decide", n, f"outcome:act{n - 1}" in beliefs))
+        return Decision(action=f"act{n}")
+
+    async def act(d):
+        await asyncio.sleep(delay)
+        log.append(("act", d.action))
+        return {"success": True}
+
+    return AGLMCore(perceive=perceive, decide=decide, act=act)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_perceive_with_act():
+    log: list = []
+    core = _staged_core(0.05, log)
+    started = time.perf_counter()
+    outcomes = [o async for o in core.pipeline(cycles=6, depth=2)]
+    elapsed = time.perf_counter() - started
+
+    assert [o["cycle"] for o in outcomes] == [1, 2, 3, 4, 5, 6]
+    assert elapsed < 0.5  # sequential cycles would take 6 × 0.1s
+    # Strict ordering: every decide saw the previous cycle's outcome.
+    assert all(seen for kind, n, seen in (e for e in log if e[0] == "decide") if n > 1)
+    assert [e[1] for e in log if e[0] == "act"] == [f"act{n}" for n in range(1, 7)]
+    assert core.cycle_count == 6 and core.last_outcome["cycle"] == 6
+
+
+@pytest.mark.asyncio
+async def test_relaxed_pipeline_keeps_order_through_failures():
+    log: list = []
+    core = _staged_core(0.02, log, perceive_fails_on=3)
+    outcomes = [o async for o in core.pipeline(cycles=6, depth=4, strict=False)]
+
+    assert [o["stage"] for o in outcomes] == ["complete"] * 2 + ["perceive"] + ["complete"] * 3
+    assert [o.get("cycle") for o in outcomes if o["success"]] == [1, 2, 4, 5, 6]
+    assert [e[1] for e in log if e[0] == "act"] == ["act1", "act2", "act4", "act5", "act6"]
+    assert "tick6" in core.beliefs and "outcome:act6" in core.beliefs
+
+    with pytest.raises(ValueError):
+        async for _ in core.pipeline(depth=0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stage_timeout_cancels_hung_decide():
+    cleaned_up = []
+
+    async def perceive():
+        return PerceptionContext(facts={"q": 1})
+
+    async def decide(ctx, beliefs):
+        try:
+            await asyncio.sleep(60)  # a stalled model call
+        finally:
+            cleaned_up.append(True)
+        return Decision(action="never")
+
+    async def act(d):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, stage_timeouts={"decide": 0.05})
+    started = time.perf_counter()
+    outcome = await core.cycle()
+    assert time.perf_counter() - started < 1
+    assert outcome == {"success": False, "stage": "decide", "error": "timeout"}
+    assert cleaned_up == [True]
+    stats = core.status()["metrics"]["stages"]["decide"]
+    assert stats["failed"] == 1 and stats["timeouts"] == 1
+
+    with pytest.raises(ValueError):
+        AGLMCore(perceive=perceive, decide=decide, act=act, stage_timeouts={"orient": 1.0})
+
+
+@pytest.mark.asyncio
+async def test_timeout_error_raised_by_a_stage_is_not_a_deadline():
+    async def perceive():
+        return PerceptionContext(facts={"q": 1})
+
+    async def decide(ctx, beliefs):
+        raise TimeoutError("upstream model API timed out")
+
+    async def act(d):
+        return {"success": True}
+
+    for stage_timeouts in ({}, {"decide": 5.0}):
+        core = AGLMCore(perceive=perceive, decide=decide, act=act, stage_timeouts=stage_timeouts)
+        outcome = await core.cycle()
+        assert outcome["error"] == "upstream model API timed out"
+        stats = core.status()["metrics"]["stages"]["decide"]
+        assert stats["failed"] == 1 and stats["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cycle_timeout_bounds_the_whole_cycle():
+    async def perceive():
+        await asyncio.sleep(0.06)
+        return PerceptionContext(facts={"q": 1})
+
+    async def decide(ctx, beliefs):
+        await asyncio.sleep(0.06)
+        return Decision(action="slow")
+
+    async def act(d):
+        await asyncio.sleep(60)
+        return {"success": True}
+
+    # Each stage fits its own deadline; together they overrun the cycle's.
+    core = AGLMCore(
+        perceive=perceive, decide=decide, act=act,
+        stage_timeouts={"perceive": 0.5, "decide": 0.5}, cycle_timeout=0.2,
+    )
+    started = time.perf_counter()
+    outcome = await core.cycle()
+    elapsed = time.perf_counter() - started
+    assert outcome == {"success": False, "stage": "act", "decision": "slow", "error": "timeout"}
+    assert 0.15 < elapsed < 1
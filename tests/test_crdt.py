@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for delta-state CRDT merges between belief stores."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from aglm import (
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    ConcurrentBeliefSystem,
+    RetentionPolicy,
+)
+from aglm.crdt import BeliefDelta, DeltaCursor, DeltaLog, pull, serve_deltas
+from aglm.wire import server_address
+
+
+def _ids(bs):
+    return sorted((b.claim.lower(), b.source, b.timestamp, b.confidence)
+                  for k in bs.claims() for b in bs.all(k))
+
+
+def _observe(bs, node: str, n: int, start: float = 0.0) -> None:
+    for i in range(n):
+        bs.add(Belief(f"claim {i % 4}", (i % 10) / 10, node, timestamp=start + i))
+
+
+def test_merge_converges_and_is_idempotent():
+    a, b, c = BeliefSystem(), CompactBeliefSystem(), ConcurrentBeliefSystem(stripes=4)
+    for node, name in ((a, "a"), (b, "b"), (c, "c")):
+        _observe(node, name, 10)
+    # Different merge orders, repeated merges: same result everywhere.
+    assert b.merge(a.delta()) == 10 and b.merge(a.delta()) == 0
+    c.merge(b.delta())
+    a.merge(c.delta())
+    b.merge(c.delta())
+    c.merge(a.delta())
+    assert _ids(a) == _ids(b) == _ids(c) and len(a) == len(b) == len(c) == 30
+    for key in a.claims():
+        assert a.top(key).confidence == b.top(key).confidence == c.top(key).confidence
+
+
+def test_cursors_ship_only_new_beliefs():
+    a, b = BeliefSystem(), BeliefSystem()
+    _observe(a, "a", 5)
+    first = a.delta()
+    b.merge(first)
+    assert a.delta(first.cursor).beliefs == []
+    a.revise("fresh", 0.9, "a")
+    b.revise("only on b", 0.9, "b")
+    a.merge(b.delta())  # merged-in beliefs join a's log and are shipped on too
+    second = a.delta(first.cursor)
+    assert sorted(x.claim for x in second.beliefs) == ["fresh", "only on b"]
+    assert b.merge(second) == 1
+    assert len(a.delta(DeltaCursor("other epoch", 99)).beliefs) == len(a)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["tcp", "unix"])
+async def test_sync_over_a_local_socket(tmp_path, transport):
+    a, b = BeliefSystem(), BeliefSystem()
+    _observe(a, "a", 20)
+    _observe(b, "b", 20, start=100.0)
+    address_a = ("127.0.0.1", 0) if transport == "tcp" else str(tmp_path / "a.sock")
+    address_b = ("127.0.0.1", 0) if transport == "tcp" else str(tmp_path / "b.sock")
+    server_a = await serve_deltas(a, address_a)
+    server_b = await serve_deltas(b, address_b)
+    try:
+        cursor_a = await pull(b, server_address(server_a))
+        cursor_b = await pull(a, server_address(server_b))
+        assert _ids(a) == _ids(b) and len(a) == 40
+
+        a.revise("late", 0.5, "a")
+        cursor_a = await pull(b, server_address(server_a), cursor_a)
+        assert "late" in b and len(b) == 41
+        assert await pull(a, server_address(server_b), cursor_b) != cursor_b  # b gained 1
+        assert len(a) == 41
+    finally:
+        server_a.close()
+        server_b.close()
+        await server_a.wait_closed()
+        await server_b.wait_closed()
+
+
+def test_beliefs_sharing_claim_source_and_time_stay_distinct():
+    a, b, c = BeliefSystem(), CompactBeliefSystem(), ConcurrentBeliefSystem(stripes=4)
+    a.revise_many(["x", "x", "y"], [0.2, 0.9, 0.5], "s", timestamp=5.0)
+    d = BeliefDelta.decode(a.delta().encode())
+    assert d.ordinals == [0, 1, 0]
+    assert b.merge(d) == 3 and b.merge(d) == 0
+    assert c.merge(b.delta()) == 3
+    assert sorted(x.confidence for x in c.all("x")) == [0.2, 0.9]
+    # A node that restarts (new log) numbers what it holds the same way.
+    restarted = BeliefSystem.from_dict(a.to_dict())
+    assert restarted.merge(c.delta()) == 0 and len(restarted) == 3
+
+
+def test_log_stays_within_the_retention_ttl(monkeypatch):
+    now = time.time()
+    a = BeliefSystem(retention=RetentionPolicy(ttl_seconds=60))
+    b = BeliefSystem()
+    b.add(Belief("stale", 0.5, "b", timestamp=now - 120))
+    b.add(Belief("fresh", 0.5, "b", timestamp=now))
+    assert a.merge(b.delta()) == 1 and "stale" not in a
+    a.add(Belief("ageing", 0.5, "a", timestamp=now - 50))
+    log = a._delta_log
+    assert len(log._log) == 2
+    log._trim_at = 0.0
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    d = a.delta()
+    assert [x.claim for x in d.beliefs] == ["fresh"] and d.version == 2
+    assert len(log._live) == len(log._next) == 1
+
+
+def test_log_follows_evictions_without_a_ttl():
+    a = BeliefSystem(retention=RetentionPolicy(max_per_claim=2))
+    a._delta_log = log = DeltaLog.attach(a, tombstones=10)
+    b = BeliefSystem()
+    for i in range(100):
+        belief = Belief("claim", i / 100, "s", timestamp=float(i))
+        a.add(belief)
+        b.add(belief)
+    assert len(a) == len(log._live) == 2 and len(log._log) <= 4  # dead entries compact lazily
+    assert len(log._evicted) == len(log._tombstoned) == 10 and len(log._next) == 12
+    assert [x.timestamp for x in a.delta().beliefs] == [98.0, 99.0]
+
+    # Recently evicted beliefs are not merged back; older ones come back and
+    # are evicted again, without growing the log.
+    assert a.merge(b.delta()) == 88
+    assert len(a) == 2 and len(log._log) <= 4 and len(log._evicted) == 10
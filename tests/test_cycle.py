@@ -63,3 +63,30 @@ async def test_loop_survives_failing_cycle():
     # Should have ticked several times despite the alternating failures.
     assert counter["n"] >= 3
     assert core.cycle_count >= 3
+
+
+@pytest.mark.asyncio
+async def test_stop_is_bounded_by_cycle_deadline():
+    started = asyncio.Event()
+
+    async def perceive():
+        return PerceptionContext()
+
+    async def decide(ctx, beliefs):
+        started.set()
+        await asyncio.sleep(60)  # a stalled model call
+        return Decision(action="never")
+
+    async def act(d):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, cycle_timeout=0.1)
+    loop = AutonomousLoop(core, interval_seconds=300.0)
+    await loop.start()
+    await started.wait()
+
+    t0 = asyncio.get_running_loop().time()
+    await loop.stop()
+    assert asyncio.get_running_loop().time() - t0 < 2  # not interval + 10s
+    assert loop.is_running is False
+    assert core.last_outcome["error"] == "timeout"
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for AGLMFleet."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from aglm import AGLMCore, AGLMFleet, Decision, PerceptionContext
+
+
+def _core(agent_id, ticks, act_delay=0.0, fail=False, state=None):
+    async def perceive():
+        ticks.setdefault(agent_id, []).append(time.monotonic())
+        if fail:
+            raise RuntimeError("sensor down")
+        return PerceptionContext(facts={"agent": agent_id})
+
+    async def decide(ctx, beliefs):
+        return Decision(action="tick")
+
+    async def act(d):
+        if state is not None:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(act_delay)
+        if state is not None:
+            state["now"] -= 1
+        return {"success": True}
+
+    return AGLMCore(perceive=perceive, decide=decide, act=act, agent_id=agent_id)
+
+
+@pytest.mark.asyncio
+async def test_fleet_ticks_every_agent_within_cap():
+    ticks, state = {}, {"now": 0, "peak": 0}
+    fleet = AGLMFleet(interval_seconds=0.1, max_concurrent=8)
+    for i in range(200):
+        fleet.add(_core(f"agent-{i}", ticks, act_delay=0.002, state=state))
+    with pytest.raises(ValueError):
+        fleet.add(_core("agent-0", ticks))
+
+    started = time.monotonic()
+    await fleet.start()
+    assert fleet.is_running
+    await asyncio.sleep(0.4)
+    await fleet.stop()
+    assert not fleet.is_running
+
+    assert len(ticks) == 200
+    assert state["peak"] <= 8
+    # First ticks are spread over the interval, not bunched at start.
+    firsts = sorted(t[0] - started for t in ticks.values())
+    assert firsts[-1] - firsts[0] > 0.05
+    status = fleet.status()
+    assert status["agents"] == 200
+    assert status["in_flight"] == 0
+    assert status["cycles_completed"] >= 200
+    assert status["cycles_failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fleet_circuit_breaker_and_remove():
+    ticks = {}
+    fleet = AGLMFleet(
+        interval_seconds=0.01, max_consecutive_failures=3, backoff_seconds=10.0
+    )
+    fleet.add(_core("flaky", ticks, fail=True))
+    fleet.add(_core("steady", ticks))
+    await fleet.start()
+    await asyncio.sleep(0.3)
+
+    assert len(ticks["flaky"]) == 3  # then backing off
+    assert fleet.status()["circuit_breaks"] == 1
+    assert fleet.agent_status("flaky")["next_due_in"] > 5
+
+    fleet.remove("steady")
+    count = len(ticks["steady"])
+    await asyncio.sleep(0.1)
+    assert len(ticks["steady"]) <= count + 1  # at most the cycle in flight
+    assert "steady" not in fleet
+    await fleet.stop()
+
+
+@pytest.mark.asyncio
+async def test_fleet_stop_cancels_hung_cycles():
+    ticks = {}
+    fleet = AGLMFleet(interval_seconds=0.001)
+    fleet.add(_core("slow", ticks, act_delay=60))
+    await fleet.start()
+    await asyncio.sleep(0.05)
+    assert fleet.status()["in_flight"] == 1
+
+    started = time.monotonic()
+    await fleet.stop(timeout=0.1)
+    assert time.monotonic() - started < 2
+    assert fleet.status()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fleet_spreads_first_ticks_from_start():
+    ticks = {}
+    fleet = AGLMFleet(interval_seconds=0.2)
+    for i in range(50):
+        fleet.add(_core(f"agent-{i}", ticks))
+    await asyncio.sleep(0.3)  # added long before start: phases must not all be past due
+    started = time.monotonic()
+    await fleet.start()
+    await asyncio.sleep(0.25)
+    await fleet.stop()
+
+    firsts = sorted(t[0] - started for t in ticks.values())
+    assert len(firsts) == 50 and firsts[-1] - firsts[0] > 0.1
+
+
+@pytest.mark.asyncio
+async def test_fleet_readd_waits_for_the_cycle_in_flight():
+    ticks, state = {}, {"now": 0, "peak": 0}
+    fleet = AGLMFleet(interval_seconds=0.01)
+    core = _core("busy", ticks, act_delay=0.1, state=state)
+    fleet.add(core)
+    await fleet.start()
+    while state["now"] == 0:
+        await asyncio.sleep(0.005)
+    fleet.remove("busy")
+    fleet.add(core)
+    await asyncio.sleep(0.35)
+    await fleet.stop()
+
+    assert state["peak"] == 1  # never two cycles of one core at once
+    assert len(ticks["busy"]) >= 2 and "busy" in fleet
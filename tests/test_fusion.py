@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for fused per-claim confidence."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from aglm import (
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    ConcurrentBeliefSystem,
+    RetentionPolicy,
+    SQLiteBeliefSystem,
+)
+from aglm.fusion import fuse
+
+
+def _expected(confidences, sources):
+    per_source = {}
+    for c, s in zip(confidences, sources):
+        per_source.setdefault(s, []).append(c)
+    return {
+        "count": len(confidences),
+        "mean": sum(confidences) / len(confidences),
+        "source_mean": sum(sum(v) / len(v) for v in per_source.values()) / len(per_source),
+        "log_odds": sum(math.log(c / (1 - c)) for c in confidences),
+        "noisy_or": 1 - math.prod(1 - c for c in confidences),
+    }
+
+
+def _check(fused, expected):
+    assert fused.count == expected["count"]
+    for name in ("mean", "source_mean", "log_odds", "noisy_or"):
+        assert getattr(fused, name) == pytest.approx(expected[name]), name
+
+
+@pytest.mark.parametrize("make", [BeliefSystem, CompactBeliefSystem, SQLiteBeliefSystem,
+                                  lambda: ConcurrentBeliefSystem(stripes=4)])
+def test_fused_matches_a_scan(make):
+    bs = make()
+    confidences = [0.9, 0.6, 0.6, 0.6, 0.3]
+    sources = ["a", "b", "b", "b", "c"]
+    bs.add_many(Belief("door", c, s) for c, s in zip(confidences[:2], sources[:2]))
+    assert bs.fused("DOOR").count == 2  # built lazily here…
+    bs.add_many(Belief("door", c, s) for c, s in zip(confidences[2:], sources[2:]))
+    _check(bs.fused("door"), _expected(confidences, sources))  # …then kept up to date
+    assert bs.fused("window") is None
+
+
+def test_fused_follows_evictions_and_views():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=2))
+    assert bs.fused("x") is None
+    for c, s in [(0.2, "a"), (0.8, "b"), (0.7, "b")]:
+        bs.add(Belief("x", c, s))
+    _check(bs.fused("x"), _expected([0.8, 0.7], ["b", "b"]))
+    with bs.snapshot() as view:
+        bs.add(Belief("x", 0.1, "c"))
+        _check(view.fused("x"), _expected([0.8, 0.7], ["b", "b"]))
+    _check(bs.fused("x"), _expected([0.7, 0.1], ["b", "c"]))
+
+
+def test_extreme_confidences():
+    f = fuse([Belief("x", 1.0, "a"), Belief("x", 0.0, "b")])
+    assert f.noisy_or == 1.0 and f.log_odds == pytest.approx(0.0, abs=1e-9)
+    bs = BeliefSystem()
+    for _ in range(2000):
+        bs.revise("x", 0.01, "a")
+    f = bs.fused("x")
+    assert f.probability == pytest.approx(0.0) and f.noisy_or == pytest.approx(1.0)
+    assert fuse([]) is None
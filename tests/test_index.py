@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for secondary indexes and BeliefSystem.query()."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from aglm import (
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    ConcurrentBeliefSystem,
+    MappedBeliefSystem,
+    RetentionPolicy,
+    SQLiteBeliefSystem,
+    write_snapshot,
+)
+from aglm.index import split_negation
+
+
+def _load(bs: BeliefSystem) -> BeliefSystem:
+    for i in range(50):
+        bs.add(Belief(
+            claim=f"c{i % 5}",
+            confidence=(i % 10) / 10 + 0.05,
+            source=f"s{i % 3}",
+            timestamp=1000.0 + i,
+        ))
+    return bs
+
+
+def _naive(bs: BeliefSystem, **f) -> list:
+    out = [
+        b for k in bs.claims() for b in bs.all(k)
+        if (f.get("source") is None or b.source == f["source"])
+        and (f.get("since") is None or b.timestamp >= f["since"])
+        and (f.get("until") is None or b.timestamp <= f["until"])
+        and (f.get("min_confidence") is None or b.confidence >= f["min_confidence"])
+        and (f.get("max_confidence") is None or b.confidence <= f["max_confidence"])
+    ]
+    return sorted(out, key=lambda b: b.timestamp)
+
+
+FILTERS = [
+    {},
+    {"source": "s1"},
+    {"source": "nobody"},
+    {"since": 1040.0},
+    {"since": 1010.0, "until": 1020.0},
+    {"min_confidence": 0.9},
+    {"min_confidence": 0.3, "max_confidence": 0.55},
+    {"source": "s2", "since": 1005.0, "min_confidence": 0.5},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_query_matches_naive_filter(filters):
+    bs = _load(BeliefSystem())
+    assert bs.query(**filters) == _naive(bs, **filters)
+
+
+def test_query_index_is_maintained_after_first_use():
+    bs = _load(BeliefSystem(retention=RetentionPolicy(max_per_claim=4)))
+    assert bs.query(source="s0") == _naive(bs, source="s0")
+    for i in range(30):
+        bs.add(Belief(claim=f"c{i % 5}", confidence=0.99, source="late", timestamp=500.0 + i))
+    for filters in FILTERS + [{"source": "late"}, {"until": 600.0}]:
+        assert bs.query(**filters) == _naive(bs, **filters)
+    assert bs.query(min_confidence=0.9, limit=3) == _naive(bs, min_confidence=0.9)[:3]
+
+
+def test_query_index_counts_one_object_added_twice():
+    bs = _load(BeliefSystem(retention=RetentionPolicy(max_per_claim=3)))
+    bs.query()  # build the index, then maintain it
+    shared = Belief(claim="twice", confidence=0.95, source="dup", timestamp=2000.0)
+    bs.add(shared)
+    bs.add(shared)
+    bs.add(Belief(claim="twice", confidence=0.1, source="other", timestamp=2001.0))
+    bs.add(Belief(claim="twice", confidence=0.2, source="other", timestamp=2002.0))
+    assert bs.all("twice").count(shared) == 1  # one copy evicted, one still held
+    for filters in FILTERS + [{"source": "dup"}, {"since": 1999.0}, {"min_confidence": 0.94}]:
+        assert bs.query(**filters) == _naive(bs, **filters)
+    bs.add(Belief(claim="twice", confidence=0.3, source="other", timestamp=2003.0))
+    assert bs.query(source="dup") == _naive(bs, source="dup") == []
+
+
+def test_query_on_other_backends(tmp_path):
+    reference = _load(BeliefSystem())
+    write_snapshot(reference, tmp_path / "b.snap")
+    stores = [
+        _load(CompactBeliefSystem()),
+        _load(SQLiteBeliefSystem()),
+        MappedBeliefSystem(tmp_path / "b.snap"),
+    ]
+    for bs in stores + [reference]:
+        bs.add(Belief(claim="new", confidence=0.95, source="s1", timestamp=1025.5))
+    for store in stores:
+        for filters in FILTERS:
+            assert store.query(**filters) == _naive(reference, **filters), (store, filters)
+        assert store.query(source="s1", limit=2) == _naive(reference, source="s1")[:2]
+    stores[1].close()
+    stores[2].close()
+
+
+def _claims_store(bs: BeliefSystem) -> BeliefSystem:
+    for claim in [
+        "disk_usage:/var",
+        "disk usage root",
+        "cpu.load",
+        "memory usage",
+        "disks_used total",
+        "network throughput",
+    ]:
+        bs.revise(claim, 0.5, "s")
+    return bs
+
+
+def test_search_ranks_claims_by_text():
+    bs = _claims_store(BeliefSystem())
+    keys = [key for key, _score in bs.search("disk usage", k=3)]
+    assert set(keys[:2]) == {"disk_usage:/var", "disk usage root"}
+    assert keys[2] == "memory usage"
+    assert bs.search("throughput")[0][0] == "network throughput"
+    assert bs.search("nothing like it") == []
+
+
+def test_search_fuzzy_expansion_and_incremental_maintenance():
+    bs = _claims_store(BeliefSystem(retention=RetentionPolicy(max_per_claim=1)))
+    assert bs.search("disks", fuzzy=False)[0][0] == "disks_used total"
+    # Unknown words are expanded by trigram similarity even without fuzzy=True.
+    assert "network throughput" in dict(bs.search("thruput throughputs"))
+    assert "disks_used total" in dict(bs.search("disk", fuzzy=True))
+
+    bs.revise("GPU temperature", 0.5, "s")
+    assert bs.search("gpu")[0][0] == "gpu temperature"
+
+
+def test_search_drops_fully_evicted_claims():
+    bs = BeliefSystem(retention=RetentionPolicy(ttl_seconds=10))
+    bs.revise("fresh disk", 0.5, "s")
+    assert bs.search("disk")
+    bs.expire(now=bs.top("fresh disk").timestamp + 60)
+    assert bs.search("disk") == []
+
+
+def test_search_on_other_backends(tmp_path):
+    reference = _claims_store(BeliefSystem())
+    write_snapshot(reference, tmp_path / "b.snap")
+    mapped = MappedBeliefSystem(tmp_path / "b.snap")
+    stores = [_claims_store(CompactBeliefSystem()), _claims_store(SQLiteBeliefSystem()), mapped]
+    mapped.revise("disk pressure", 0.5, "s")
+    for store in stores:
+        top = {key for key, _score in store.search("disk usage", k=2)}
+        assert top == {"disk_usage:/var", "disk usage root"}, store
+    stores[0].revise("gpu temperature", 0.5, "s")
+    assert stores[0].search("gpu")[0][0] == "gpu temperature"
+    assert "disk pressure" in dict(mapped.search("pressure"))
+    assert "disks_used total" in dict(stores[1].search("disk", fuzzy=True))
+    stores[1].close()
+    mapped.close()
+
+
+def test_split_negation():
+    assert split_negation("sky is blue") == ("sky is blue", True)
+    assert split_negation("not sky is blue") == ("sky is blue", False)
+    assert split_negation("not  not sky is blue") == ("sky is blue", True)
+    assert split_negation("nothing") == ("nothing", True)
+
+
+@pytest.mark.parametrize("make", [BeliefSystem, CompactBeliefSystem, SQLiteBeliefSystem,
+                                  lambda: ConcurrentBeliefSystem(stripes=4)])
+def test_conflicts(make):
+    bs = make()
+    bs.revise("The sky is blue", 0.9, "eyes")
+    bs.revise("grass is green", 0.8, "eyes")
+    assert bs.conflicts() == []  # built here, maintained from now on
+    bs.revise("not the sky is blue", 0.4, "forecast")
+    bs.revise("not not grass is green", 0.7, "logic")
+    [conflict] = bs.conflicts()
+    assert (conflict.claim, conflict.negation) == ("the sky is blue", "not the sky is blue")
+    assert conflict.claim_top.confidence == 0.9 and conflict.negation_top.confidence == 0.4
+    assert bs.conflicts("NOT the sky is blue") == [conflict]
+    assert bs.conflicts("grass is green") == []
+    if not isinstance(bs, SQLiteBeliefSystem):  # in-memory SQLite has no snapshots
+        with bs.snapshot() as view:
+            assert view.conflicts() == [conflict]
+
+
+def test_conflicts_follow_evictions():
+    bs = BeliefSystem(retention=RetentionPolicy(ttl_seconds=60))
+    now = time.time()
+    bs.add(Belief("door open", 0.9, "s", timestamp=now))
+    bs.add(Belief("not door open", 0.9, "s", timestamp=now - 30))
+    assert len(bs.conflicts()) == 1
+    bs.expire(now=now + 45)  # the negation ages out
+    assert bs.conflicts() == []
+    bs.revise("not door open", 0.5, "s")
+    assert len(bs.conflicts("door open")) == 1
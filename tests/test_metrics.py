@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for per-stage cycle metrics."""
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from aglm import AGLMCore, Decision, PerceptionContext
+from aglm.metrics import _BUCKETS, CycleMetrics, CycleSample, LatencyHistogram, _lower
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    rng = random.Random(7)
+    values = sorted(rng.randint(1_000, 50_000_000) for _ in range(20_000))
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+    assert hist.count == len(values)
+    assert hist.max == values[-1]
+    for q in (0.5, 0.95, 0.99):
+        exact = values[round(q * len(values)) - 1]
+        assert abs(hist.percentile(q) - exact) <= exact / 16
+    assert LatencyHistogram().summary()["p99"] == 0.0
+
+
+def test_histogram_range_saturates_at_2_to_the_41_ns():
+    hist = LatencyHistogram()
+    hist.record(2**41 - 1)  # top of the last bucket
+    hist.record(2**45)  # past the range: counted in the last bucket
+    assert hist.counts[-1] == hist.count == 2
+    assert hist.min == _lower(_BUCKETS - 1) > 2**40
+
+
+def test_inlined_stage_recording_matches_the_histogram():
+    values = list(range(-2, 4096))
+    for bits in range(5, 70):
+        values += [2**bits - 1, 2**bits, 2**bits + 1, 3 << (bits - 2), random.getrandbits(bits)]
+    metrics = CycleMetrics()
+    hist = LatencyHistogram()
+    for ns in values:
+        sample = CycleSample(0, 0)
+        sample.ns[0] = ns
+        metrics.record(sample, {"success": True}, 0)
+        hist.record(ns)
+    recorded = metrics.stages["perceive"]
+    assert recorded.counts == hist.counts
+    assert (recorded.count, recorded.total, recorded.max) == (hist.count, hist.total, hist.max)
+
+
+@pytest.mark.asyncio
+async def test_core_records_stage_timings_and_failures():
+    calls = {"n": 0}
+
+    async def perceive():
+        return PerceptionContext(facts={"a": 1, "b": 2})
+
+    async def decide(ctx, beliefs):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise RuntimeError("model unavailable")
+        await asyncio.sleep(0.01)
+        return Decision(action="noop")
+
+    async def act(d):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act)
+    samples = []
+    unsubscribe = core.metrics.subscribe(samples.append)
+    for _ in range(4):
+        await core.cycle()
+    unsubscribe()
+    await core.cycle()
+
+    metrics = core.status()["metrics"]
+    assert metrics["cycles_succeeded"] == 4
+    assert metrics["cycles_failed"] == 1
+    assert metrics["beliefs_added"] == 5 * 2 + 4  # facts + outcomes
+    decide_stats = metrics["stages"]["decide"]
+    assert decide_stats["completed"] == 4 and decide_stats["failed"] == 1
+    assert metrics["stages"]["act"]["count"] == 4
+    assert 0.009 < decide_stats["p50"] < 0.1
+    assert decide_stats["p50"] <= decide_stats["p95"] <= decide_stats["p99"]
+
+    assert len(samples) == 4
+    failed = samples[2]
+    assert (failed.success, failed.stage) == (False, "decide")
+    assert set(failed.durations) == {"perceive", "orient", "decide"}
+    assert samples[0].beliefs_added == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_metrics():
+    async def perceive():
+        return PerceptionContext(facts={"x": 1})
+
+    async def decide(ctx, beliefs):
+        return Decision(action="noop")
+
+    async def act(d):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act)
+    async for _ in core.pipeline(cycles=6, strict=False):
+        pass
+    metrics = core.metrics.snapshot()
+    assert metrics["cycles_succeeded"] == 6
+    assert all(metrics["stages"][s]["count"] == 6 for s in ("perceive", "decide", "act"))
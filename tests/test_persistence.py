@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for WAL + snapshot belief persistence."""
+from __future__ import annotations
+
+import pytest
+
+from aglm import (
+    AGLMCore,
+    Belief,
+    Decision,
+    PerceptionContext,
+    PersistentBeliefSystem,
+)
+
+
+def test_restart_replays_wal(tmp_path):
+    with PersistentBeliefSystem(tmp_path) as bs:
+        bs.add(Belief(claim="a", confidence=0.5, source="s", metadata={"k": "v"}))
+        bs.revise("a", 0.9, "t")
+        bs.revise("b", 0.3, "s")
+
+    bs2 = PersistentBeliefSystem(tmp_path)
+    assert len(bs2) == 3
+    assert bs2.top("a").source == "t"
+    assert bs2.all("a")[0].metadata == {"k": "v"}
+    bs2.close()
+
+
+def test_checkpoint_compacts_and_restart_sees_snapshot_plus_tail(tmp_path):
+    bs = PersistentBeliefSystem(tmp_path, compact_every=None)
+    for i in range(10):
+        bs.revise(f"c{i % 3}", i / 10, "s")
+    bs.checkpoint()
+    bs.revise("after", 1.0, "s")
+    bs.close()
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["snapshot-00000001.jsonl", "wal-00000001.jsonl"]
+    assert (tmp_path / "wal-00000001.jsonl").read_bytes().count(b"\n") == 1
+
+    bs2 = PersistentBeliefSystem(tmp_path)
+    assert len(bs2) == 11
+    assert bs2.top("c0").confidence == 0.9
+    assert "after" in bs2
+    bs2.close()
+
+
+def test_automatic_compaction(tmp_path):
+    with PersistentBeliefSystem(tmp_path, compact_every=4) as bs:
+        for i in range(10):
+            bs.revise("x", 0.5, f"s{i}")
+    with PersistentBeliefSystem(tmp_path) as bs2:
+        assert len(bs2) == 10
+        assert bs2._generation == 2
+
+
+def test_torn_wal_tail_is_discarded(tmp_path):
+    with PersistentBeliefSystem(tmp_path) as bs:
+        bs.revise("a", 0.5, "s")
+        bs.revise("b", 0.5, "s")
+    wal = tmp_path / "wal-00000000.jsonl"
+    wal.write_bytes(wal.read_bytes() + b'{"claim": "c", "conf')
+
+    with PersistentBeliefSystem(tmp_path) as bs2:
+        assert len(bs2) == 2
+        bs2.revise("c", 0.5, "s")
+    with PersistentBeliefSystem(tmp_path) as bs3:
+        assert list(bs3.claims()) == ["a", "b", "c"]
+
+
+def test_corrupt_wal_record_before_good_ones_raises(tmp_path):
+    with PersistentBeliefSystem(tmp_path) as bs:
+        for claim in ("a", "b", "c"):
+            bs.revise(claim, 0.5, "s")
+    wal = tmp_path / "wal-00000000.jsonl"
+    lines = wal.read_bytes().splitlines(keepends=True)
+    wal.write_bytes(lines[0] + b'{"claim": "b", "conf\n' + lines[2])
+
+    with pytest.raises(ValueError, match="corrupt record 2"):
+        PersistentBeliefSystem(tmp_path)
+    assert wal.read_bytes().count(b"\n") == 3  # nothing truncated
+
+
+def test_failed_wal_write_leaves_memory_untouched(tmp_path):
+    with PersistentBeliefSystem(tmp_path) as bs:
+        seen = []
+        bs.subscribe(seen.append)
+        bs.revise("a", 0.5, "s")
+
+        class Full:
+            def write(self, data):
+                raise OSError(28, "No space left on device")
+
+        wal, bs._wal = bs._wal, Full()
+        with pytest.raises(OSError):
+            bs.revise("b", 0.5, "s")
+        bs._wal = wal
+        assert "b" not in bs and len(bs) == 1 and len(seen) == 2  # a's add + top only
+
+
+def test_closed_store_rejects_writes(tmp_path):
+    bs = PersistentBeliefSystem(tmp_path)
+    bs.close()
+    with pytest.raises(ValueError):
+        bs.revise("a", 0.5, "s")
+
+
+@pytest.mark.asyncio
+async def test_core_flushes_once_per_cycle(tmp_path):
+    async def perceive():
+        return PerceptionContext(facts={"temperature": 72}, source="sensor.1")
+
+    async def decide(ctx, beliefs):
+        return Decision(action="noop")
+
+    async def act(d):
+        return {"success": True}
+
+    beliefs = PersistentBeliefSystem(tmp_path, sync_every=10_000, sync_interval=3600)
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, beliefs=beliefs)
+    await core.cycle()
+    assert beliefs._unsynced == 0
+    beliefs.close()
+
+
+def test_revise_many_is_logged(tmp_path):
+    with PersistentBeliefSystem(tmp_path) as bs:
+        bs.revise_many(["a", "b", "c"], [0.1, 0.2, 0.3], "s")
+    with PersistentBeliefSystem(tmp_path) as bs2:
+        assert len(bs2) == 3
+        assert bs2.top("c").confidence == 0.3
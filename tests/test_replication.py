@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for leader/follower log-shipping replication."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from aglm import Belief, BeliefSystem, CompactBeliefSystem, ConcurrentBeliefSystem, RetentionPolicy
+from aglm.replication import _EPOCH, _HEADER, _RESET, Follower, _encode
+from aglm.wire import read_frame, server_address, start_server, write_frame
+
+
+def _state(bs):
+    return sorted((b.claim, b.source, b.timestamp, b.confidence)
+                  for k in bs.claims() for b in bs.all(k))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["tcp", "unix"])
+async def test_followers_track_the_leader(tmp_path, transport):
+    leader_bs = BeliefSystem(RetentionPolicy(max_per_claim=3))
+    for i in range(10):
+        leader_bs.add(Belief(f"claim {i % 2}", (i % 10) / 10, "perceive", timestamp=float(i)))
+    address = ("127.0.0.1", 0) if transport == "tcp" else str(tmp_path / "leader.sock")
+    leader = await leader_bs.serve_replicas(address, heartbeat=0.05)
+    followers = [Follower(server_address(leader._server)) for _ in range(2)]
+    try:
+        for f in followers:
+            await f.start()
+            await f.wait_for(leader.seq, timeout=5)
+            assert _state(f.beliefs) == _state(leader_bs) and f.resets == 1
+
+        # Live adds and the evictions they trigger are streamed in order.
+        leader_bs.revise_many(["claim 0", "claim 1", "claim 2"], 0.95, "perceive")
+        for f in followers:
+            await f.wait_for(leader.seq, timeout=5)
+            assert _state(f.beliefs) == _state(leader_bs) and len(f.beliefs) == 7
+            assert f.beliefs.top("claim 0").confidence == 0.95
+            status = f.status()
+            assert status["connected"] and status["lag"] == 0 and status["applied"] == leader.seq
+        assert leader.status()["followers"] == 2
+    finally:
+        for f in followers:
+            await f.stop()
+        leader.close()
+        await leader.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_follower_resumes_or_resets_after_falling_behind():
+    leader_bs = BeliefSystem()
+    leader = await leader_bs.serve_replicas(("127.0.0.1", 0), backlog=5, heartbeat=0.05)
+    follower = Follower(server_address(leader._server), reconnect=0.01)
+    try:
+        leader_bs.revise("a", 0.5, "x")
+        with pytest.raises(asyncio.TimeoutError):  # not started: waits, nothing arrives
+            await follower.wait_for(leader.seq, timeout=0.01)
+        await follower.start()
+        await follower.wait_for(leader.seq, timeout=5)
+
+        await follower.stop()
+        leader_bs.revise_many(["b", "c"], 0.5, "x")  # within the backlog: resumed
+        await follower.start()
+        await follower.wait_for(leader.seq, timeout=5)
+        assert follower.resets == 1 and _state(follower.beliefs) == _state(leader_bs)
+
+        await follower.stop()
+        leader_bs.revise_many([f"d{i}" for i in range(10)], 0.5, "x")  # past it: reset
+        await follower.start()
+        await follower.wait_for(leader.seq, timeout=5)
+        assert follower.resets == 2 and _state(follower.beliefs) == _state(leader_bs)
+        assert len(follower.beliefs) == 13
+    finally:
+        await follower.stop()
+        leader.close()
+        await leader.wait_closed()
+
+
+@pytest.mark.parametrize("make", [CompactBeliefSystem, ConcurrentBeliefSystem])
+def test_replicas_must_be_plain_belief_systems(make):
+    # Replayed evictions would never reach these backends' storage.
+    with pytest.raises(TypeError):
+        Follower(("127.0.0.1", 1), beliefs=make())
+
+
+def test_replicas_must_not_evict_on_their_own():
+    with pytest.raises(ValueError):
+        Follower(("127.0.0.1", 1), beliefs=BeliefSystem(RetentionPolicy(max_per_claim=1)))
+    Follower(("127.0.0.1", 1), beliefs=BeliefSystem())
+
+
+@pytest.mark.asyncio
+async def test_close_ends_follower_sessions():
+    leader_bs = BeliefSystem()
+    leader = await leader_bs.serve_replicas(("127.0.0.1", 0), heartbeat=0.05)
+    follower = Follower(server_address(leader._server), reconnect=0.01)
+    try:
+        await follower.start()
+        leader_bs.revise("a", 0.5, "x")
+        await follower.wait_for(leader.seq, timeout=5)
+        sessions = set(leader._tasks)
+        assert len(sessions) == 1
+    finally:
+        leader.close()
+        await leader.wait_closed()
+        await follower.stop()
+    assert all(task.done() for task in sessions) and not leader._tasks
+
+
+@pytest.mark.asyncio
+async def test_follower_resets_after_a_frame_it_cannot_decode():
+    cursors = []
+    reset = (_HEADER.pack(_RESET, 1, 1, time.time()) + _EPOCH.pack(b"e" * 32)
+             + _encode([Belief("a", 0.5, "s")]))
+
+    async def leader(reader, writer):
+        cursors.append(json.loads(await read_frame(reader)))
+        await write_frame(writer, reset)
+        if len(cursors) == 1:
+            await write_frame(writer, b"\x00")  # shorter than the frame header
+        await reader.read()
+        writer.close()
+
+    server = await start_server(leader, ("127.0.0.1", 0))
+    follower = Follower(server_address(server), reconnect=0.01)
+    try:
+        await follower.start()
+        for _ in range(500):
+            if follower.resets == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert cursors[1] == {"epoch": None, "seq": 1}  # asked for a reset, not a resume
+        assert follower.resets == 2 and follower.epoch == "e" * 32 and len(follower.beliefs) == 1
+    finally:
+        await follower.stop()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for bounded belief history (retention policies)."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from aglm import Belief, BeliefSystem, PersistentBeliefSystem, RetentionPolicy
+
+
+def test_policy_rejects_non_positive_limits():
+    with pytest.raises(ValueError):
+        RetentionPolicy(max_per_claim=0)
+    with pytest.raises(ValueError):
+        RetentionPolicy(ttl_seconds=-1)
+
+
+def test_max_per_claim_keeps_newest_and_repairs_leader():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=2))
+    bs.revise("x", 0.9, "a")
+    bs.revise("x", 0.1, "b")
+    assert bs.top("x").source == "a"
+    bs.revise("x", 0.5, "c")  # evicts "a", the current leader
+
+    assert [b.source for b in bs.all("x")] == ["b", "c"]
+    assert bs.top("x").source == "c"
+    assert len(bs) == 2 and bs.evictions == 1
+
+
+def test_top_k_keeps_most_confident():
+    bs = BeliefSystem(retention=RetentionPolicy(top_k_per_claim=2))
+    bs.revise_many(["x"] * 5, [0.5, 0.2, 0.9, 0.2, 0.7], ["a", "b", "c", "d", "e"])
+    assert [b.source for b in bs.all("x")] == ["c", "e"]
+    assert bs.top("x").source == "c"
+    assert len(bs) == 2
+
+
+def test_ttl_expires_old_beliefs_and_drops_empty_claims():
+    bs = BeliefSystem(retention=RetentionPolicy(ttl_seconds=10))
+    bs.add(Belief(claim="old", confidence=0.9, source="s", timestamp=100.0))
+    bs.add(Belief(claim="new", confidence=0.5, source="s", timestamp=105.0))
+    # Timestamps are in the distant past relative to now: both evicted on add.
+    assert len(bs) == 0 and "old" not in bs and bs.top("old") is None
+
+    now = time.time()
+    bs = BeliefSystem(retention=RetentionPolicy(ttl_seconds=10))
+    bs.add(Belief(claim="x", confidence=0.9, source="old", timestamp=now - 5))
+    bs.add(Belief(claim="x", confidence=0.5, source="new", timestamp=now - 1))
+    bs.add(Belief(claim="y", confidence=0.5, source="s", timestamp=now - 4))
+    assert len(bs) == 3
+    assert bs.expire(now=now + 6.5) == 2
+    assert [b.source for b in bs.all("x")] == ["new"]
+    assert bs.top("x").source == "new"
+    assert "y" not in bs and len(bs) == 1
+
+
+def test_memory_plateaus_under_ttl_and_per_claim_limits():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=3, ttl_seconds=1e9))
+    for i in range(20_000):
+        bs.revise(f"c{i % 10}", 0.5, "s")
+    assert len(bs) == 30
+    # Stale expiry entries for per-claim evictions are compacted away.
+    assert len(bs._expiry) <= 2 * len(bs) + 1024
+
+
+def test_persistent_store_applies_retention_on_replay(tmp_path):
+    policy = RetentionPolicy(max_per_claim=2)
+    with PersistentBeliefSystem(tmp_path, retention=policy) as bs:
+        for i in range(5):
+            bs.revise("x", i / 10, f"s{i}")
+        assert len(bs) == 2
+    with PersistentBeliefSystem(tmp_path, retention=policy) as bs2:
+        assert [b.source for b in bs2.all("x")] == ["s3", "s4"]
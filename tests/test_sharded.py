@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for ShardedFleet (agents spread over worker processes)."""
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from aglm import AGLMCore, Decision, PerceptionContext, ShardedFleet
+from aglm.sharded import shard_of
+
+
+def make_agent(agent_id: str) -> AGLMCore:
+    async def perceive():
+        return PerceptionContext(facts={"pid": os.getpid()})
+
+    async def decide(ctx, beliefs):
+        return Decision(action="tick")
+
+    async def act(d):
+        return {"success": True}
+
+    return AGLMCore(perceive=perceive, decide=decide, act=act, agent_id=agent_id)
+
+
+def test_placement_is_stable():
+    ids = [f"agent-{i}" for i in range(100)]
+    fleet = ShardedFleet(make_agent, ids, workers=3)
+    shards = fleet.placement()
+    assert sorted(a for shard in shards for a in shard) == sorted(ids)
+    assert all(shards[shard_of(a, 3)].count(a) == 1 for a in ids)
+    assert all(shard for shard in shards)  # 100 ids land on every worker
+    with pytest.raises(ValueError):
+        ShardedFleet(make_agent, ["a", "a"])
+
+
+@pytest.mark.asyncio
+async def test_workers_tick_and_report():
+    ids = [f"agent-{i}" for i in range(40)]
+    fleet = ShardedFleet(make_agent, ids, workers=2, interval_seconds=0.05, report_seconds=0.1)
+    await fleet.start()
+    assert fleet.is_running
+
+    for _ in range(300):  # spawning workers is slow on small machines
+        if fleet.status()["cycles_completed"] >= 2 * len(ids):
+            break
+        await asyncio.sleep(0.05)
+    await fleet.stop(timeout=5)
+    assert not fleet.is_running
+
+    status = fleet.status()
+    assert status["agents"] == 40
+    assert status["cycles_completed"] >= 80
+    assert status["cycles_failed"] == 0
+    assert status["in_flight"] == 0
+    shards = status["shards"]
+    assert [s["agents"] for s in shards] == [len(p) for p in fleet.placement()]
+    assert len({s["pid"] for s in shards}) == 2
+    assert all(s["exitcode"] == 0 for s in shards)
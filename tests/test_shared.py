@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for belief stores shared through shared memory."""
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from aglm import Belief, BeliefSystem, SharedBeliefSystem
+
+
+def _sample() -> BeliefSystem:
+    bs = BeliefSystem()
+    for i in range(50):
+        bs.add(Belief(f"claim {i % 5}", (i % 10) / 10, f"s{i % 3}", timestamp=float(i),
+                      metadata={"i": i} if i % 2 else {}))
+    return bs
+
+
+def _leaders(beliefs, keys):
+    return [(beliefs.top(k).confidence, beliefs.top(k).source, len(beliefs.all(k))) for k in keys]
+
+
+def test_shared_store_attaches_in_place():
+    bs = _sample()
+    with SharedBeliefSystem.create(bs) as shared:
+        attached = SharedBeliefSystem(shared.name)
+        for store in (shared, attached):
+            assert len(store) == 50 and list(store.claims()) == list(bs.claims())
+            for key in bs.claims():
+                assert store.all(key) == bs.all(key) and store.top(key) == bs.top(key)
+            assert store.query(source="s1", min_confidence=0.5) == bs.query(
+                source="s1", min_confidence=0.5
+            )
+        attached.revise("local only", 0.9, "worker")  # goes to this handle's overlay
+        assert "local only" in attached and "local only" not in shared
+        attached.close()
+
+        clone = pickle.loads(pickle.dumps(shared))
+        assert clone.name == shared.name and len(clone) == 50
+        clone.close()
+
+
+def test_pool_workers_read_the_same_segment():
+    bs = _sample()
+    keys = list(bs.claims())
+    with SharedBeliefSystem.create(bs) as shared:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_leaders, [shared] * 4, [keys] * 4))
+    assert results == [_leaders(bs, keys)] * 4
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for memory-mapped binary belief snapshots."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from aglm import (
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    MappedBeliefSystem,
+    RetentionPolicy,
+    write_snapshot,
+)
+from aglm.snapshot import BeliefSnapshot
+
+
+def _sample() -> BeliefSystem:
+    bs = BeliefSystem()
+    bs.add(Belief(claim="Sky is blue", confidence=0.5, source="a", timestamp=1.0))
+    bs.add(Belief(claim="sky is blue", confidence=0.9, source="b", timestamp=2.0))
+    bs.add(Belief(claim="grass", confidence=0.7, source="a", timestamp=3.0,
+                  metadata={"value": [1, 2], "unit": "m"}))
+    bs.add(Belief(claim="sky is blue", confidence=0.9, source="c", timestamp=4.0))
+    bs.add(Belief(claim="ünïcode", confidence=0.1, source="a", timestamp=5.0))
+    return bs
+
+
+def test_mapped_snapshot_answers_queries_in_place(tmp_path):
+    bs = _sample()
+    path = tmp_path / "beliefs.snap"
+    assert write_snapshot(bs, path) == 5
+
+    with MappedBeliefSystem(path) as mapped:
+        assert len(mapped) == 5
+        assert list(mapped.claims()) == list(bs.claims())
+        for key in bs.claims():
+            assert mapped.top(key) == bs.top(key)
+            assert mapped.all(key) == bs.all(key)
+        assert "ÜNÏCODE" in mapped and "nope" not in mapped
+        assert mapped.top("nope") is None and mapped.all("nope") == []
+        assert mapped.to_dict() == bs.to_dict()
+
+
+def test_mapped_overlay_takes_new_beliefs(tmp_path):
+    path = tmp_path / "beliefs.snap"
+    write_snapshot(_sample(), path)
+
+    with MappedBeliefSystem(path) as mapped:
+        mapped.add(Belief(claim="sky is blue", confidence=0.9, source="d"))  # tie: snapshot wins
+        assert mapped.top("sky is blue").source == "b"
+        mapped.add(Belief(claim="sky is blue", confidence=0.95, source="e"))
+        mapped.revise("new claim", 0.4, "f")
+
+        assert mapped.top("sky is blue").source == "e"
+        assert [b.source for b in mapped.all("sky is blue")] == ["a", "b", "c", "d", "e"]
+        assert list(mapped.claims())[-1] == "new claim"
+        assert len(mapped) == 8
+
+        plain = mapped.materialize()
+        assert type(plain) is BeliefSystem
+        assert len(plain) == 8 and plain.top("sky is blue").source == "e"
+
+
+def test_overlay_eviction_keeps_claims_held_by_the_mapped_file(tmp_path):
+    base = BeliefSystem()
+    base.revise("disk is full", 0.8, "df")
+    write_snapshot(base, tmp_path / "b.snap")
+    now = time.time()
+    with MappedBeliefSystem(tmp_path / "b.snap", RetentionPolicy(ttl_seconds=60)) as bs:
+        bs.add(Belief("not disk is full", 0.6, "cleanup", timestamp=now))
+        bs.add(Belief("disk is full", 0.9, "df", timestamp=now - 30))
+        bs.add(Belief("only overlay", 0.5, "x", timestamp=now - 30))
+        assert bs.search("disk")[0][0] == "disk is full" and len(bs.conflicts()) == 1
+        bs.expire(now + 45)  # evicts the overlay's only belief about both claims
+        assert bs.all("disk is full")[0].source == "df" and bs.top("disk is full")
+        assert "disk is full" in [key for key, _score in bs.search("disk")]
+        assert [c.claim for c in bs.conflicts()] == ["disk is full"]
+        assert bs.search("overlay") == []
+
+
+def test_snapshot_from_other_backends_and_empty(tmp_path):
+    compact = CompactBeliefSystem.from_dict(_sample().to_dict())
+    write_snapshot(compact, tmp_path / "c.snap")
+    with MappedBeliefSystem(tmp_path / "c.snap") as mapped:
+        assert mapped.to_dict() == compact.to_dict()
+
+    write_snapshot(BeliefSystem(), tmp_path / "empty.snap")
+    with MappedBeliefSystem(tmp_path / "empty.snap") as mapped:
+        assert len(mapped) == 0 and list(mapped.claims()) == []
+
+
+def test_snapshot_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        BeliefSnapshot(b"\0" * 128)
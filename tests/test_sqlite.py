@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for the SQLite-backed belief store."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from aglm import (
+    AGLMCore,
+    Belief,
+    BeliefSystem,
+    Decision,
+    PerceptionContext,
+    SQLiteBeliefSystem,
+)
+
+
+def test_sqlite_matches_belief_system():
+    plain, db = BeliefSystem(), SQLiteBeliefSystem(batch_size=2)
+    for bs in (plain, db):
+        bs.add(Belief(claim="Sky is blue", confidence=0.5, source="a", timestamp=1.0))
+        bs.add(Belief(claim="sky is blue", confidence=0.9, source="b", timestamp=2.0))
+        bs.add(Belief(claim="grass", confidence=0.7, source="a", timestamp=3.0,
+                      metadata={"value": [1, 2]}))
+        bs.add(Belief(claim="sky is blue", confidence=0.9, source="c", timestamp=4.0))
+
+    assert len(db) == len(plain) == 4
+    assert list(db.claims()) == list(plain.claims())
+    assert db.top("SKY IS BLUE") == plain.top("sky is blue")
+    assert db.all("sky is blue") == plain.all("sky is blue")
+    assert db.to_dict() == plain.to_dict()
+    assert "grass" in db and "nope" not in db
+    assert db.top("nope") is None and db.all("nope") == []
+    db.close()
+
+
+def test_sqlite_flush_commits_and_reopen(tmp_path):
+    path = tmp_path / "beliefs.db"
+    bs = SQLiteBeliefSystem(path)
+    bs.revise("x", 0.4, "s")
+    bs.revise("x", 0.8, "t")
+
+    reader = SQLiteBeliefSystem(path)
+    assert "x" not in reader  # not yet committed
+    bs.flush()
+    assert reader.top("x").source == "t"
+    reader.close()
+    bs.close()
+
+    with SQLiteBeliefSystem(path) as reopened:
+        assert len(reopened) == 2
+        assert reopened.top("x").confidence == 0.8
+
+
+def test_sqlite_commits_every_batch_size_rows_without_flush(tmp_path):
+    path = tmp_path / "beliefs.db"
+    bs = SQLiteBeliefSystem(path, batch_size=10)
+    other = sqlite3.connect(path)
+    count = "SELECT COUNT(*) FROM beliefs"
+    for i in range(9):
+        bs.revise(f"c{i}", 0.5, "s")
+    assert bs.top("c0") is not None  # a read writes the rows, but does not commit them
+    assert other.execute(count).fetchone()[0] == 0
+    bs.revise("c9", 0.5, "s")
+    bs.top("c9")
+    assert other.execute(count).fetchone()[0] == 10
+    bs.add_many(Belief(f"d{i}", 0.5, "s") for i in range(25))  # crosses the threshold alone
+    assert other.execute(count).fetchone()[0] == 35
+    other.close()
+    bs.close()
+
+
+def test_sqlite_closed_store_raises():
+    bs = SQLiteBeliefSystem()
+    with pytest.raises(ValueError):  # no version history to go back to
+        bs.as_of(cycle=1)
+    bs.close()
+    with pytest.raises(ValueError):
+        bs.top("x")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_under_core(tmp_path):
+    async def perceive():
+        return PerceptionContext(facts={"temperature": 72}, source="sensor.1")
+
+    async def decide(ctx, beliefs):
+        assert beliefs.top("temperature").metadata["value"] == 72
+        return Decision(action="noop")
+
+    async def act(d):
+        return {"success": True}
+
+    beliefs = SQLiteBeliefSystem(tmp_path / "core.db")
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, beliefs=beliefs)
+    outcome = await core.cycle()
+    assert outcome["success"] is True
+    assert not beliefs._in_transaction  # committed at the end of the cycle
+    assert "outcome:noop" in beliefs
+    beliefs.close()
+
+
+def test_sqlite_revise_many():
+    with SQLiteBeliefSystem(batch_size=2) as bs:
+        bs.revise_many(["a", "b", "a"], [0.1, 0.2, 0.3], "s")
+        assert len(bs) == 3
+        assert bs.top("a").confidence == 0.3
+
+
+def test_sqlite_subscribed_batch_flushes_once():
+    bs = SQLiteBeliefSystem()
+    bs.add(Belief("a", 0.5, "s"))
+    tops = []
+    bs.subscribe(lambda c: tops.append((c.key, c.belief.confidence)), kinds={"top"})
+    writes = []
+    write_pending = bs._write_pending
+    bs._write_pending = lambda: writes.append(1) or write_pending()
+    bs.add_many([Belief("a", c, "s") for c in (0.4, 0.7, 0.6, 0.9)] + [Belief("b", 0.3, "s")])
+    assert len(writes) == 1
+    assert tops == [("a", 0.7), ("a", 0.9), ("b", 0.3)]
+    assert bs.top("a").confidence == 0.9
+
+
+def test_sqlite_fuzzy_search_index_is_cached():
+    bs = SQLiteBeliefSystem()
+    bs.revise("disk_usage:/var", 0.5, "s")
+    assert bs.search("disk usge", fuzzy=True)[0][0] == "disk_usage:/var"
+    index = bs._search
+    bs.revise("memory_pressure", 0.5, "s")
+    assert bs.search("memory presure", fuzzy=True)[0][0] == "memory_pressure"
+    assert bs._search is index
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for the tiered hot/cold belief store."""
+from __future__ import annotations
+
+from aglm import Belief, BeliefSystem, TieredBeliefSystem
+from aglm import tiered as tiered_module
+from aglm.tiered import BloomFilter, _Segment
+
+
+def _fill(*stores, n: int = 200) -> None:
+    for i in range(n):
+        b = Belief(f"claim {i % 100}", (i * 7 % 10) / 10, f"s{i % 3}", timestamp=float(i),
+                   metadata={"i": i} if i % 2 else {})
+        for store in stores:
+            store.add(b)
+
+
+def test_cold_claims_read_back_from_disk(tmp_path):
+    plain = BeliefSystem()
+    with TieredBeliefSystem(tmp_path / "spill", hot_claims=8) as tiered:
+        _fill(plain, tiered)
+        stats = tiered.tier_stats()
+        assert stats["hot_claims"] <= 8 and stats["cold_claims"] + stats["hot_claims"] == 100
+        assert stats["segments"] <= 8 and stats["cold_bytes"] > 0
+        assert len(tiered) == len(plain) == 200
+        promotions = stats["promotions"]
+        assert sorted(tiered.claims()) == sorted(plain.claims())
+        for key in plain.claims():
+            assert tiered.all(key) == plain.all(key) and tiered.top(key) == plain.top(key)
+            assert tiered.fused(key) == plain.fused(key)
+        assert tiered.query(source="s1", min_confidence=0.5) == plain.query(
+            source="s1", min_confidence=0.5
+        )
+        assert tiered.to_dict() == plain.to_dict()
+        assert tiered.tier_stats()["promotions"] == promotions  # reads do not promote
+
+        # A write promotes the claim with its history; the leader carries over.
+        cold = next(k for k in plain.claims() if k not in tiered._beliefs)
+        for store in (plain, tiered):
+            store.add(Belief(cold, 0.05, "late", timestamp=1e6))
+        assert cold in tiered._beliefs and tiered.all(cold) == plain.all(cold)
+        assert tiered.top(cold) == plain.top(cold) and len(tiered) == 201
+    assert not (tmp_path / "spill").exists() or not list((tmp_path / "spill").iterdir())
+
+
+def test_bloom_filter_keeps_misses_off_disk(monkeypatch):
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.add(f"k{i}")
+    assert all(f"k{i}" in bloom for i in range(1000))
+    assert sum(f"miss{i}" in bloom for i in range(10_000)) < 300  # ~1%
+
+    scans = []
+    original = _Segment._scan
+    monkeypatch.setattr(_Segment, "_scan", lambda self, *a: scans.append(1) or original(self, *a))
+    with TieredBeliefSystem(hot_claims=8) as tiered:
+        _fill(tiered)
+        scans.clear()
+        assert sum(f"unknown {i}" in tiered for i in range(200)) == 0
+        assert len(scans) < 50  # ~1% false positives per segment filter
+        assert "claim 0" in tiered and tiered.top("nope") is None
+
+
+def test_query_decodes_only_claims_that_can_match(tmp_path, monkeypatch):
+    plain = BeliefSystem()
+    with TieredBeliefSystem(tmp_path, hot_claims=8) as tiered:
+        for i in range(400):
+            b = Belief(f"claim {i:03d}", (i % 10) / 10, f"s{i % 3}", timestamp=float(i))
+            plain.add(b)
+            tiered.add(b)
+        # Rewrite some cold claims so older segments hold stale copies.
+        for i in range(0, 400, 37):
+            b = Belief(f"claim {i:03d}", 0.95, "late", timestamp=1000.0 + i)
+            plain.add(b)
+            tiered.add(b)
+        for i in range(400, 440):
+            b = Belief(f"claim {i:03d}", 0.5, "s0", timestamp=float(i))
+            plain.add(b)
+            tiered.add(b)
+
+        decoded = []
+        original = tiered_module.decode_records
+        monkeypatch.setattr(tiered_module, "decode_records",
+                            lambda payload: decoded.append(1) or original(payload))
+        for filters in ({"since": 380.0, "until": 390.0}, {"source": "late"},
+                        {"min_confidence": 0.9}, {"source": "nobody"}, {}):
+            decoded.clear()
+            assert tiered.query(**filters) == plain.query(**filters)
+            if filters.get("since") == 380.0:
+                assert len(decoded) <= 22  # the 11 in range, 11 rewritten ones spanning it
+            if filters.get("source") == "nobody":
+                assert decoded == []
+        decoded.clear()
+        assert sorted(tiered.claims()) == sorted(plain.claims())
+        assert decoded == []
@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Smoke tests for point-in-time belief views (`snapshot()`)."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict
+
+import pytest
+
+from aglm import (
+    AGLMCore,
+    Belief,
+    BeliefSystem,
+    CompactBeliefSystem,
+    ConcurrentBeliefSystem,
+    Decision,
+    MappedBeliefSystem,
+    PerceptionContext,
+    RetentionPolicy,
+    SQLiteBeliefSystem,
+    write_snapshot,
+)
+
+
+def _fill(bs, n: int = 20, start: int = 0) -> None:
+    for i in range(start, start + n):
+        bs.add(Belief(claim=f"C{i % 5}", confidence=(i % 10) / 10, source=f"s{i % 3}",
+                      timestamp=float(i)))
+
+
+def _state(bs):
+    keys = sorted(bs.claims())
+    return (len(bs), keys, {k: (bs.top(k), bs.all(k)) for k in keys})
+
+
+def test_view_is_unchanged_by_later_writes():
+    bs = BeliefSystem()
+    _fill(bs)
+    frozen = _state(bs)
+    with bs.snapshot() as view:
+        _fill(bs, start=20)
+        bs.revise("brand new", 1.0, "late")
+        assert _state(view) == frozen
+        assert "brand new" not in view and "brand new" in bs
+        assert [b.timestamp for b in view.query(source="s1")] == [1.0, 4.0, 7.0, 10.0, 13.0,
+                                                                   16.0, 19.0]
+        assert view.to_dict() == {k: [asdict(b) for b in frozen[2][k][1]] for k in frozen[1]}
+    assert not bs._leader_log and not bs._evicted_log
+
+
+def test_view_survives_evictions():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=2))
+    bs.add(Belief("a", 0.9, "s", timestamp=1.0))
+    bs.add(Belief("a", 0.1, "s", timestamp=2.0))
+    bs.add(Belief("b", 0.5, "s", timestamp=3.0))
+    frozen = _state(bs)
+    view = bs.snapshot()
+    later = bs.snapshot()
+    for t in range(4, 8):
+        bs.add(Belief("a", 0.2, "s", timestamp=float(t)))  # evicts the 0.9 leader
+    bs.add(Belief("b", 0.6, "s", timestamp=9.0))
+    assert bs.top("a").confidence == 0.2
+    assert _state(view) == frozen
+
+    later.close()
+    assert _state(view) == frozen
+    view.close()
+    assert not bs._leader_log and not bs._evicted_log and not bs._open_views
+
+
+def test_view_keeps_claims_deleted_by_ttl():
+    now = time.time()
+    bs = BeliefSystem(retention=RetentionPolicy(ttl_seconds=10))
+    bs.add(Belief("old", 0.5, "s", timestamp=now - 5))
+    bs.add(Belief("new", 0.5, "s", timestamp=now + 100))
+    view = bs.snapshot()
+    assert bs.expire(now=now + 10) == 1
+    assert "old" not in bs
+    assert "old" in view and view.top("old").timestamp == now - 5
+    assert sorted(view.claims()) == ["new", "old"]
+    view.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_decide_sees_one_state():
+    bs = BeliefSystem()
+    bs.revise("seed", 0.5, "test")
+    seen = []
+
+    async def perceive():
+        return PerceptionContext(facts={"x": 1})
+
+    async def decide(ctx, beliefs):
+        before = len(beliefs)
+        bs.revise("concurrent write", 0.9, "other")  # another writer mid-decide
+        await asyncio.sleep(0)
+        seen.append((before, len(beliefs), "concurrent write" in beliefs))
+        return Decision(action="noop")
+
+    async def act(decision):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, beliefs=bs,
+                    snapshot_decide=True)
+    assert (await core.cycle())["success"]
+    assert seen == [(2, 2, False)]
+    assert not bs._open_views
+
+
+def test_compact_and_mapped_views(tmp_path):
+    compact = CompactBeliefSystem()
+    _fill(compact)
+    base = BeliefSystem()
+    _fill(base, n=10)
+    write_snapshot(base, tmp_path / "b.snap")
+    mapped = MappedBeliefSystem(tmp_path / "b.snap")
+    _fill(mapped, n=10, start=10)
+
+    for bs in (compact, mapped):
+        frozen = _state(bs)
+        with bs.snapshot() as view:
+            _fill(bs, start=20)
+            bs.revise("brand new", 1.0, "late")
+            assert _state(view) == frozen
+    mapped.close()
+
+
+def test_sqlite_view(tmp_path):
+    bs = SQLiteBeliefSystem(tmp_path / "b.db")
+    _fill(bs)
+    frozen = _state(bs)
+    with bs.snapshot() as view:
+        _fill(bs, start=20)
+        bs.flush()
+        assert _state(view) == frozen
+        assert view.search("c3")[0][0] == "c3"
+        assert view.query(limit=3) == frozen[2]["c0"][1][:1] + frozen[2]["c1"][1][:1] + \
+            frozen[2]["c2"][1][:1]
+    bs.close()
+    with pytest.raises(ValueError):
+        SQLiteBeliefSystem().snapshot()
+
+
+def test_concurrent_view_is_atomic_across_stripes():
+    bs = ConcurrentBeliefSystem(stripes=4)
+    stop = threading.Event()
+
+    def writer() -> None:
+        i = 0
+        while not stop.is_set():
+            # "left" is written before "right", so no instant has a right
+            # without its left — a view taken stripe by stripe could.
+            bs.add(Belief(f"left{i}", 0.5, "w"))
+            bs.add(Belief(f"right{i}", 0.5, "w"))
+            i += 1
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        for _ in range(50):
+            with bs.snapshot() as view:
+                keys = set(view.claims())
+                assert len(view) == len(keys)
+                assert {k for k in keys if k.startswith("right")} <= \
+                    {k.replace("left", "right") for k in keys if k.startswith("left")}
+    finally:
+        stop.set()
+        t.join()
+
+
+def test_as_of_timestamp_and_cycle():
+    bs = BeliefSystem(retention=RetentionPolicy(max_per_claim=2, history_seconds=3600))
+    bs.add(Belief("a", 0.9, "s"))
+    bs.mark_cycle(1)
+    time.sleep(0.002)
+    after_first = time.time()
+    at_first = _state(bs)
+    time.sleep(0.002)
+    for c in (0.1, 0.2, 0.3):  # evicts the 0.9 leader
+        bs.add(Belief("a", c, "s"))
+    bs.revise("b", 0.5, "s")
+    bs.mark_cycle(2)
+
+    with bs.as_of(cycle=1) as then, bs.as_of(at=after_first) as at:
+        assert _state(then) == _state(at) == at_first
+        assert then.top("a").confidence == 0.9 and "b" not in then
+    with bs.as_of(cycle=2) as now:
+        assert _state(now) == _state(bs)
+    assert bs._leader_log  # history keeps the undo log with no views open
+
+    with pytest.raises(ValueError):
+        bs.as_of(cycle=0)
+    with pytest.raises(ValueError):
+        bs.as_of(at=after_first - 3600)
+    with pytest.raises(ValueError):
+        BeliefSystem().as_of(cycle=1)
+    with pytest.raises(ValueError):  # a second core, or one restarted from cycle 0
+        bs.mark_cycle(1)
+    with pytest.raises(ValueError):
+        bs.as_of()
+    with pytest.raises(ValueError):
+        bs.as_of(cycle=1, at=after_first)
+    with pytest.raises(TypeError):
+        bs.as_of(cycle=True)
+    with pytest.raises(TypeError):
+        bs.as_of(cycle=float(1))
+    with bs.as_of(at=int(time.time()) + 1) as now:  # an int time is a time, not a cycle
+        assert _state(now) == _state(bs)
+    with bs.as_of(cycle=1) as then:
+        assert _state(then) == at_first
+
+
+def test_as_of_history_window_ages_out():
+    bs = BeliefSystem(retention=RetentionPolicy(history_seconds=0.005))
+    bs.revise("a", 0.5, "s")
+    bs.mark_cycle(1)
+    for i in range(150):
+        time.sleep(0.0012)  # one mark per write
+        bs.revise("a", 0.5 + i / 1000, "s")  # every write is a new leader
+    with pytest.raises(ValueError):
+        bs.as_of(cycle=1)
+    assert not bs._cycles
+    assert len(bs._marks) < 100
+    assert len(bs._leader_log["a"]) < 100
+
+
+@pytest.mark.asyncio
+async def test_core_marks_cycles_for_as_of():
+    bs = ConcurrentBeliefSystem(stripes=4, retention=RetentionPolicy(history_seconds=3600))
+
+    async def perceive():
+        return PerceptionContext(facts={"x": 1})
+
+    async def decide(ctx, beliefs):
+        return Decision(action="noop")
+
+    async def act(decision):
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, beliefs=bs)
+    await core.cycle()
+    after_one = len(bs)
+    await core.cycle()
+    with bs.as_of(cycle=1) as then:
+        assert len(then) == after_one < len(bs)
+        assert then.top("x").metadata["cycle"] == 1
+
+
+@pytest.mark.asyncio
+async def test_strict_pipeline_marks_each_cycle_before_the_next_orients():
+    bs = BeliefSystem(retention=RetentionPolicy(history_seconds=3600))
+    perceived = 0
+
+    async def perceive():
+        nonlocal perceived
+        perceived += 1
+        return PerceptionContext(facts={"x": perceived})
+
+    async def decide(ctx, beliefs):
+        return Decision(action="noop")
+
+    async def act(decision):
+        await asyncio.sleep(0.001)
+        return {"success": True}
+
+    core = AGLMCore(perceive=perceive, decide=decide, act=act, beliefs=bs)
+    async for _ in core.pipeline(cycles=5, depth=3):
+        pass
+    for n in range(1, 6):
+        with bs.as_of(cycle=n) as then:
+            assert then.all("x")[-1].metadata["cycle"] == n